@@ -39,6 +39,134 @@ class AdvancedLocalAI:
             print(f"❌ AI analiz hatası: {e}")
             return self._get_fallback_signal()
     
+    def generate_signals_batch(self, contexts, timeframe="1h", capital=1000):
+        """Çok sembol için sinyalleri tek vektörel geçişte üret
+
+        contexts: context listesi (ya da {sembol: context}). Her context'in zaman
+        dilimleri kendi sırasıyla (sembol x zaman dilimi) dizilere yerleştirilir;
+        trend, momentum, volatilite, AI skoru ve SL/TP tüm semboller için dizi
+        işlemleriyle hesaplanır. Çıktı generate_signal ile aynı sözlük yapısındadır.
+        """
+        keys = list(contexts) if isinstance(contexts, dict) else None
+        items = [contexts[k] for k in keys] if keys is not None else list(contexts)
+        count = len(items)
+        if count == 0:
+            return {} if keys is not None else []
+
+        try:
+            width = max(1, max(len(c.get('timeframe_data', {}) or {}) for c in items))
+            close = np.zeros((count, width))
+            rsi = np.full((count, width), 50.0)
+            macd = np.zeros((count, width))
+            macd_signal = np.zeros((count, width))
+            recommendation = np.zeros((count, width))
+            present = np.zeros((count, width), dtype=bool)
+            primary_price = np.zeros(count)
+
+            # Özellikleri doldur - sütun j, context'in j. zaman dilimi
+            for i, context in enumerate(items):
+                for j, (tf, data) in enumerate((context.get('timeframe_data', {}) or {}).items()):
+                    present[i, j] = True
+                    close[i, j] = data.get('close', 0)
+                    rsi[i, j] = data.get('rsi', 50)
+                    macd[i, j] = data.get('macd', 0)
+                    macd_signal[i, j] = data.get('macd_signal', 0)
+                    rec = data.get('recommendation', 'NEUTRAL')
+                    recommendation[i, j] = 1 if 'BUY' in rec else -1 if 'SELL' in rec else 0
+                    if tf == timeframe:
+                        primary_price[i] = close[i, j]
+        except Exception as e:
+            print(f"❌ Toplu context parsing hatası: {e}")
+            return [self.generate_signal(c, timeframe, capital) for c in items] if keys is None else \
+                {k: self.generate_signal(contexts[k], timeframe, capital) for k in keys}
+
+        n_tf = present.sum(axis=1)
+        safe_n = np.maximum(n_tf, 1)
+
+        # Çoklu zaman dilimi analizi
+        trend_alignment = np.where(n_tf > 0, recommendation.sum(axis=1) / safe_n, 0.0)
+        momentum = (rsi < 30).astype(float) - (rsi > 70) + np.where(macd > macd_signal, 0.5, -0.5)
+        momentum_score = np.where(n_tf > 0, np.where(present, momentum, 0.0).sum(axis=1) / safe_n, 0.0)
+        alignment_ratio = np.abs(trend_alignment)
+
+        # Volatilite: pozitif fiyatlar sırayla sola paketlenir, ardışık çiftlerin ortalama değişimi
+        valid = present & (close > 0)
+        order = np.argsort(~valid, axis=1, kind='stable')
+        packed = np.take_along_axis(close, order, axis=1)
+        valid_count = valid.sum(axis=1)
+        if width > 1:
+            pair = np.arange(1, width) < valid_count[:, None]
+            changes = np.where(pair, np.abs(packed[:, 1:] - packed[:, :-1]) / np.where(pair, packed[:, :-1], 1.0), 0.0)
+            volatility = np.where(valid_count >= 2, changes.sum(axis=1) / np.maximum(valid_count - 1, 1), 0.02)
+        else:
+            volatility = np.full(count, 0.02)
+
+        # Mevcut fiyat: istenen zaman dilimi, yoksa ilk pozitif fiyat, yoksa varsayılan
+        current_price = np.where(primary_price > 0, primary_price,
+                                 np.where(valid_count > 0, packed[:, 0], 50000.0))
+
+        # Risk yönetimi
+        risk_per_trade = capital * 0.02
+        stop_loss_pct = np.clip(volatility * 2, 0.01, 0.1)
+        position_size = np.where(current_price > 0,
+                                 risk_per_trade / np.where(current_price > 0, current_price * stop_loss_pct, 1.0), 0.0)
+
+        # AI skoru ve seviyeler
+        ai_score = trend_alignment * 3 + momentum_score * 2 + alignment_ratio * 2 + \
+            np.random.uniform(-0.5, 0.5, size=count)
+        signal_strength = np.clip(np.abs(ai_score) * 3, 1, 10)
+        direction = np.where(ai_score > 1.5, 1, np.where(ai_score < -1.5, -1, 0))
+        stop_loss_distance = current_price * stop_loss_pct
+        entry_price = current_price * np.where(direction > 0, 1.002, 0.998)
+        stop_loss = entry_price - direction * stop_loss_distance
+        take_profit = entry_price[:, None] + direction[:, None] * stop_loss_distance[:, None] * np.array([1.5, 2.0, 3.0])
+
+        horizon = self._get_time_horizon(timeframe)
+        signals = []
+        for i in range(count):
+            score = float(ai_score[i])
+            if direction[i] == 0:
+                signals.append({
+                    'sinyal': 'BEKLE',
+                    'ai_skor': round(score, 2),
+                    'güç': 1,
+                    'zaman': horizon,
+                    'giris_fiyati': 0,
+                    'stop_loss': 0,
+                    'take_profit': [],
+                    'pozisyon_buyuklugu': 0,
+                    'risk_miktari': 0,
+                    'risk_reward': 0,
+                    'kaldıraç': '1x',
+                    'neden': self._generate_reason('BEKLE', score, timeframe),
+                    'mevcut_fiyat': round(float(current_price[i]), 4)
+                })
+                continue
+
+            signal = 'AL' if direction[i] > 0 else 'SAT'
+            strength = float(signal_strength[i])
+            signals.append({
+                'sinyal': signal,
+                'ai_skor': round(score, 2),
+                'güç': int(strength),
+                'zaman': horizon,
+                'giris_fiyati': round(float(entry_price[i]), 4),
+                'stop_loss': round(float(stop_loss[i]), 4),
+                'take_profit': [round(float(tp), 4) for tp in take_profit[i]],
+                'pozisyon_buyuklugu': round(float(position_size[i]), 4),
+                'risk_miktari': round(risk_per_trade, 2),
+                'risk_reward': 2.0,
+                'kaldıraç': self._get_leverage(strength),
+                'neden': self._generate_reason(signal, score, timeframe),
+                'mevcut_fiyat': round(float(current_price[i]), 4)
+            })
+
+        buys = int((direction > 0).sum())
+        sells = int((direction < 0).sum())
+        print(f"   🤖 Toplu AI sinyali: {count} sembol | AL {buys} / SAT {sells} / BEKLE {count - buys - sells}")
+
+        return dict(zip(keys, signals)) if keys is not None else signals
+
     def _get_current_price_from_analysis(self, analysis_data, timeframe):
         """Analiz verilerinden gerçek fiyatı al"""
         try:
@@ -10,6 +10,11 @@ import hmac
 import hashlib
 import urllib.parse
 
+from data.rate_limiter import get_shared_limiter
+from data.http_replay import attach_transport
+from data.order_book import OrderBook
+from data.cache import TTLCache
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,7 +27,9 @@ class AutoTrader:
             "daily_loss_limit": -0.1,  # -%10
             "min_signal_strength": 7,
             "max_position_size": 0.1,  # %10 portföy
-            "default_leverage": "3x"
+            "default_leverage": "3x",
+            "max_slippage": 0.005,  # %0.5 - emir defterinden tahmin edilen etki maliyeti sınırı
+            "depth_ttl": 3.0  # REST defterinin yeniden kullanım süresi (sn) - risk kontrolü + yürütme tek istek
         }
         
         # Trading durumu
@@ -35,6 +42,12 @@ class AutoTrader:
         self.exchanges = {}
         self.init_exchanges()
         
+        # sembol -> OrderBook (örn. BinanceStreamClient.get_order_book) - gerçek etki maliyeti için
+        self.order_books = {}
+        # Akıştan defter yoksa /depth snapshot'ı döndüren fonksiyon (örn. BinanceClient.get_depth_snapshot)
+        self.depth_loader = None
+        self.depth_cache = TTLCache(maxsize=64, default_ttl=self.config.get('depth_ttl', 3.0))
+        
         # Risk yöneticisi
         self.risk_manager = None
         
@@ -80,12 +93,21 @@ class AutoTrader:
             signal = signal_data.get('signal', {})
             signal_type = signal.get('sinyal', 'BEKLE')
             
+            # Defter varsa dolum fiyatı etki maliyetiyle kaydırılır
+            entry_price = signal.get('giris_fiyati', 0)
+            slippage = self.estimate_slippage(symbol, signal_type, signal)
+            if slippage == float('inf'):
+                return {"status": "rejected", "reason": "Emir defteri derinliği emir için yetersiz"}
+            if slippage is not None:
+                entry_price *= (1 + slippage) if signal_type == 'AL' else (1 - slippage)
+            
             # Paper trade detayları
             trade_details = {
                 'trade_id': f"paper_{int(time.time())}",
                 'symbol': symbol,
                 'action': signal_type,
-                'entry_price': signal.get('giris_fiyati', 0),
+                'entry_price': entry_price,
+                'estimated_slippage': slippage,
                 'quantity': signal.get('pozisyon_buyuklugu', 0),
                 'timestamp': datetime.now().isoformat(),
                 'status': 'filled',
@@ -202,12 +224,61 @@ class AutoTrader:
             if position_value > self.config['max_position_size']:
                 return {"approved": False, "reason": "Pozisyon büyüklüğü limiti aşıldı"}
             
+            # 6. Emir defteri etki maliyeti kontrolü
+            slippage = self.estimate_slippage(symbol, signal.get('sinyal', 'BEKLE'), signal)
+            if slippage == float('inf'):
+                return {"approved": False, "reason": "Emir defteri derinliği emir için yetersiz"}
+            if slippage is not None and slippage > self.config.get('max_slippage', 0.005):
+                return {"approved": False, "reason": f"Tahmini slippage çok yüksek (%{slippage * 100:.2f})"}
+            
             return {"approved": True, "reason": "Risk kontrolü başarılı"}
             
         except Exception as e:
             logger.error(f"❌ Risk kontrol hatası: {e}")
             return {"approved": False, "reason": "Risk kontrol hatası"}
     
+    def update_order_book(self, symbol: str, book: Optional[OrderBook]):
+        """Akıştan gelen senkron defteri kaydet - None ise (senkron değil) kaldır"""
+        if book is None:
+            self.order_books.pop(symbol, None)
+        else:
+            self.order_books[symbol] = book
+    
+    def get_order_book(self, symbol: str) -> Optional[OrderBook]:
+        """Sembolün emir defteri - akış defteri yoksa REST snapshot'ından kurulur
+
+        REST defteri depth_ttl saniye cache'lenir; aynı trade'in risk kontrolü ve
+        yürütmesi tek /depth isteği kullanır.
+        """
+        book = self.order_books.get(symbol)
+        if book is not None or self.depth_loader is None:
+            return book
+        return self.depth_cache.get_or_load(symbol, lambda: self._load_order_book(symbol))
+    
+    def _load_order_book(self, symbol: str) -> Optional[OrderBook]:
+        snapshot = self.depth_loader(symbol)
+        if not snapshot:
+            return None
+        book = OrderBook(symbol)
+        book.apply_snapshot(snapshot)
+        return book
+    
+    def estimate_slippage(self, symbol: str, signal_type: str, signal: Dict) -> Optional[float]:
+        """Emir defterinden market emrinin tahmini slippage'ı - defter yoksa None"""
+        if signal_type not in ('AL', 'SAT'):
+            return None
+        quote_amount = signal.get('pozisyon_buyuklugu', 0) * signal.get('mevcut_fiyat', 0)
+        if quote_amount <= 0:
+            return None
+        book = self.get_order_book(symbol)
+        if book is None:
+            return None
+        impact = book.impact_cost('buy' if signal_type == 'AL' else 'sell', quote_amount=quote_amount)
+        if not impact:
+            return None
+        # Defter yetmiyorsa emir tamamlanamaz - sınırsız maliyet = ret (kaydedilmez)
+        return max(impact['slippage'], 0.0) if impact['complete'] else float('inf')
+    
     def format_symbol_for_exchange(self, symbol: str, exchange: str) -> str:
         """Sembol formatını exchange'e göre düzenle"""
         if exchange == 'binance':
@@ -331,10 +402,21 @@ class BinanceExchange:
         self.api_key = api_key
         self.api_secret = api_secret
         self.session = requests.Session()
+        attach_transport(self.session)  # HTTP_REPLAY_MODE ayarlıysa kayıt/tekrar
+        
+        # Aynı host'a giden tüm istekler ortak ağırlık bütçesini kullanır
+        self.rate_limiter = get_shared_limiter(urllib.parse.urlparse(self.base_url).netloc)
         
         if api_key:
             self.session.headers.update({'X-MBX-APIKEY': api_key})
     
+    def _request(self, method: str, endpoint: str, params: Dict):
+        """Hız sınırından geçen istek"""
+        self.rate_limiter.acquire(self.rate_limiter.weight_for(endpoint, params))
+        response = self.session.request(method, self.base_url + endpoint, params=params)
+        self.rate_limiter.update_from_headers(response)
+        return response
+    
     def place_order(self, order_params: Dict) -> Dict:
         """Order yerleştir"""
         try:
@@ -357,7 +439,7 @@ class BinanceExchange:
             params['timestamp'] = int(time.time() * 1000)
             params['signature'] = self._generate_signature(params)
             
-            response = self.session.post(self.base_url + endpoint, params=params)
+            response = self._request('POST', endpoint, params)
             
             if response.status_code == 200:
                 return response.json()
@@ -402,7 +484,7 @@ class BinanceExchange:
             params = {'timestamp': int(time.time() * 1000)}
             params['signature'] = self._generate_signature(params)
             
-            response = self.session.get(self.base_url + endpoint, params=params)
+            response = self._request('GET', endpoint, params)
             
             if response.status_code == 200:
                 return response.json()
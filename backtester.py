@@ -1,7 +1,7 @@
 # backtester.py - YENİ DOSYA
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import logging
 import warnings
@@ -12,7 +12,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Backtester:
-    def __init__(self, config=None):
+    def __init__(self, config=None, fear_greed_client=None, order_books=None):
         self.config = config or {
             "initial_capital": 1000,
             "commission": 0.001,  # %0.1
@@ -22,6 +22,8 @@ class Backtester:
         }
         
         self.results = {}
+        self.fear_greed_client = fear_greed_client  # Verilirse gerçek sentiment geçmişi kullanılır
+        self.order_books = order_books or {}  # sembol -> OrderBook; varsa slippage defterden hesaplanır
         logger.info("🔧 Backtester Başlatıldı")
     
     def run_backtest(self, strategy: str, symbols: List[str], days: int = 30, 
@@ -32,6 +34,7 @@ class Backtester:
             
             # Simüle historical data oluştur
             historical_data = self._generate_historical_data(symbols, days)
+            self._attach_fear_greed(historical_data, days)
             
             # Stratejiye göre backtest çalıştır
             if strategy == "ai_trading":
@@ -79,7 +82,7 @@ class Backtester:
                     if signal['action'] == 'BUY' and capital > 100:
                         # Position size hesapla
                         position_size = min(capital * 0.2, capital * 0.1)  # Max %20, typical %10
-                        price = daily_data[symbol]['close'] * (1 + self.config['slippage'])
+                        price = daily_data[symbol]['close'] * (1 + self._slippage(symbol, 'buy', position_size))
                         quantity = position_size / price
                         
                         # Alım yap
@@ -99,8 +102,9 @@ class Backtester:
                     
                     elif signal['action'] == 'SELL' and portfolio[symbol] > 0:
                         # Satım yap
-                        price = daily_data[symbol]['close'] * (1 - self.config['slippage'])
                         quantity = portfolio[symbol]
+                        slippage = self._slippage(symbol, 'sell', quantity * daily_data[symbol]['close'])
+                        price = daily_data[symbol]['close'] * (1 - slippage)
                         revenue = quantity * price * (1 - self.config['commission'])
                         
                         capital += revenue
@@ -183,6 +187,15 @@ class Backtester:
             logger.error(f"❌ Buy & Hold backtest hatası: {e}")
             return {"error": str(e)}
     
+    def _slippage(self, symbol: str, side: str, quote_amount: float) -> float:
+        """Emir defteri varsa market emrinin gerçek etki maliyeti, yoksa sabit slippage"""
+        book = self.order_books.get(symbol)
+        if book is not None:
+            impact = book.impact_cost(side, quote_amount=quote_amount)
+            if impact and impact['complete']:
+                return max(impact['slippage'], 0.0)
+        return self.config['slippage']
+    
     def _simulate_ai_signal(self, symbol: str, current_data: Dict, previous_data: Dict) -> Dict:
         """AI sinyali simüle et"""
         try:
@@ -204,6 +217,24 @@ class Backtester:
         except Exception as e:
             return {'action': 'HOLD', 'confidence': 0.5}
     
+    def _attach_fear_greed(self, historical_data: Dict, days: int):
+        """Gerçek Fear & Greed geçmişini günlük verilere ekle"""
+        if not self.fear_greed_client:
+            return
+        
+        try:
+            history = self.fear_greed_client.get_history(days)
+            by_date = {
+                datetime.fromtimestamp(int(entry['timestamp']), tz=timezone.utc).strftime('%Y-%m-%d'): int(entry['value'])
+                for entry in history
+            }
+            for date_str, daily_data in historical_data.items():
+                if date_str in by_date:
+                    for symbol_data in daily_data.values():
+                        symbol_data['fear_greed'] = by_date[date_str]
+        except Exception as e:
+            logger.error(f"❌ Fear & Greed geçmişi eklenemedi: {e}")
+    
     def _generate_historical_data(self, symbols: List[str], days: int) -> Dict:
         """Historical data simüle et"""
         historical_data = {}
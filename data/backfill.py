@@ -0,0 +1,150 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.binance_client import BinanceClient
+from data.kline_store import interval_to_ms
+
+PAGE_SIZE = 1000  # Binance /klines maksimum limit
+
+def plan_pages(start_ms, end_ms, interval, page_size=PAGE_SIZE):
+    """[start_ms, end_ms] aralığını page_size mumluk sayfalara böl - (başlangıç, bitiş) open_time"""
+    interval_ms = interval_to_ms(interval)
+    first = start_ms // interval_ms * interval_ms
+    pages = []
+    page_start = first
+    while page_start <= end_ms:
+        page_end = min(page_start + (page_size - 1) * interval_ms, end_ms // interval_ms * interval_ms)
+        pages.append((page_start, page_end))
+        page_start = page_end + interval_ms
+    return pages
+
+def parse_date(value):
+    """YYYY-MM-DD veya milisaniye -> UTC milisaniye"""
+    if str(value).isdigit():
+        return int(value)
+    dt = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+class KlineBackfiller:
+    """Sayfalı, paralel ve kaldığı yerden devam edebilen geçmiş mum indirici
+
+    İstekler BinanceClient üzerinden ortak ağırlık bütçesini kullanır; depoda
+    zaten tam olan sayfalar atlanır, böylece yarıda kalan iş yeniden başlatılabilir.
+    """
+
+    def __init__(self, binance_client=None, max_workers=8):
+        self.binance_client = binance_client or BinanceClient(max_workers=max_workers)
+        self.kline_store = self.binance_client.kline_store
+        self.max_workers = max_workers
+
+    def _page_complete(self, symbol, interval, page_start, page_end):
+        # Boşluk indeksi üzerinden O(log n) kapsama kontrolü
+        return self.kline_store.get_gap_index(symbol, interval).covers(page_start, page_end)
+
+    def _fetch_page(self, symbol, interval, page_start, page_end):
+        klines = self.binance_client.get_klines(
+            symbol, interval, limit=PAGE_SIZE, start_time=page_start, end_time=page_end
+        )
+        if klines is None:
+            return None
+        if not klines:
+            # Listelenme öncesi/bakım - tekrar istenmez
+            self.kline_store.mark_empty(symbol, interval, page_start, page_end)
+            return 0
+        # Henüz kapanmamış son mum kaydedilmez - yarım sayfa tekrar çekilsin
+        now_ms = self.binance_client.clock()
+        closed = [k for k in klines if int(k[6]) < now_ms]
+        stored = self.kline_store.upsert_klines(symbol, interval, closed)
+
+        # Sayfa içinde dönmeyen mumlar borsada yok (listelenme öncesi/bakım) - boş işaretle,
+        # böylece sayfa kaldığı yerden devamda tam sayılır ve tekrar istenmez
+        interval_ms = interval_to_ms(interval)
+        cursor = page_start
+        for k in closed:
+            open_time = int(k[0])
+            if open_time > cursor:
+                self.kline_store.mark_empty(symbol, interval, cursor, open_time - interval_ms)
+            cursor = max(cursor, open_time + interval_ms)
+        # Kısa sayfanın kuyruğu: yalnızca sayfa sonu mumu da kapanmışsa
+        if closed and len(closed) == len(klines) and len(klines) < PAGE_SIZE \
+                and cursor <= page_end and page_end + interval_ms <= now_ms:
+            self.kline_store.mark_empty(symbol, interval, cursor, page_end)
+        return stored
+
+    def backfill(self, symbol, interval, start_ms, end_ms=None):
+        """Tek sembol/interval için aralığı doldur"""
+        end_ms = end_ms or self.binance_client.clock()
+        pages = plan_pages(start_ms, end_ms, interval)
+        todo = [p for p in pages if not self._page_complete(symbol, interval, *p)]
+
+        print(f"   📥 {symbol} {interval}: {len(pages)} sayfa, {len(pages) - len(todo)} zaten tamam")
+        return self._run(symbol, interval, todo)
+
+    def backfill_many(self, symbols, interval, start_ms, end_ms=None):
+        """Birden çok sembolü aynı thread havuzunda doldur"""
+        end_ms = end_ms or self.binance_client.clock()
+        jobs = []
+        for symbol in symbols:
+            for page in plan_pages(start_ms, end_ms, interval):
+                if not self._page_complete(symbol, interval, *page):
+                    jobs.append((symbol, page))
+
+        print(f"📥 Backfill: {len(symbols)} sembol, {len(jobs)} eksik sayfa ({interval})")
+        stats = {'pages': 0, 'candles': 0, 'failed': 0}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_page, symbol, interval, *page): (symbol, page)
+                       for symbol, page in jobs}
+            for future in as_completed(futures):
+                self._collect(future, stats)
+        print(f"✅ Backfill tamamlandı: {stats['candles']} mum, {stats['failed']} başarısız sayfa")
+        return stats
+
+    def _run(self, symbol, interval, pages):
+        stats = {'pages': 0, 'candles': 0, 'failed': 0}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_page, symbol, interval, *page) for page in pages]
+            for future in as_completed(futures):
+                self._collect(future, stats)
+        return stats
+
+    def _collect(self, future, stats):
+        try:
+            added = future.result()
+        except Exception as e:
+            print(f"❌ Backfill sayfa hatası: {e}")
+            added = None
+        if added is None:
+            stats['failed'] += 1
+        else:
+            stats['pages'] += 1
+            stats['candles'] += added
+
+def main():
+    try:
+        from settings import SYMBOLS
+    except Exception:
+        SYMBOLS = ["BINANCE:BTCUSDT"]
+
+    parser = argparse.ArgumentParser(description="Binance geçmiş mum backfill aracı")
+    parser.add_argument("--symbols", default=",".join(SYMBOLS), help="Virgülle ayrılmış semboller")
+    parser.add_argument("--interval", default="5m")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD veya ms")
+    parser.add_argument("--end", default=None, help="YYYY-MM-DD veya ms (varsayılan: şimdi)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    backfiller = KlineBackfiller(max_workers=args.workers)
+    start = time.time()
+    backfiller.backfill_many(symbols, args.interval, parse_date(args.start),
+                             parse_date(args.end) if args.end else None)
+    print(f"⏱️  Süre: {time.time() - start:.1f} sn")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import indicator_graph
+
+# _calculate_advanced_indicators'ta en uzun geriye bakış (EMA 50)
+DEFAULT_MIN_HISTORY = 50
+
+def align_klines(klines_by_symbol, interval_ms, length=None):
+    """Sembol başına kline listelerini ortak zaman ızgarasına hizala
+
+    Izgara en güncel open_time'da biter; eksik mumlar NaN olur.
+    Dönüş: (semboller, open_times, {'open','high','low','close','volume': (S x T)})
+    """
+    symbols = [s for s, klines in klines_by_symbol.items() if klines]
+    if not symbols:
+        return [], np.empty(0, dtype=np.int64), {}
+
+    rows = {s: np.asarray([k[:6] for k in klines_by_symbol[s]], dtype=np.float64) for s in symbols}
+    last = max(int(r[-1, 0]) for r in rows.values())
+    length = length or max(len(r) for r in rows.values())
+    open_times = last - interval_ms * np.arange(length - 1, -1, -1, dtype=np.int64)
+
+    fields = ('open', 'high', 'low', 'close', 'volume')
+    matrices = {field: np.full((len(symbols), length), np.nan) for field in fields}
+    for i, symbol in enumerate(symbols):
+        data = rows[symbol]
+        positions = (data[:, 0].astype(np.int64) - open_times[0]) // interval_ms
+        keep = (positions >= 0) & (positions < length)
+        for j, field in enumerate(fields, start=1):
+            matrices[field][i, positions[keep]] = data[keep, j]
+    return symbols, open_times, matrices
+
+def _trailing_lengths(finite):
+    """Her satırın sondan kesintisiz geçerli değer sayısı"""
+    bad = ~finite
+    width = finite.shape[1]
+    last_bad = width - 1 - np.argmax(bad[:, ::-1], axis=1)
+    return np.where(bad.any(axis=1), width - 1 - last_bad, width)
+
+class BatchIndicatorResult:
+    """Çapraz sembol gösterge sonucu - satırlar semboller, sütunlar ortak zaman ızgarası"""
+
+    def __init__(self, series, close, lengths, mask):
+        self.series = series      # ad -> (S x T), geçersiz/dolgu hücreleri NaN
+        self.close = close
+        self.lengths = lengths    # sondan kesintisiz mum sayısı
+        self.mask = mask          # yeterli geçmişe sahip satırlar
+
+    def __getitem__(self, name):
+        return self.series[name]
+
+    def latest(self, name, offset=0):
+        """Sembol başına son (offset kadar önceki) değer - (S,), maskeli satırlar NaN"""
+        return self.series[name][:, -1 - offset]
+
+    def snapshots(self, symbols):
+        """Geçerli semboller için _calculate_advanced_indicators ile aynı sözlükler"""
+        latest = {name: self.latest(name) for name in self.series}
+        rsi_prev = self.latest('rsi', 1) if 'rsi' in self.series else None
+        result = {}
+        for i in np.flatnonzero(self.mask):
+            snapshot = {}
+            for name, values in latest.items():
+                snapshot[name] = float(values[i])
+                if name == 'rsi':
+                    snapshot['rsi_prev'] = float(rsi_prev[i])
+            result[symbols[i]] = snapshot
+        return result
+
+def compute_batch(closes, highs, lows, outputs=None, min_history=DEFAULT_MIN_HISTORY, registry=None):
+    """Hizalı (sembol x zaman) matrislerinden tüm göstergeleri tek vektörel geçişte hesapla
+
+    Son sütun en güncel mumdur; geçmişi kısa (ya da boşluklu) semboller soldan NaN
+    taşır. Her satır kendi kesintisiz kuyruğu üzerinden, tek sembollük hesapla
+    birebir aynı sonuçla hesaplanır; min_history'den kısa satırlar maskelenir.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    if closes.ndim != 2 or closes.shape != highs.shape or closes.shape != lows.shape:
+        raise ValueError("closes, highs ve lows aynı (sembol x zaman) boyutunda olmalı")
+
+    count, width = closes.shape
+    lengths = _trailing_lengths(np.isfinite(closes) & np.isfinite(highs) & np.isfinite(lows))
+    mask = lengths >= max(1, min_history)
+    outputs = outputs or indicator_graph.DEFAULT_OUTPUTS
+
+    rows = np.flatnonzero(mask)
+    series = {name: np.full((count, width), np.nan) for name in outputs}
+    if len(rows) == 0:
+        return BatchIndicatorResult(series, closes, lengths, mask)
+
+    # Satırları sola yasla: her sembolün geçmişi 0. sütundan başlar, ısınma pencereleri çakışır.
+    # Göstergeler nedensel olduğundan sağdaki dolgu geçerli hücreleri etkilemez.
+    columns = np.arange(width)
+    pad = (width - lengths[rows])[:, None]
+    source = np.minimum(columns + pad, width - 1)
+    inside = columns < lengths[rows][:, None]
+    candles = {
+        'close': np.where(inside, np.take_along_axis(closes[rows], source, axis=1), np.nan),
+        'high': np.where(inside, np.take_along_axis(highs[rows], source, axis=1), np.nan),
+        'low': np.where(inside, np.take_along_axis(lows[rows], source, axis=1), np.nan)
+    }
+    values = (registry or indicator_graph.REGISTRY).evaluate(candles, outputs)
+
+    # Geri sağa yasla - son sütun yine en güncel mum
+    target = columns - pad
+    valid = target >= 0
+    target = np.maximum(target, 0)
+    for name, matrix in values.items():
+        series[name][rows] = np.where(valid, np.take_along_axis(matrix, target, axis=1), np.nan)
+    return BatchIndicatorResult(series, closes, lengths, mask)
@@ -1,6 +1,6 @@
 import requests
-import pandas as pd
-import numpy as np
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import time
 import sys
@@ -8,16 +8,99 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from data.kline_store import KlineStore, INTERVAL_MS, interval_to_ms
+from data import indicators, indicator_graph
+from data.rate_limiter import get_shared_limiter
+from data.resampler import resample_klines, can_resample
+from data.cache import TTLCache, next_candle_close
+from data.candle_buffer import CandleBuffer
+from data.gap_index import find_gaps
+from data.batch_indicators import align_klines, compute_batch, DEFAULT_MIN_HISTORY
+from data.indicator_memo import IndicatorMemo
+from data.http_replay import attach_transport, replay_active, replay_db_path, clock_ms
+
 class BinanceClient:
-    def __init__(self):
+    def __init__(self, kline_store=None, rate_limiter=None, max_workers=8, cache=None,
+                 price_ttl=2.0, kline_max_ttl=None, snapshot_ttl=None, indicator_memo=None, clock=None):
         self.base_url = "https://api.binance.com/api/v3"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+        # Eşzamanlı istekler için bağlantı havuzu
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        attach_transport(self.session)  # HTTP_REPLAY_MODE ayarlıysa kayıt/tekrar
+        self.max_workers = max_workers
+        self._executor = None
+        
+        # Merkezi, ağırlık bazlı hız sınırı - tüm Binance istemcileri paylaşır
+        self.rate_limiter = rate_limiter or get_shared_limiter("api.binance.com")
+        
+        # Replay modunda depo geçicidir; cache ve memo gerçek saate bağlı olduğundan kapalıdır
+        replay = replay_active()
+        
+        # Mum kapanışı / eksik mum hesabı için saat (ms) - replay modunda kayıt saati
+        self.clock = clock or clock_ms
+        
+        # Yerel mum deposu - artımlı senkronizasyon için
+        self.kline_store = kline_store or KlineStore(replay_db_path())
+        
+        # Read-through cache: kline'lar bir sonraki mum kapanışında, fiyatlar kısa TTL ile düşer
+        self.cache = cache or TTLCache(maxsize=0 if replay else 512)
+        self.price_ttl = price_ttl
+        self.kline_max_ttl = kline_max_ttl
+        self.snapshot_ttl = snapshot_ttl if snapshot_ttl is not None else price_ttl
+        
+        # Kapanmamış yüksek zaman dilimlerinde göstergeler yeniden hesaplanmaz (False = kapalı)
+        if indicator_memo is None:
+            indicator_memo = not replay and IndicatorMemo()
+        self.indicator_memo = indicator_memo or None
+    
+    def _get(self, url, params=None, timeout=10):
+        """Hız sınırından geçen GET isteği"""
+        self.rate_limiter.acquire(self.rate_limiter.weight_for(url, params))
+        response = self.session.get(url, params=params, timeout=timeout)
+        self.rate_limiter.update_from_headers(response)
+        return response
+    
+    @property
+    def executor(self):
+        """Paylaşılan thread havuzu (ilk kullanımda oluşturulur)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="binance")
+        return self._executor
+        
     def get_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
-        """Binance'dan kline/candlestick verilerini al"""
+        """Binance'dan kline/candlestick verilerini al - cache'li
+        
+        Sadece kapanmış mumlardan oluşan yanıt bir sonraki mum kapanışına kadar,
+        açık mumu içeren yanıt ise fiyat gibi kısa TTL (price_ttl) ile tutulur.
+        """
+        if end_time:
+            # Geçmiş aralıklar (backfill) cache'e alınmaz
+            return self._fetch_klines(symbol, interval, limit, start_time, end_time)
+        
+        key = ('klines', symbol, interval, limit, start_time)
+        klines = self.cache.get(key)
+        if klines is not None:
+            return klines
+        
+        klines = self._fetch_klines(symbol, interval, limit, start_time, end_time)
+        if klines:
+            if int(klines[-1][6]) >= self.clock():
+                # Son mum hâlâ açık - fiyatı her an değişebilir
+                expires_at = time.time() + self.price_ttl
+            else:
+                expires_at = next_candle_close(interval, self.clock()) / 1000
+            if self.kline_max_ttl is not None:
+                expires_at = min(expires_at, time.time() + self.kline_max_ttl)
+            self.cache.set(key, klines, expires_at=expires_at)
+        return klines
+    
+    def _fetch_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        """Kline isteğini doğrudan gönder"""
         url = f"{self.base_url}/klines"
         
         # Binance sembol formatına çevir (BINANCE:BTCUSDT -> BTCUSDT)
@@ -35,7 +118,7 @@ class BinanceClient:
             params['endTime'] = end_time
             
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=10)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -45,14 +128,205 @@ class BinanceClient:
             print(f"❌ Binance bağlantı hatası: {e}")
             return None
     
+    def sync_klines(self, symbol, interval, limit=100):
+        """Yerel depoyu güncelle - sadece son close_time'dan yeni mumları çek"""
+        last_open = self.kline_store.get_last_open_time(symbol, interval)
+        
+        if last_open is None:
+            # Depo boş - ilk doldurma
+            klines = self.get_klines(symbol, interval, limit=limit)
+        else:
+            interval_ms = interval_to_ms(interval)
+            now_ms = self.clock()
+            
+            # Son kayıtlı mum açıkken kaydedilmiş olabilir - onu da yenile
+            start_time = last_open
+            missing = (now_ms - start_time) // interval_ms + 1
+            
+            if missing > 1000:
+                # Çok uzun ara - sadece en güncel pencereyi çek
+                klines = self.get_klines(symbol, interval, limit=limit)
+            else:
+                klines = self.get_klines(symbol, interval, limit=missing, start_time=start_time)
+        
+        if klines is None:
+            return None
+        
+        return self.kline_store.upsert_klines(symbol, interval, klines)
+    
+    def get_synced_klines(self, symbol, interval, limit=100):
+        """Depoyu senkronize et, penceredeki boşlukları onar ve son mumları depodan oku"""
+        if self.sync_klines(symbol, interval, limit=limit) is None:
+            return None
+        
+        last_open = self.kline_store.get_last_open_time(symbol, interval)
+        if last_open is None:
+            # Sembol için hiç mum yok (yeni listelenmiş / hatalı sembol)
+            return []
+        self.repair_gaps(symbol, interval, last_open - (limit - 1) * interval_to_ms(interval), last_open)
+        return self.kline_store.get_klines(symbol, interval, limit=limit)
+    
+    def repair_gaps(self, symbol, interval, start_time, end_time):
+        """Depodaki eksik aralıkları sadece o aralıkları çekerek doldur - onarılan mum sayısı"""
+        index = self.kline_store.get_gap_index(symbol, interval)
+        interval_ms = interval_to_ms(interval)
+        repaired = 0
+        
+        for gap_start, gap_end in index.gaps(int(start_time), int(end_time)):
+            # 1000 mumluk sayfalar halinde
+            for page_start in range(gap_start, gap_end + 1, 1000 * interval_ms):
+                page_end = min(gap_end, page_start + 999 * interval_ms)
+                klines = self.get_klines(symbol, interval, limit=1000,
+                                         start_time=page_start, end_time=page_end + interval_ms - 1)
+                if klines is None:
+                    return repaired
+                if not klines:
+                    # Borsada bu aralıkta mum yok (bakım vb.) - tekrar denenmez
+                    self.kline_store.mark_empty(symbol, interval, page_start, page_end)
+                    continue
+                repaired += self.kline_store.upsert_klines(symbol, interval, klines)
+        
+        if repaired:
+            print(f"   🩹 {symbol} {interval}: {repaired} eksik mum onarıldı")
+        return repaired
+    
     def get_current_price(self, symbol):
-        """Anlık fiyat bilgisini al - GÜNCEL"""
+        """Anlık fiyat bilgisini al - tüm semboller snapshot'ından"""
+        binance_symbol = symbol.replace('BINANCE:', '')
+        prices = self.get_all_prices()
+        if prices and binance_symbol in prices:
+            return prices[binance_symbol]
+        
+        # Snapshot alınamazsa tek sembol isteği
+        return self.cache.get_or_load(
+            ('price', symbol),
+            lambda: self._fetch_current_price(symbol),
+            ttl=self.price_ttl
+        )
+    
+    def get_all_prices(self):
+        """Tüm sembollerin fiyatı tek istekte - {BTCUSDT: fiyat} (kısa TTL ile paylaşılır)"""
+        return self.cache.get_or_load(('snapshot', 'price'), self._fetch_all_prices, ttl=self.snapshot_ttl)
+    
+    def get_24h_stats(self, symbol=None):
+        """Tüm sembollerin 24 saatlik istatistikleri tek istekte - symbol verilirse sadece o"""
+        stats = self.cache.get_or_load(('snapshot', '24hr'), self._fetch_24h_stats, ttl=self.snapshot_ttl)
+        if symbol is None:
+            return stats
+        return (stats or {}).get(symbol.replace('BINANCE:', ''))
+    
+    def _fetch_all_prices(self):
+        try:
+            response = self._get(f"{self.base_url}/ticker/price", timeout=10)
+            if response.status_code == 200:
+                return {item['symbol']: float(item['price']) for item in response.json()}
+            print(f"❌ Binance fiyat snapshot hatası: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"❌ Fiyat snapshot alınamadı: {e}")
+            return None
+    
+    def _fetch_24h_stats(self):
+        try:
+            response = self._get(f"{self.base_url}/ticker/24hr", timeout=10)
+            if response.status_code != 200:
+                print(f"❌ Binance 24s snapshot hatası: {response.status_code}")
+                return None
+            return {
+                item['symbol']: {
+                    'price': float(item['lastPrice']),
+                    'change': float(item['priceChangePercent']),
+                    'high': float(item['highPrice']),
+                    'low': float(item['lowPrice']),
+                    'volume': float(item['volume']),
+                    'quote_volume': float(item['quoteVolume']),
+                    'trades': int(item.get('count', 0))
+                }
+                for item in response.json()
+            }
+        except Exception as e:
+            print(f"❌ 24s snapshot alınamadı: {e}")
+            return None
+    
+    def get_depth_snapshot(self, symbol, limit=1000):
+        """/depth emir defteri snapshot'ı - {'lastUpdateId', 'bids', 'asks'} (cache'lenmez)"""
+        params = {'symbol': symbol.replace('BINANCE:', ''), 'limit': limit}
+        try:
+            response = self._get(f"{self.base_url}/depth", params=params, timeout=10)
+            if response.status_code == 200:
+                return response.json()
+            print(f"❌ Binance depth hatası: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"❌ Depth snapshot alınamadı: {e}")
+            return None
+    
+    def get_agg_trades(self, symbol, from_id=None, start_time=None, end_time=None, limit=1000):
+        """/aggTrades isteği - işlem listesi (eskiden yeniye) veya hata durumunda None"""
+        params = {'symbol': symbol.replace('BINANCE:', ''), 'limit': min(limit, 1000)}
+        if from_id is not None:
+            params['fromId'] = from_id
+        if start_time is not None:
+            params['startTime'] = start_time
+        if end_time is not None:
+            params['endTime'] = end_time
+        try:
+            response = self._get(f"{self.base_url}/aggTrades", params=params, timeout=10)
+            if response.status_code == 200:
+                return response.json()
+            print(f"❌ Binance aggTrades hatası: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"❌ aggTrades alınamadı: {e}")
+            return None
+    
+    def iter_agg_trades(self, symbol, start_time=None, end_time=None, from_id=None):
+        """Aralıktaki tüm aggTrade'leri sayfalayarak üret - önce zamanla, sonra fromId ile
+        
+        start_time ya da from_id'den biri gereklidir (çağrı anında kontrol edilir).
+        """
+        if from_id is None and start_time is None:
+            raise ValueError("iter_agg_trades için start_time ya da from_id verilmeli")
+        return self._iter_agg_trades(symbol, start_time, end_time or self.clock(), from_id)
+    
+    def _iter_agg_trades(self, symbol, start_time, end_time, from_id):
+        hour_ms = 60 * 60_000
+        
+        if from_id is None:
+            # startTime + endTime birlikte en fazla 1 saatlik pencere kabul eder
+            trades = []
+            while not trades and start_time <= end_time:
+                trades = self.get_agg_trades(symbol, start_time=start_time,
+                                             end_time=min(start_time + hour_ms - 1, end_time))
+                if trades is None:
+                    return
+                start_time += hour_ms
+        else:
+            trades = self.get_agg_trades(symbol, from_id=from_id)
+        
+        # Zaman penceresi sadece ilk id'yi bulmak için - sonrası boş sayfaya ya da end_time'a kadar fromId
+        while trades:
+            for trade in trades:
+                if int(trade['T']) > end_time:
+                    return
+                yield trade
+            trades = self.get_agg_trades(symbol, from_id=int(trades[-1]['a']) + 1)
+    
+    def get_cache_stats(self):
+        """Cache hit/miss sayaçları"""
+        stats = self.cache.get_stats()
+        if self.indicator_memo is not None:
+            stats['indicator_memo'] = self.indicator_memo.get_stats()
+        return stats
+    
+    def _fetch_current_price(self, symbol):
+        """Anlık fiyat isteğini doğrudan gönder"""
         url = f"{self.base_url}/ticker/price"
         binance_symbol = symbol.replace('BINANCE:', '')
         params = {'symbol': binance_symbol}
         
         try:
-            response = self.session.get(url, params=params, timeout=5)
+            response = self._get(url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return float(data['price'])
@@ -61,231 +335,108 @@ class BinanceClient:
             print(f"❌ Güncel fiyat alınamadı: {e}")
             return None
     
-    def calculate_technical_indicators(self, klines_data, symbol, timeframe):
-        """Ham kline verilerinden teknik göstergeleri hesapla - GELİŞMİŞ"""
+    def calculate_technical_indicators(self, klines_data, symbol, timeframe, allow_gaps=False, live=True,
+                                       use_fallback=True, source="kline"):
+        """Ham kline verilerinden teknik göstergeleri hesapla - GELİŞMİŞ
+        
+        Seride eksik mum varsa allow_gaps=True verilmedikçe hesaplama yapılmaz (None);
+        borsada boş olduğu doğrulanan aralıklar eksik sayılmaz.
+        Memo açıksa kapanmış mumlar cache'ten gelir, sadece açık mum uygulanır
+        (live=False ise açık mum hiç katılmaz). use_fallback=False ise veri yoksa ya da
+        hesaplama hatasında rastgele fallback yerine None döner. source bar kaynağıdır
+        (kline, resampled) ve memo anahtarına girer.
+        """
         if not klines_data:
-            return self._get_fallback_data(symbol, timeframe)
+            return self._get_fallback_data(symbol, timeframe) if use_fallback else None
         
         try:
-            # DataFrame oluştur
-            df = pd.DataFrame(klines_data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy',
-                'taker_quote', 'ignore'
-            ])
+            # Kline JSON'unu doğrudan sütun bazlı float dizilere ayrıştır
+            candles = klines_data if isinstance(klines_data, CandleBuffer) else CandleBuffer.from_klines(klines_data)
             
-            # Sayısal veriye çevir
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
+            if not allow_gaps and timeframe in INTERVAL_MS:
+                gaps = find_gaps(candles.open_times, INTERVAL_MS[timeframe])
+                if gaps:
+                    # Borsada boş olduğu doğrulanan aralıklar (bakım vb.) boşluk sayılmaz
+                    gaps = find_gaps(candles.open_times, INTERVAL_MS[timeframe],
+                                     index=self.kline_store.get_gap_index(symbol, timeframe))
+                if gaps:
+                    print(f"   ⚠️ {symbol} {timeframe} serisinde {len(gaps)} boşluk var, göstergeler hesaplanmadı")
+                    return None
             
             # Son veriyi al (en güncel)
-            latest = df.iloc[-1]
-            prev = df.iloc[-2] if len(df) > 1 else latest
-            
-            # GELİŞMİŞ teknik göstergeleri hesapla
-            indicators = self._calculate_advanced_indicators(df)
+            current_price = candles.latest('close')
+            prev_price = candles.latest('close', 1) if len(candles) > 1 else current_price
             
-            current_price = float(latest['close'])
-            prev_price = float(prev['close'])
-            price_change = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
+            # GELİŞMİŞ teknik göstergeleri hesapla - tam seriler 'series' altında tembel erişilir
+            series = indicator_graph.IndicatorResult(candles)
+            if self.indicator_memo is not None:
+                values = self.indicator_memo.get_snapshot(symbol, timeframe, candles, live=live, source=source)
+            else:
+                values = series.snapshot()
             
-            return {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'close': round(current_price, 4),
-                'volume': int(float(latest['volume'])),
-                'change': round(price_change, 2),
-                'change_abs': round(current_price - prev_price, 4),
-                'rsi': round(indicators['rsi'], 2),
-                'rsi_1': round(indicators['rsi_prev'], 2),
-                'macd': round(indicators['macd'], 4),
-                'macd_signal': round(indicators['macd_signal'], 4),
-                'macd_histogram': round(indicators['macd_histogram'], 4),
-                'ema_20': round(indicators['ema_20'], 4),
-                'ema_50': round(indicators['ema_50'], 4),
-                'bollinger_upper': round(indicators['bollinger_upper'], 4),
-                'bollinger_lower': round(indicators['bollinger_lower'], 4),
-                'bollinger_middle': round(indicators['bollinger_middle'], 4),
-                'stoch_k': round(indicators['stoch_k'], 2),
-                'stoch_d': round(indicators['stoch_d'], 2),
-                'recommendation': self._get_recommendation(indicators)
-            }
+            data = self.format_indicator_data(
+                symbol, timeframe, values,
+                current_price, prev_price, candles.latest('volume')
+            )
+            data['series'] = series
+            return data
         except Exception as e:
             print(f"❌ Teknik gösterge hesaplama hatası: {e}")
-            return self._get_fallback_data(symbol, timeframe)
+            return self._get_fallback_data(symbol, timeframe) if use_fallback else None
     
-    def _calculate_advanced_indicators(self, df):
-        """GELİŞMİŞ teknik göstergeleri hesapla"""
-        close_prices = df['close'].values
-        high_prices = df['high'].values
-        low_prices = df['low'].values
-        
-        # RSI Hesaplama
-        rsi = self._calculate_rsi(close_prices)
-        
-        # MACD Hesaplama
-        macd, macd_signal, macd_histogram = self._calculate_macd(close_prices)
-        
-        # EMA Hesaplama
-        ema_20 = self._calculate_ema(close_prices, 20)
-        ema_50 = self._calculate_ema(close_prices, 50)
-        
-        # Bollinger Bands Hesaplama
-        bb_upper, bb_lower, bb_middle = self._calculate_bollinger_bands(close_prices)
-        
-        # Stochastic Hesaplama
-        stoch_k, stoch_d = self._calculate_stochastic(high_prices, low_prices, close_prices)
+    def format_indicator_data(self, symbol, timeframe, indicators, current_price, prev_price, volume):
+        """Gösterge değerlerini zaman dilimi veri sözlüğüne çevir"""
+        price_change = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
         
         return {
-            'rsi': rsi[-1] if len(rsi) > 0 else 50,
-            'rsi_prev': rsi[-2] if len(rsi) > 1 else 50,
-            'macd': macd[-1] if len(macd) > 0 else 0,
-            'macd_signal': macd_signal[-1] if len(macd_signal) > 0 else 0,
-            'macd_histogram': macd_histogram[-1] if len(macd_histogram) > 0 else 0,
-            'ema_20': ema_20[-1] if len(ema_20) > 0 else close_prices[-1],
-            'ema_50': ema_50[-1] if len(ema_50) > 0 else close_prices[-1],
-            'bollinger_upper': bb_upper[-1] if len(bb_upper) > 0 else close_prices[-1],
-            'bollinger_lower': bb_lower[-1] if len(bb_lower) > 0 else close_prices[-1],
-            'bollinger_middle': bb_middle[-1] if len(bb_middle) > 0 else close_prices[-1],
-            'stoch_k': stoch_k[-1] if len(stoch_k) > 0 else 50,
-            'stoch_d': stoch_d[-1] if len(stoch_d) > 0 else 50
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'close': round(current_price, 4),
+            'volume': int(volume),
+            'change': round(price_change, 2),
+            'change_abs': round(current_price - prev_price, 4),
+            'rsi': round(indicators['rsi'], 2),
+            'rsi_1': round(indicators['rsi_prev'], 2),
+            'macd': round(indicators['macd'], 4),
+            'macd_signal': round(indicators['macd_signal'], 4),
+            'macd_histogram': round(indicators['macd_histogram'], 4),
+            'ema_20': round(indicators['ema_20'], 4),
+            'ema_50': round(indicators['ema_50'], 4),
+            'bollinger_upper': round(indicators['bollinger_upper'], 4),
+            'bollinger_lower': round(indicators['bollinger_lower'], 4),
+            'bollinger_middle': round(indicators['bollinger_middle'], 4),
+            'stoch_k': round(indicators['stoch_k'], 2),
+            'stoch_d': round(indicators['stoch_d'], 2),
+            'recommendation': self._get_recommendation(indicators)
         }
     
+    def _calculate_advanced_indicators(self, candles):
+        """GELİŞMİŞ teknik göstergeleri hesapla - CandleBuffer veya DataFrame"""
+        return indicator_graph.IndicatorResult(candles).snapshot()
+    
     def _calculate_rsi(self, prices, period=14):
         """RSI hesapla"""
-        if len(prices) < period + 1:
-            return [50] * len(prices)
-        
-        # ✅ DÜZELTME: NumPy array'e çevir
-        prices = np.array(prices)
-        deltas = np.diff(prices)
-        
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gains = np.zeros_like(prices)
-        avg_losses = np.zeros_like(prices)
-        
-        # İlk değerler
-        avg_gains[period] = np.mean(gains[:period])
-        avg_losses[period] = np.mean(losses[:period])
-        
-        for i in range(period + 1, len(prices)):
-            avg_gains[i] = (avg_gains[i-1] * (period - 1) + gains[i-1]) / period
-            avg_losses[i] = (avg_losses[i-1] * (period - 1) + losses[i-1]) / period
-        
-        rs = avg_gains / (avg_losses + 1e-10)
-        rsi = 100 - (100 / (1 + rs))
-        
-        # ✅ DÜZELTME: tolist() yerine list comprehension
-        return [float(x) for x in rsi]
+        return indicators.rsi(prices, period)
     
     def _calculate_macd(self, prices, fast=12, slow=26, signal=9):
         """MACD hesapla"""
-        if len(prices) < slow:
-            return [0] * len(prices), [0] * len(prices), [0] * len(prices)
-        
-        # ✅ DÜZELTME: NumPy array'e çevir
-        prices = np.array(prices)
-        
-        ema_fast = self._calculate_ema(prices, fast)
-        ema_slow = self._calculate_ema(prices, slow)
-        
-        macd_line = np.array(ema_fast) - np.array(ema_slow)
-        signal_line = self._calculate_ema(macd_line, signal)
-        histogram = macd_line - signal_line
-        
-        # ✅ DÜZELTME: tolist() yerine list comprehension
-        return (
-            [float(x) for x in macd_line],
-            [float(x) for x in signal_line], 
-            [float(x) for x in histogram]
-        )
+        return indicators.macd(prices, fast, slow, signal)
     
     def _calculate_ema(self, prices, period):
         """EMA hesapla"""
-        if len(prices) < period:
-            # ✅ DÜZELTME: Liste döndür
-            return [float(x) for x in prices] if hasattr(prices, '__iter__') else [float(prices)]
-        
-        # ✅ DÜZELTME: NumPy array'e çevir
-        prices = np.array(prices)
-        ema = np.zeros_like(prices)
-        multiplier = 2 / (period + 1)
-        
-        # SMA ile başla
-        sma = np.mean(prices[:period])
-        ema[period-1] = sma
-        
-        # EMA devamı
-        for i in range(period, len(prices)):
-            ema[i] = (prices[i] * multiplier) + (ema[i-1] * (1 - multiplier))
-        
-        # ✅ DÜZELTME: tolist() yerine list comprehension
-        return [float(x) for x in ema]
+        return indicators.ema(prices, period)
     
     def _calculate_bollinger_bands(self, prices, period=20, std_dev=2):
         """Bollinger Bands hesapla"""
-        if len(prices) < period:
-            middle = [float(x) for x in prices]
-            upper = [float(x) for x in prices]
-            lower = [float(x) for x in prices]
-        else:
-            middle = self._calculate_sma(prices, period)
-            std = pd.Series(prices).rolling(window=period).std().tolist()
-            
-            upper = np.array(middle) + (np.array(std) * std_dev)
-            lower = np.array(middle) - (np.array(std) * std_dev)
-            
-            # İlk period-1 değeri için fiyatı kullan
-            for i in range(period-1):
-                upper[i] = prices[i]
-                lower[i] = prices[i]
-        
-        return (
-            [float(x) for x in upper],
-            [float(x) for x in lower], 
-            [float(x) for x in middle]
-        )
+        return indicators.bollinger_bands(prices, period, std_dev)
     
     def _calculate_sma(self, prices, period):
         """Simple Moving Average hesapla"""
-        if len(prices) < period:
-            return [float(x) for x in prices]
-        
-        sma = []
-        for i in range(len(prices)):
-            if i < period - 1:
-                sma.append(float(prices[i]))
-            else:
-                sma.append(float(np.mean(prices[i-period+1:i+1])))
-        return sma
+        return indicators.sma(prices, period)
     
     def _calculate_stochastic(self, high, low, close, period=14, smooth_k=3, smooth_d=3):
         """Stochastic Oscillator hesapla"""
-        if len(close) < period:
-            return [50] * len(close), [50] * len(close)
-        
-        k_values = []
-        for i in range(len(close)):
-            if i < period - 1:
-                k_values.append(50)
-            else:
-                highest_high = max(high[i-period+1:i+1])
-                lowest_low = min(low[i-period+1:i+1])
-                if highest_high != lowest_low:
-                    k = 100 * (close[i] - lowest_low) / (highest_high - lowest_low)
-                else:
-                    k = 50
-                k_values.append(float(k))
-        
-        # Smooth K değeri
-        k_smooth = self._calculate_sma(k_values, smooth_k)
-        
-        # Smooth D değeri (signal line)
-        d_smooth = self._calculate_sma(k_smooth, smooth_d)
-        
-        return k_smooth, d_smooth
+        return indicators.stochastic(high, low, close, period, smooth_k, smooth_d)
     
     def _get_recommendation(self, indicators):
         """Göstergelere göre tavsiye oluştur"""
@@ -376,41 +527,125 @@ class BinanceClient:
             'recommendation': random.choice(["BUY", "SELL", "NEUTRAL"])
         }
     
-    def get_multiple_timeframe_data(self, symbol, timeframes=["5m", "15m", "1h", "4h"]):
-        """Çoklu zaman dilimlerinde Binance verilerini al - GÜNCEL"""
-        timeframe_data = {}
+    def get_multiple_timeframe_data(self, symbol, timeframes=["5m", "15m", "1h", "4h"], use_fallback=True):
+        """Çoklu zaman dilimlerinde Binance verilerini al - eşzamanlı
         
+        use_fallback=False ise alınamayan zaman dilimleri None döner (hibrit istemci için).
+        """
         print(f"   📊 Binance: {symbol} için çoklu zaman dilimi verileri çekiliyor...")
         
+        # Tüm zaman dilimleri aynı anda istenir, hız sınırı merkezi
+        futures = {tf: self.executor.submit(self._fetch_timeframe, symbol, tf, use_fallback) for tf in timeframes}
+        
+        timeframe_data = {}
+        for timeframe in timeframes:
+            timeframe_data[timeframe] = futures[timeframe].result()
+        
+        return timeframe_data
+    
+    def _fetch_timeframe(self, symbol, timeframe, use_fallback=True):
+        """Tek zaman dilimi verisini al ve göstergeleri hesapla"""
         # Binance interval mapping
         interval_map = {
             "5m": "5m", "15m": "15m", "1h": "1h", "4h": "4h", "1d": "1d"
         }
         
+        print(f"   🔄 Binance {timeframe} verisi alınıyor...")
+        
+        binance_interval = interval_map.get(timeframe, "15m")
+        klines = self.get_synced_klines(symbol, binance_interval, limit=100)
+        
+        if klines:
+            data = self.calculate_technical_indicators(klines, symbol, timeframe, use_fallback=False)
+            if data and data['close'] > 0:
+                print(f"   ✅ Binance {timeframe} verisi alındı - ${data['close']:,.4f}")
+                return data
+            print(f"   ⚠️ Binance {timeframe} verisi hesaplanamadı, fallback kullanılıyor")
+        else:
+            print(f"   ⚠️ Binance {timeframe} verisi alınamadı, fallback kullanılıyor")
+        
+        if not use_fallback:
+            return None
+        return self._get_fallback_data(symbol, timeframe)
+    
+    def get_resampled_timeframe_data(self, symbol, timeframes, base_interval="5m", limit=100, min_bars=50,
+                                     use_fallback=True, max_base_candles=5000):
+        """Tüm zaman dilimlerini tek taban akışından yeniden örnekleyerek üret
+        
+        Taban penceresi en büyük hedefin limit (+ baştaki yarım kova) mumunu
+        karşılayacak şekilde boyutlanır, max_base_candles ile sınırlanır. min_bars
+        hedef mum için bundan fazla taban mumu gereken zaman dilimleri (örn. 5m
+        tabanından 1d ~14.700 mum) ve tabandan üretilemeyenler doğrudan çekilir.
+        İlk doldurma 1000 mumluk sayfalarla yapılır, sonrasında sadece yeni mumlar gelir.
+        """
+        print(f"   📊 Binance: {symbol} için {base_interval} tabanından yeniden örnekleme...")
+        
+        base_ms = interval_to_ms(base_interval)
+        ratios = {}
+        direct = []
         for timeframe in timeframes:
-            print(f"   🔄 Binance {timeframe} verisi alınıyor...")
-            
-            binance_interval = interval_map.get(timeframe, "15m")
-            klines = self.get_klines(symbol, binance_interval, limit=100)
-            
-            if klines:
-                data = self.calculate_technical_indicators(klines, symbol, timeframe)
-                if data and data['close'] > 0:
-                    timeframe_data[timeframe] = data
-                    print(f"   ✅ Binance {timeframe} verisi alındı - ${data['close']:,.4f}")
-                else:
-                    print(f"   ⚠️ Binance {timeframe} verisi hesaplanamadı, fallback kullanılıyor")
-                    fallback_data = self._get_fallback_data(symbol, timeframe)
-                    timeframe_data[timeframe] = fallback_data
+            ratio = interval_to_ms(timeframe) // base_ms if can_resample(base_interval, timeframe) else None
+            if ratio is None or (min_bars + 1) * ratio > max_base_candles:
+                direct.append(timeframe)
             else:
-                print(f"   ⚠️ Binance {timeframe} verisi alınamadı, fallback kullanılıyor")
-                fallback_data = self._get_fallback_data(symbol, timeframe)
-                timeframe_data[timeframe] = fallback_data
-            
-            time.sleep(0.3)  # Rate limit
+                ratios[timeframe] = ratio
         
-        return timeframe_data
-    
+        timeframe_data = {}
+        if ratios:
+            base_limit = min(max_base_candles, max((limit + 1) * ratio for ratio in ratios.values()))
+            base_klines = self.get_synced_klines(symbol, base_interval, limit=base_limit)
+            if base_klines is None:
+                return self.get_multiple_timeframe_data(symbol, timeframes, use_fallback)
+            
+            for timeframe, ratio in ratios.items():
+                bars = resample_klines(base_klines[-(limit + 1) * ratio:], base_interval, timeframe)[-limit:]
+                
+                if len(bars) < min_bars:
+                    # Yeterli taban geçmişi yok - doğrudan çek
+                    direct.append(timeframe)
+                    continue
+                
+                data = self.calculate_technical_indicators(bars, symbol, timeframe, use_fallback=False,
+                                                           source="resampled")
+                if data is None:
+                    # Taban seride boşluk ya da hesaplama hatası - doğrudan çek
+                    direct.append(timeframe)
+                    continue
+                timeframe_data[timeframe] = data
+                print(f"   ✅ {timeframe} {base_interval} tabanından üretildi - ${data['close']:,.4f}")
+        
+        if direct:
+            timeframe_data.update(self.get_multiple_timeframe_data(symbol, direct, use_fallback))
+        
+        return {tf: timeframe_data[tf] for tf in timeframes}
+
+    def get_batch_timeframe_data(self, symbols, timeframe, limit=100, min_history=DEFAULT_MIN_HISTORY):
+        """Tek zaman dilimi için tüm sembollerin göstergelerini tek vektörel geçişte hesapla
+
+        Kline'lar paralel senkronize edilip ortak ızgaraya hizalanır. Dönüş
+        {symbol: zaman dilimi verisi}; geçmişi yetersiz ya da son mumları boşluklu
+        semboller None (calculate_technical_indicators'taki boşluk kuralı gibi).
+        """
+        futures = {s: self.executor.submit(self.get_synced_klines, s, timeframe, limit) for s in symbols}
+        klines = {s: future.result() for s, future in futures.items()}
+
+        names, _, matrices = align_klines(klines, INTERVAL_MS[timeframe], length=limit)
+        result = {s: None for s in symbols}
+        if not names:
+            return result
+
+        batch = compute_batch(matrices['close'], matrices['high'], matrices['low'], min_history=min_history)
+        closes, volumes = matrices['close'], matrices['volume']
+        rows = {symbol: i for i, symbol in enumerate(names)}
+        for symbol, values in batch.snapshots(names).items():
+            i = rows[symbol]
+            result[symbol] = self.format_indicator_data(
+                symbol, timeframe, values, closes[i, -1], closes[i, -2], volumes[i, -1]
+            )
+
+        print(f"   ✅ {timeframe}: {int(batch.mask.sum())}/{len(symbols)} sembol toplu hesaplandı")
+        return result
+
     def test_connection(self, symbol="BINANCE:BTCUSDT"):
         """Binance bağlantı testi"""
         print("🔧 Binance API bağlantısı test ediliyor...")
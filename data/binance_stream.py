@@ -0,0 +1,404 @@
+import asyncio
+import json
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from data.binance_client import BinanceClient
+from data.incremental_indicators import IncrementalIndicatorSet
+from data.order_book import OrderBookSync
+from data.trade_bars import BarBuilder
+from data.candle_buffer import CandleBuffer
+
+class BinanceStreamClient:
+    """Binance combined WebSocket akışı - kline + miniTicker (+ isteğe bağlı depth)
+
+    İlk bağlantıdan önce her zaman dilimi REST ile senkronize edilip ısıtılır;
+    kapanan mumlar yerel depoya yazılır ve artımlı gösterge durumuna uygulanır.
+    Bağlantı koparsa yeniden bağlanır ve aradaki boşluğu REST ile doldurur.
+    order_books=True ise her sembol için snapshot + diff ile yerel emir defteri tutulur.
+    trade_bars=[("volume", 100), ("dollar", 1e6)] verilirse aggTrade akışından bilgi
+    barları üretilir ve her kapanan barda göstergeler hesaplanır (on_bar).
+    """
+
+    def __init__(self, symbols, timeframes, binance_client=None, on_candle=None, on_ticker=None,
+                 base_url="wss://stream.binance.com:9443/stream", reconnect_delay=1, max_reconnect_delay=60,
+                 warmup_candles=500, state_dir=None, record_path=None, order_books=False, depth_limit=1000,
+                 trade_bars=None, on_bar=None):
+        if websockets is None:
+            raise ImportError("WebSocket akışı için 'websockets' paketi gerekli: pip install websockets")
+
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.binance_client = binance_client or BinanceClient()
+        self.on_candle = on_candle
+        self.on_ticker = on_ticker
+        self.base_url = base_url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.warmup_candles = warmup_candles
+        self.state_dir = state_dir
+        self.record_path = record_path
+
+        # BTCUSDT -> BINANCE:BTCUSDT
+        self._symbol_map = {s.replace('BINANCE:', '').upper(): s for s in self.symbols}
+
+        # Yerel emir defterleri - ilk diff'te REST snapshot alınır
+        self.order_books = {}
+        if order_books:
+            loader = lambda symbol: self.binance_client.get_depth_snapshot(symbol, limit=depth_limit)
+            self.order_books = {s: OrderBookSync(s, snapshot_loader=loader) for s in self.symbols}
+
+        # aggTrade bar üreticileri - sembol başına her (tür, eşik) için bir tane
+        self.on_bar = on_bar
+        self.bar_builders = {s: [BarBuilder(kind, threshold) for kind, threshold in (trade_bars or [])]
+                             for s in self.symbols}
+        self.bar_buffers = {}
+        self.bar_states = {}  # (sembol, bar adı) -> IncrementalIndicatorSet - bar başına O(1)
+        self.bar_data = {s: {} for s in self.symbols}
+
+        self.indicator_states = {}
+        self.timeframe_data = {s: {} for s in self.symbols}
+        self.latest_prices = {}
+        self.stats = {'messages': 0, 'closed_candles': 0, 'closed_bars': 0, 'reconnects': 0, 'backfilled': 0}
+
+        self._running = False
+        self._connected_once = False
+        self._websocket = None
+        self._loop = None
+        self._thread = None
+
+    def stream_names(self):
+        """Abone olunacak stream isimleri"""
+        streams = []
+        for symbol in self.symbols:
+            name = symbol.replace('BINANCE:', '').lower()
+            for timeframe in self.timeframes:
+                streams.append(f"{name}@kline_{timeframe}")
+            streams.append(f"{name}@miniTicker")
+            if symbol in self.order_books:
+                streams.append(f"{name}@depth@100ms")
+            if self.bar_builders.get(symbol):
+                streams.append(f"{name}@aggTrade")
+        return streams
+
+    def stream_url(self):
+        """Combined stream URL'i"""
+        return f"{self.base_url}?streams={'/'.join(self.stream_names())}"
+
+    async def run(self):
+        """Akışı çalıştır - stop() çağrılana kadar yeniden bağlanır"""
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        delay = self.reconnect_delay
+
+        # İlk bağlantıdan önce göstergeleri REST geçmişiyle ısıt
+        await self._loop.run_in_executor(None, self.warm_start)
+
+        while self._running:
+            try:
+                async with websockets.connect(self.stream_url(), ping_interval=20) as websocket:
+                    self._websocket = websocket
+                    if self._connected_once:
+                        self.stats['reconnects'] += 1
+                        print("   🔌 WebSocket yeniden bağlandı, boşluk dolduruluyor...")
+                        for order_book in self.order_books.values():
+                            order_book.invalidate()
+                        await self._loop.run_in_executor(None, self.backfill_gaps)
+                    self._connected_once = True
+                    delay = self.reconnect_delay
+
+                    async for message in websocket:
+                        self.handle_message(message)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                if not self._running:
+                    break
+                print(f"❌ WebSocket bağlantı hatası: {e}")
+            finally:
+                self._websocket = None
+
+            if self._running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+        self.save_states()
+
+    def handle_message(self, message):
+        """Tek bir combined stream mesajını işle"""
+        self.stats['messages'] += 1
+        if self.record_path:
+            with open(self.record_path, 'a') as f:
+                f.write(message if isinstance(message, str) else message.decode())
+                f.write("\n")
+
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            return
+
+        data = payload.get('data', payload)
+        event = data.get('e')
+        if event == 'kline':
+            self._handle_kline(data)
+        elif event == '24hrMiniTicker':
+            self._handle_ticker(data)
+        elif event == 'aggTrade':
+            self._handle_agg_trade(data)
+        elif event == 'depthUpdate':
+            order_book = self.order_books.get(self._symbol_map.get(data['s'].upper(), data['s']))
+            if order_book is not None:
+                order_book.handle_diff(data)
+
+    def _handle_kline(self, data):
+        k = data['k']
+        symbol = self._symbol_map.get(k['s'].upper(), k['s'])
+        interval = k['i']
+        self.latest_prices[symbol] = float(k['c'])
+
+        # Sadece kapanan mumlar göstergelere uygulanır
+        if not k.get('x'):
+            return
+
+        candle = [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'],
+                  k.get('q', "0"), k.get('n', 0), k.get('V', "0"), k.get('Q', "0"), "0"]
+        self.binance_client.kline_store.upsert_klines(symbol, interval, [candle])
+
+        state = self._get_state(symbol, interval, int(k['t']))
+        if state.last_open_time is not None and int(k['t']) <= state.last_open_time:
+            # Yeniden bağlanınca tekrar gelen mum
+            return
+        indicators = state.update(candle)
+        self.stats['closed_candles'] += 1
+
+        data_point = self.binance_client.format_indicator_data(
+            symbol, interval, indicators, state.last_close, state.prev_close, state.last_volume
+        )
+        self.timeframe_data.setdefault(symbol, {})[interval] = data_point
+
+        if self.on_candle:
+            self.on_candle(symbol, interval, data_point)
+
+    def _handle_ticker(self, data):
+        symbol = self._symbol_map.get(data['s'].upper(), data['s'])
+        price = float(data['c'])
+        self.latest_prices[symbol] = price
+        if self.on_ticker:
+            self.on_ticker(symbol, price)
+
+    def _handle_agg_trade(self, data):
+        symbol = self._symbol_map.get(data['s'].upper(), data['s'])
+        self.latest_prices[symbol] = float(data['p'])
+        self._apply_trades(symbol, [data])
+
+    def _apply_trades(self, symbol, trades):
+        """İşlemleri bar üreticilerine uygula - kapanan her barda göstergeleri hesapla"""
+        for builder in self.bar_builders.get(symbol, []):
+            for bar in builder.update_many(trades):
+                key = (symbol, builder.name)
+                buffer = self.bar_buffers.get(key)
+                if buffer is None:
+                    buffer = self.bar_buffers[key] = CandleBuffer(self.warmup_candles)
+                    self.bar_states[key] = IncrementalIndicatorSet(symbol, builder.name)
+                buffer.append(bar, replace=False)
+                self.stats['closed_bars'] += 1
+
+                state = self.bar_states[key]
+                indicators = state.update(bar)
+                data_point = self.binance_client.format_indicator_data(
+                    symbol, builder.name, indicators, state.last_close, state.prev_close, state.last_volume
+                )
+                self.bar_data[symbol][builder.name] = data_point
+                if self.on_bar:
+                    self.on_bar(symbol, builder.name, data_point)
+
+    def _backfill_trades(self, symbol):
+        """Kopuklukta kaçan aggTrade'leri son id'den itibaren REST ile uygula"""
+        builders = self.bar_builders.get(symbol)
+        last_ids = [b.last_id for b in builders or [] if b.last_id is not None]
+        if not last_ids:
+            return
+        trades = list(self.binance_client.iter_agg_trades(symbol, from_id=min(last_ids) + 1))
+        self._apply_trades(symbol, trades)
+        self.stats['backfilled'] += len(trades)
+
+    def _state_path(self, symbol, interval):
+        name = symbol.replace('BINANCE:', '')
+        return os.path.join(self.state_dir, f"{name}_{interval}.json")
+
+    def _get_state(self, symbol, interval, before_open_time):
+        """Gösterge durumunu getir - yoksa kayıttan ya da depodan ısıt"""
+        key = (symbol, interval)
+        state = self.indicator_states.get(key)
+
+        if state is None:
+            if self.state_dir and os.path.exists(self._state_path(symbol, interval)):
+                state = IncrementalIndicatorSet.load(self._state_path(symbol, interval))
+            else:
+                state = IncrementalIndicatorSet(symbol, interval)
+            self.indicator_states[key] = state
+
+        # Depodaki kapanmış mumlarla durumu yetiştir (gelen mumdan öncekiler)
+        start = state.last_open_time + 1 if state.last_open_time is not None else None
+        history = self.binance_client.kline_store.get_klines(
+            symbol, interval, limit=self.warmup_candles, start_time=start, end_time=before_open_time - 1
+        )
+        state.warm_up(history)
+        return state
+
+    def warm_start(self):
+        """Her (sembol, zaman dilimi) için REST senkronu yap ve göstergeleri kapanmış mumlarla ısıt"""
+        now_ms = int(time.time() * 1000)
+        for symbol in self.symbols:
+            for timeframe in self.timeframes:
+                try:
+                    klines = self.binance_client.get_synced_klines(symbol, timeframe, limit=self.warmup_candles)
+                    closed = [k for k in klines or [] if int(k[6]) < now_ms]
+                    if not closed:
+                        continue
+                    state = self._get_state(symbol, timeframe, int(closed[-1][0]) + 1)
+                    if state.last_close is None:
+                        continue
+                    self.timeframe_data[symbol][timeframe] = self.binance_client.format_indicator_data(
+                        symbol, timeframe, state.snapshot(), state.last_close, state.prev_close, state.last_volume
+                    )
+                except Exception as e:
+                    print(f"❌ {symbol} {timeframe} ısıtma hatası: {e}")
+
+    def backfill_gaps(self):
+        """Kopukluk sırasında kaçan mumları REST ile depoya yaz"""
+        for symbol in self.symbols:
+            for timeframe in self.timeframes:
+                added = self.binance_client.sync_klines(symbol, timeframe, limit=self.warmup_candles)
+                if added:
+                    self.stats['backfilled'] += added
+            self._backfill_trades(symbol)
+
+    def save_states(self):
+        """Gösterge durumlarını diske yaz"""
+        if not self.state_dir:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        for (symbol, interval), state in self.indicator_states.items():
+            state.save(self._state_path(symbol, interval))
+
+    def get_order_book(self, symbol):
+        """Senkron emir defteri (yoksa veya senkron değilse None)"""
+        order_book = self.order_books.get(symbol)
+        return order_book.book if order_book is not None and order_book.synced else None
+    
+    def get_timeframe_data(self, symbol):
+        """Sembol için ısınmış zaman dilimlerini döndür (hiçbiri yoksa None)"""
+        data = self.timeframe_data.get(symbol, {})
+        ready = {tf: data[tf] for tf in self.timeframes if tf in data}
+        return ready or None
+
+    def start_in_thread(self):
+        """Akışı arka plan thread'inde başlat"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=5):
+        """Akışı durdur"""
+        self._running = False
+        if self._loop and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(self._websocket.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout)
+
+def load_frames(path):
+    """Kaydedilmiş frame dosyasını (satır başına bir JSON mesajı) oku"""
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+class ReplayStreamServer:
+    """Kaydedilmiş frame'leri tekrar oynatan yerel WebSocket sunucusu - offline test için"""
+
+    def __init__(self, frames, host="127.0.0.1", port=0, delay=0.0, close_after=True):
+        if websockets is None:
+            raise ImportError("Replay sunucusu için 'websockets' paketi gerekli: pip install websockets")
+
+        self.frames = load_frames(frames) if isinstance(frames, str) else list(frames)
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.close_after = close_after
+        self.connections = 0
+        self._server = None
+
+    async def _handler(self, websocket, path=None):
+        self.connections += 1
+        for frame in self.frames:
+            await websocket.send(frame if isinstance(frame, str) else json.dumps(frame))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        if self.close_after:
+            await websocket.close()
+        else:
+            await websocket.wait_closed()
+
+    async def start(self):
+        """Sunucuyu başlat ve ws:// URL'ini döndür"""
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.url
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/stream"
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+def make_kline_frame(symbol, interval, open_time, o, h, l, c, v, closed=True):
+    """Test/replay için combined stream kline frame'i oluştur"""
+    from data.kline_store import interval_to_ms
+    name = symbol.replace('BINANCE:', '')
+    return json.dumps({
+        'stream': f"{name.lower()}@kline_{interval}",
+        'data': {
+            'e': 'kline', 'E': int(time.time() * 1000), 's': name,
+            'k': {
+                't': open_time, 'T': open_time + interval_to_ms(interval) - 1, 's': name, 'i': interval,
+                'o': str(o), 'h': str(h), 'l': str(l), 'c': str(c), 'v': str(v),
+                'n': 0, 'x': closed, 'q': "0", 'V': "0", 'Q': "0"
+            }
+        }
+    })
+
+def make_depth_frame(symbol, first_update_id, final_update_id, bids, asks):
+    """Test/replay için combined stream depthUpdate frame'i oluştur"""
+    name = symbol.replace('BINANCE:', '')
+    return json.dumps({
+        'stream': f"{name.lower()}@depth@100ms",
+        'data': {
+            'e': 'depthUpdate', 'E': int(time.time() * 1000), 's': name,
+            'U': first_update_id, 'u': final_update_id,
+            'b': [[str(p), str(q)] for p, q in bids],
+            'a': [[str(p), str(q)] for p, q in asks]
+        }
+    })
+
+def make_agg_trade_frame(symbol, trade_id, price, quantity, trade_time, buyer_maker=False):
+    """Test/replay için combined stream aggTrade frame'i oluştur"""
+    name = symbol.replace('BINANCE:', '')
+    return json.dumps({
+        'stream': f"{name.lower()}@aggTrade",
+        'data': {
+            'e': 'aggTrade', 'E': trade_time, 's': name, 'a': trade_id,
+            'p': str(price), 'q': str(quantity), 'f': trade_id, 'l': trade_id,
+            'T': trade_time, 'm': buyer_maker
+        }
+    })
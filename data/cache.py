@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.kline_store import interval_to_ms, interval_offset_ms
+
+def next_candle_close(interval, now_ms=None):
+    """Interval için bir sonraki mum kapanış zamanı (ms) - haftalık mumlar Pazartesi açılır"""
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    interval_ms = interval_to_ms(interval)
+    offset = interval_offset_ms(interval)
+    return ((now_ms - offset) // interval_ms + 1) * interval_ms + offset
+
+class TTLCache:
+    """Boyut sınırlı LRU + süre dolumlu read-through cache (thread-safe)"""
+
+    def __init__(self, maxsize=512, default_ttl=5.0):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()  # key -> (expires_at_saniye, değer)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        """Değeri kaydet - expires_at (epoch saniye) verilirse ttl yok sayılır"""
+        if expires_at is None:
+            expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+        with self.lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, ttl=None, expires_at=None):
+        """Cache'te yoksa loader() çağır ve sonucu (None değilse) kaydet"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = loader()
+        if value is not None:
+            self.set(key, value, ttl=ttl, expires_at=expires_at)
+        return value
+
+    def invalidate(self, key=None):
+        """Tek anahtarı ya da tüm cache'i temizle"""
+        with self.lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_stats(self):
+        """Hit/miss sayaçları"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
@@ -0,0 +1,100 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Binance kline satırındaki sütun sırası - göstergeler için gereken ilk 7 alan tutulur
+FIELDS = ('open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time')
+
+class CandleBuffer:
+    """Sabit kapasiteli, sütun bazlı mum halkası
+
+    Her alan için önceden ayrılmış float64 dizisi tutulur. Veri iki kez yazılır
+    (i ve i + capacity) böylece son `len` mum her zaman bitişik bir dilimdir ve
+    gösterge çekirdeklerine kopyasız görünüm olarak verilebilir.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = int(capacity)
+        self._data = np.zeros((len(FIELDS), 2 * self.capacity), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    @classmethod
+    def from_klines(cls, klines, capacity=None):
+        """Binance kline JSON listesini doğrudan float dizilere ayrıştır"""
+        buffer = cls(capacity or max(len(klines), 1))
+        buffer.extend(klines)
+        return buffer
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, klines):
+        """Çok sayıda satırı tek seferde ekle (vektörel ayrıştırma)"""
+        if len(klines) == 0:
+            return
+        rows = np.asarray([k[:len(FIELDS)] for k in klines], dtype=np.float64)
+        if len(rows) > self.capacity:
+            rows = rows[-self.capacity:]
+
+        # Aynı open_time ile gelen ilk satır son mumu günceller
+        if self._size and rows[0, 0] == self._data[0, self._start + self._size - 1]:
+            self._size -= 1
+
+        n = len(rows)
+        overflow = max(0, self._size + n - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size -= overflow
+
+        positions = (self._start + self._size + np.arange(n)) % self.capacity
+        self._data[:, positions] = rows.T
+        self._data[:, positions + self.capacity] = rows.T
+        self._size += n
+
+    def append(self, kline, replace=True):
+        """Tek mum ekle - aynı open_time ise son mumu güncelle (açık mum)
+
+        replace=False ise kapanmış bar her zaman yeni satır olarak eklenir.
+        """
+        row = np.asarray(kline[:len(FIELDS)], dtype=np.float64)
+        if replace and self._size and row[0] == self._data[0, self._start + self._size - 1]:
+            position = (self._start + self._size - 1) % self.capacity
+        elif self._size < self.capacity:
+            position = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._data[:, position] = row
+        self._data[:, position + self.capacity] = row
+
+    def view(self, field):
+        """Alanın eskiden yeniye kopyasız görünümü"""
+        index = FIELDS.index(field)
+        return self._data[index, self._start:self._start + self._size]
+
+    def __getitem__(self, field):
+        return self.view(field)
+
+    @property
+    def open_times(self):
+        return self.view('open_time').astype(np.int64)
+
+    def latest(self, field, offset=0):
+        """Sondan offset'inci değer (0 = en güncel)"""
+        if self._size <= offset:
+            raise IndexError("Buffer'da yeterli mum yok")
+        return float(self._data[FIELDS.index(field), self._start + self._size - 1 - offset])
+
+    def to_klines(self):
+        """Binance kline satır formatına geri çevir (tutulmayan alanlar 0)"""
+        block = self._data[:, self._start:self._start + self._size].T
+        return [[int(r[0]), r[1], r[2], r[3], r[4], r[5], int(r[6]), 0.0, 0, 0.0, 0.0, "0"]
+                for r in block]
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
@@ -1,19 +1,96 @@
 import requests
+import sqlite3
+import threading
+import time
 import sys
 import os
 
 # Python path'ini ayarla
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from data.kline_store import DEFAULT_DB_PATH
+from data.http_replay import attach_transport, replay_db_path
+
+NEUTRAL_INDEX = {"value": 50, "value_classification": "Neutral"}
+
 class FearGreedClient:
-    def __init__(self):
+    def __init__(self, db_path=None, default_ttl=3600, failure_ttl=120):
         self.api_url = "https://api.alternative.me/fng/"
-    
+        self.session = requests.Session()
+        attach_transport(self.session)  # HTTP_REPLAY_MODE ayarlıysa kayıt/tekrar
+        self.db_path = db_path or replay_db_path() or DEFAULT_DB_PATH
+        self.default_ttl = default_ttl  # time_until_update gelmezse
+        self.failure_ttl = failure_ttl  # Hata sonrası yedek değer bu kadar saniye kullanılır
+
+        # Endeks günde bir güncellenir - bir sonraki güncellemeye kadar cache'le
+        self._cached = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+        self.init_db()
+
+    def init_db(self):
+        """Geçmiş tablosunu oluştur"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS fear_greed
+                           (timestamp INTEGER PRIMARY KEY,
+                            value INTEGER NOT NULL,
+                            value_classification TEXT NOT NULL)''')
+            conn.commit()
+
+    def _fetch(self, limit=1):
+        response = self.session.get(self.api_url, params={'limit': limit}, timeout=10)
+        return response.json()['data']
+
+    def _store(self, entries):
+        rows = [(int(e['timestamp']), int(e['value']), e['value_classification']) for e in entries if 'timestamp' in e]
+        if not rows:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''INSERT OR REPLACE INTO fear_greed (timestamp, value, value_classification)
+                                VALUES (?, ?, ?)''', rows)
+            conn.commit()
+
+    def _load(self, days):
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''SELECT timestamp, value, value_classification FROM fear_greed
+                                   ORDER BY timestamp DESC LIMIT ?''', (int(days),)).fetchall()
+        return [
+            {"value": str(value), "value_classification": classification, "timestamp": str(timestamp)}
+            for timestamp, value, classification in reversed(rows)
+        ]
+
     def get_index(self):
-        """Fear & Greed Index verisini çek"""
+        """Fear & Greed Index verisini çek - bir sonraki güncellemeye kadar cache'li"""
+        with self._lock:
+            if self._cached is not None and time.time() < self._expires_at:
+                return self._cached
+
+            try:
+                entry = self._fetch(limit=1)[0]
+                self._store([entry])
+                ttl = int(entry.get('time_until_update') or self.default_ttl)
+                self._cached = entry
+                self._expires_at = time.time() + max(ttl, 60)
+                return entry
+            except Exception:
+                # Ağ yoksa son kayıtlı değer, o da yoksa nötr - kesinti boyunca her çağrı
+                # 10 sn timeout beklemesin diye kısa süre cache'lenir
+                stored = self._load(1)
+                self._cached = stored[-1] if stored else dict(NEUTRAL_INDEX)
+                self._expires_at = time.time() + self.failure_ttl
+                return self._cached
+
+    def get_history(self, days=30):
+        """Son `days` günün endeks geçmişi (eskiden yeniye) - yerel kayıttan, eksikse tek istekle"""
+        stored = self._load(days)
+        day_seconds = 24 * 60 * 60
+        is_fresh = stored and int(stored[-1]['timestamp']) > time.time() - day_seconds
+
+        if len(stored) >= days and is_fresh:
+            return stored
+
         try:
-            response = requests.get(self.api_url, timeout=10)
-            data = response.json()
-            return data['data'][0]
-        except:
-            return {"value": 50, "value_classification": "Neutral"}
\ No newline at end of file
+            self._store(self._fetch(limit=days))
+        except Exception as e:
+            print(f"❌ Fear & Greed geçmişi alınamadı: {e}")
+        return self._load(days)
@@ -0,0 +1,115 @@
+import bisect
+import threading
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def find_gaps(open_times, interval_ms, index=None):
+    """Ardışık open_time'lar arasındaki boşluklar - [(ilk eksik, son eksik)]
+
+    index (GapIndex) verilirse borsada boş olduğu doğrulanmış aralıklar boşluk sayılmaz.
+    """
+    open_times = np.asarray(open_times, dtype=np.int64)
+    if len(open_times) < 2:
+        return []
+    breaks = np.flatnonzero(np.diff(open_times) != interval_ms)
+    gaps = [(int(open_times[i]) + interval_ms, int(open_times[i + 1]) - interval_ms) for i in breaks]
+    if index is not None:
+        gaps = [(start, end) for start, end in gaps if not index.is_empty(start, end)]
+    return gaps
+
+class GapIndex:
+    """(symbol, interval) için kapsanan ardışık aralıkların sıralı indeksi
+
+    Aralıklar [ilk open_time, son open_time] olarak tutulur; kapsama ve boşluk
+    sorguları bisect ile O(log n). Borsada hiç mum olmayan (bakım vb.)
+    aralıklar kontrol edilmiş sayılıp kapsama eklenir, tekrar çekilmez; ayrıca
+    tutuldukları için seri kontrolünde de boşluk sayılmazlar (find_gaps(index=...)).
+    """
+
+    def __init__(self, interval_ms):
+        self.step = int(interval_ms)
+        self.starts = []
+        self.ends = []
+        self.empty = None  # borsada boş doğrulanan aralıklar (GapIndex)
+        self.empty_ranges = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_open_times(cls, interval_ms, open_times):
+        index = cls(interval_ms)
+        index.add_open_times(open_times)
+        return index
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add_range(self, start, end):
+        """[start, end] aralığını ekle - komşu/örtüşen aralıklarla birleştir"""
+        with self.lock:
+            i = bisect.bisect_left(self.ends, start - self.step)
+            j = bisect.bisect_right(self.starts, end + self.step)
+            if i < j:
+                start = min(start, self.starts[i])
+                end = max(end, self.ends[j - 1])
+            self.starts[i:j] = [start]
+            self.ends[i:j] = [end]
+
+    def add_open_times(self, open_times):
+        """Mum open_time'larını ardışık parçalar halinde ekle"""
+        open_times = np.unique(np.asarray(open_times, dtype=np.int64))
+        if len(open_times) == 0:
+            return
+        breaks = np.flatnonzero(np.diff(open_times) != self.step)
+        run_starts = np.r_[0, breaks + 1]
+        run_ends = np.r_[breaks, len(open_times) - 1]
+        for a, b in zip(run_starts, run_ends):
+            self.add_range(int(open_times[a]), int(open_times[b]))
+
+    def mark_empty(self, start, end):
+        """Borsada mum olmadığı doğrulanan aralık - bir daha boşluk olarak raporlanmaz"""
+        self.add_range(start, end)
+        with self.lock:
+            if self.empty is None:
+                self.empty = GapIndex(self.step)
+            self.empty_ranges += 1
+        self.empty.add_range(start, end)
+
+    def is_empty(self, start, end):
+        """[start, end] borsada boş olarak doğrulanmış mı"""
+        return self.empty is not None and self.empty.covers(start, end)
+
+    def covers(self, start, end):
+        """[start, end] tamamen kapsanıyor mu - O(log n)"""
+        with self.lock:
+            i = bisect.bisect_right(self.starts, start) - 1
+            return i >= 0 and self.ends[i] >= end
+
+    def gaps(self, start, end):
+        """[start, end] içindeki eksik aralıklar - [(ilk eksik open_time, son eksik open_time)]"""
+        gaps = []
+        with self.lock:
+            cursor = start
+            i = max(0, bisect.bisect_right(self.starts, start) - 1)
+            while cursor <= end and i < len(self.starts):
+                if self.ends[i] >= cursor:
+                    if self.starts[i] > cursor:
+                        gaps.append((cursor, min(self.starts[i] - self.step, end)))
+                    cursor = self.ends[i] + self.step
+                i += 1
+            if cursor <= end:
+                gaps.append((cursor, end))
+        return gaps
+
+    def get_stats(self):
+        with self.lock:
+            covered = sum((e - s) // self.step + 1 for s, e in zip(self.starts, self.ends))
+            return {
+                'ranges': len(self.starts),
+                'candles': covered,
+                'first': self.starts[0] if self.starts else None,
+                'last': self.ends[-1] if self.ends else None,
+                'empty_ranges': self.empty_ranges
+            }
@@ -0,0 +1,289 @@
+import argparse
+import atexit
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Kayıt/tekrar modu ortam değişkenlerinden seçilir:
+#   HTTP_REPLAY_MODE=record|replay   HTTP_REPLAY_FIXTURE=fixtures/cycle.json
+MODE_ENV = "HTTP_REPLAY_MODE"
+FIXTURE_ENV = "HTTP_REPLAY_FIXTURE"
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "http_fixture.json")
+
+# Zamana bağlı parametreler - gevşek eşleşmede yok sayılır
+VOLATILE_PARAMS = ("timestamp", "signature", "startTime", "endTime", "limit")
+
+def _request_keys(method, url, body):
+    """(tam anahtar, gevşek anahtar) - sorgu parametreleri sıralı"""
+    parts = urlsplit(url)
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    path = f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True)
+        except ValueError:
+            pass
+
+    exact = json.dumps([method, path, params, body or ""])
+    loose = json.dumps([method, path, [p for p in params if p[0] not in VOLATILE_PARAMS], body or ""])
+    return exact, loose
+
+def _interaction_time_ms(interaction):
+    """Etkileşimin kayıt zamanı (ms) - recorded_at yoksa Date başlığından, o da yoksa None"""
+    if interaction.get('recorded_at') is not None:
+        return int(interaction['recorded_at'])
+    date = CaseInsensitiveDict(interaction.get('headers') or {}).get('Date')
+    if date:
+        try:
+            return int(parsedate_to_datetime(date).timestamp() * 1000)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+class RecordingAdapter(HTTPAdapter):
+    """Gerçek istekleri gönderir, yanıtları ve gecikmeleri fixture dosyasına kaydeder"""
+
+    def __init__(self, fixture_path, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_path = fixture_path
+        self.interactions = []
+        self.saved_count = 0
+        self.lock = threading.Lock()
+        atexit.register(self.save)
+
+    def send(self, request, **kwargs):
+        recorded_at = int(time.time() * 1000)
+        start = time.monotonic()
+        response = super().send(request, **kwargs)
+        latency_ms = (time.monotonic() - start) * 1000
+
+        with self.lock:
+            self.interactions.append({
+                'method': request.method,
+                'url': request.url,
+                'body': request.body.decode('utf-8') if isinstance(request.body, bytes) else request.body,
+                'status': response.status_code,
+                'headers': dict(response.headers),
+                'content': response.content.decode('utf-8', errors='replace'),
+                'latency_ms': round(latency_ms, 2),
+                'recorded_at': recorded_at
+            })
+        return response
+
+    def save(self):
+        """Kayıtları JSON fixture olarak yaz"""
+        with self.lock:
+            if len(self.interactions) == self.saved_count:
+                return
+            with open(self.fixture_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'interactions': self.interactions}, f, ensure_ascii=False)
+            self.saved_count = len(self.interactions)
+        print(f"💾 {len(self.interactions)} HTTP etkileşimi kaydedildi: {self.fixture_path}")
+
+class ReplayAdapter(BaseAdapter):
+    """Fixture'daki yanıtları ağ olmadan, deterministik sırayla geri oynatır
+
+    latency: None (bekleme yok), "recorded" (kaydedilen gecikme) veya sabit ms
+    error_rate: bu oranda istek seeded RNG ile hata alır (bağlantı hatası ya da error_status)
+    strict: eşleşme yoksa ConnectionError yerine AssertionError (eksik fixture tespiti)
+    clock_ms: kayıt saati - ilk kayıttan başlar, oynatılan her yanıtla ileri gider (clock_ms())
+    """
+
+    def __init__(self, fixture_path, latency="recorded", latency_scale=1.0, error_rate=0.0,
+                 error_status=None, seed=0, strict=False):
+        super().__init__()
+        with open(fixture_path, encoding='utf-8') as f:
+            interactions = json.load(f)['interactions']
+
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        # Aynı anahtar birden çok kez kaydedildiyse sırayla, sonuncusu tekrar tekrar döner
+        self._exact = {}
+        self._loose = {}
+        for interaction in interactions:
+            exact, loose = _request_keys(interaction['method'], interaction['url'], interaction['body'])
+            self._exact.setdefault(exact, []).append(interaction)
+            self._loose.setdefault(loose, []).append(interaction)
+        self._cursors = {}
+        times = [t for t in map(_interaction_time_ms, interactions) if t is not None]
+        self.clock_ms = min(times) if times else None
+        self.stats = {'hits': 0, 'loose_hits': 0, 'misses': 0, 'injected_errors': 0}
+
+    def _next(self, table, key):
+        entries = table.get(key)
+        if not entries:
+            return None
+        cursor = self._cursors.get((id(table), key), 0)
+        self._cursors[(id(table), key)] = cursor + 1
+        return entries[min(cursor, len(entries) - 1)]
+
+    def send(self, request, **kwargs):
+        exact, loose = _request_keys(request.method, request.url, request.body)
+        with self.lock:
+            interaction = self._next(self._exact, exact)
+            if interaction is not None:
+                self.stats['hits'] += 1
+            else:
+                interaction = self._next(self._loose, loose)
+                self.stats['loose_hits' if interaction is not None else 'misses'] += 1
+            recorded_at = _interaction_time_ms(interaction) if interaction is not None else None
+            if recorded_at is not None and (self.clock_ms is None or recorded_at > self.clock_ms):
+                self.clock_ms = recorded_at
+            inject_error = self.error_rate > 0 and self.rng.random() < self.error_rate
+            if inject_error:
+                self.stats['injected_errors'] += 1
+
+        if interaction is None:
+            if self.strict:
+                raise AssertionError(f"Fixture'da kayıt yok: {request.method} {request.url}")
+            raise requests.ConnectionError(f"Replay: kayıt yok - {request.method} {request.url}", request=request)
+
+        latency_ms = interaction['latency_ms'] if self.latency == "recorded" else (self.latency or 0)
+        latency_ms *= self.latency_scale
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+
+        if inject_error:
+            if self.error_status is None:
+                raise requests.ConnectionError("Replay: enjekte edilen bağlantı hatası", request=request)
+            return self._build_response(request, {'status': self.error_status, 'headers': {}, 'content': ''}, latency_ms)
+        return self._build_response(request, interaction, latency_ms)
+
+    def _build_response(self, request, interaction, latency_ms):
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        # Kaydedilen gövde zaten açılmış - tekrar açılmasın
+        response.headers.pop('Content-Encoding', None)
+        response._content = interaction['content'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = "Replay"
+        response.elapsed = timedelta(milliseconds=latency_ms)
+        return response
+
+    def close(self):
+        pass
+
+_adapters = {}
+_adapters_lock = threading.Lock()
+
+def get_transport(mode, fixture_path=None, **options):
+    """Mod ve fixture başına tek adaptör - tüm client'lar aynı dosyaya kaydeder/okur
+
+    Replay seçenekleri verilirse mevcut adaptör bu seçeneklerle yenisiyle değiştirilir.
+    """
+    fixture_path = fixture_path or os.getenv(FIXTURE_ENV) or DEFAULT_FIXTURE
+    with _adapters_lock:
+        key = (mode, fixture_path)
+        if key not in _adapters or (mode == "replay" and options):
+            if mode == "record":
+                _adapters[key] = RecordingAdapter(fixture_path)
+            elif mode == "replay":
+                _adapters[key] = ReplayAdapter(fixture_path, **options)
+            else:
+                raise ValueError(f"Bilinmeyen HTTP replay modu: {mode}")
+        return _adapters[key]
+
+_replay_db_path = None
+
+def replay_active():
+    """HTTP_REPLAY_MODE=replay mı - kayıtlı yanıtlar gerçek saate göre yaşlanacağından cache'ler kapatılır"""
+    return os.getenv(MODE_ENV) == "replay"
+
+def clock_ms():
+    """Şimdiki zaman (ms) - replay modunda kayıt saati; istek parametreleri çalıştırma anına bağlı olmaz"""
+    if replay_active():
+        adapter = get_transport("replay")
+        if adapter.clock_ms is not None:
+            return adapter.clock_ms
+    return int(time.time() * 1000)
+
+def replay_db_path():
+    """Replay modunda süreç başına geçici veritabanı yolu (değilse None) - gerçek market_data.db'ye yazılmaz"""
+    global _replay_db_path
+    if not replay_active():
+        return None
+    with _adapters_lock:
+        if _replay_db_path is None:
+            directory = tempfile.mkdtemp(prefix="http_replay_")
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+            _replay_db_path = os.path.join(directory, "market_data.db")
+    return _replay_db_path
+
+def attach_transport(session, mode=None, fixture_path=None, **options):
+    """Session'a kayıt/tekrar adaptörünü bağla - mod yoksa (ve env boşsa) dokunmaz"""
+    mode = mode or os.getenv(MODE_ENV)
+    if not mode:
+        return None
+    adapter = get_transport(mode, fixture_path, **options)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+def benchmark_cycles(cycles=3):
+    """analyze_all_symbols döngülerini ölç - env'deki transport kullanılır"""
+    from main import TradingBot
+
+    bot = TradingBot()
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        bot.analyze_all_symbols()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP kayıt/tekrar ile analiz döngüsü ölçümü")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--latency", default="recorded", help='"recorded", "none" veya sabit ms')
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ[MODE_ENV] = args.mode
+    os.environ[FIXTURE_ENV] = args.fixture
+    if args.mode == "replay":
+        latency = None if args.latency == "none" else args.latency
+        if latency not in (None, "recorded"):
+            latency = float(latency)
+        # Client'lar oluşmadan önce seçeneklerle kaydet
+        get_transport("replay", args.fixture, latency=latency, latency_scale=args.latency_scale,
+                      error_rate=args.error_rate, error_status=args.error_status, seed=args.seed)
+
+    durations = benchmark_cycles(args.cycles)
+    for i, duration in enumerate(durations, 1):
+        print(f"⏱️ Döngü {i}: {duration:.3f}s")
+    if args.mode == "replay":
+        print(f"📊 Replay: {get_transport('replay', args.fixture).stats}")
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,212 @@
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.binance_client import BinanceClient
 from data.tradingview_client import TradingViewClient
+from data.source_health import SourceHealth
+from data.cache import TTLCache
 
 class HybridDataClient:
-    def __init__(self):
+    def __init__(self, config=None):
+        self.config = config or {
+            "resample_from_base": True,   # Üst zaman dilimlerini tek taban akışından üret
+            "base_interval": "5m",
+            "min_resampled_bars": 50,
+            "max_resample_base_candles": 5000,   # Bundan fazla taban mumu gereken dilimler doğrudan çekilir
+            "circuit_failure_threshold": 3,   # Ardışık hata sonrası kaynak atlanır
+            "circuit_reset_timeout": 30,      # saniye - sonra tek deneme isteği
+            "hedge_requests": True,           # Binance p95'i aşarsa TradingView paralel denenir
+            "hedge_percentile": 95,
+            "hedge_default_delay": 2.0,       # Yeterli örnek yokken bekleme (saniye)
+            "hedge_min_samples": 20,
+            "tradingview_prefetch_ttl": 60    # Toplu TradingView verisi bu kadar saniye kullanılır
+        }
         self.binance_client = BinanceClient()
         self.tradingview_client = TradingViewClient()
         self.data_source_priority = ["binance", "tradingview"]
+        
+        threshold = self.config.get("circuit_failure_threshold", 3)
+        reset_timeout = self.config.get("circuit_reset_timeout", 30)
+        self.sources = {name: SourceHealth(name, threshold, reset_timeout) for name in self.data_source_priority}
+        
+        # Hedge edilen istekler kaybeden taraf bitene kadar arka planda sürer
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hybrid")
+        
+        # Döngü/shard başına tek toplu TradingView isteğinin sonuçları - sembol -> {tf: veri}
+        self.tradingview_prefetch = TTLCache(maxsize=4096, default_ttl=self.config.get("tradingview_prefetch_ttl", 60))
+    
+    def prefetch_tradingview(self, symbols, timeframes, ttl=None):
+        """Sembol listesi x zaman dilimleri için tek TradingView isteği - sonuçlar sembol başına saklanır
+        
+        Sonraki _fetch_tradingview çağrıları ağa gitmeden buradan okur; önceden yüklenen sembol sayısı döner.
+        """
+        symbols = list(symbols)
+        source = self.sources["tradingview"]
+        if not symbols:
+            return 0
+        if not source.breaker.allow():
+            source.skipped += 1
+            return 0
+        
+        batch = source.call(
+            lambda: self.tradingview_client.get_batch_technical_data(symbols, timeframes),
+            is_success=lambda result: bool(result) and any(result.values())
+        )
+        stored = 0
+        for symbol, data in (batch or {}).items():
+            if data:
+                self.tradingview_prefetch.set(symbol, data, ttl=ttl)
+                stored += 1
+        return stored
+    
+    def get_batch_timeframe_data(self, symbols, timeframes):
+        """Sembol listesi için zaman dilimi başına tek vektörel gösterge geçişi (Binance kline'ları)
+        
+        Dönüş {symbol: {tf: veri}} - yalnızca tüm zaman dilimleri hesaplanabilen semboller;
+        kalanlar get_multiple_timeframe_data ile tek tek (resample/hedge/fallback) alınır.
+        """
+        symbols = list(symbols)
+        source = self.sources["binance"]
+        if not symbols:
+            return {}
+        if not source.breaker.allow():
+            source.skipped += 1
+            return {}
+        
+        per_timeframe = {}
+        for tf in timeframes:
+            try:
+                per_timeframe[tf] = self.binance_client.get_batch_timeframe_data(symbols, tf)
+            except Exception as e:
+                print(f"❌ Binance toplu gösterge hatası ({tf}): {e}")
+                return {}
+        
+        result = {}
+        for symbol in symbols:
+            data = {tf: per_timeframe[tf].get(symbol) for tf in timeframes}
+            if all(data.values()):
+                result[symbol] = data
+        return result
+    
+    def _fetch_binance(self, symbol, timeframes):
+        if self.config.get("resample_from_base", False):
+            return self.binance_client.get_resampled_timeframe_data(
+                symbol, timeframes,
+                base_interval=self.config.get("base_interval", "5m"),
+                min_bars=self.config.get("min_resampled_bars", 50),
+                max_base_candles=self.config.get("max_resample_base_candles", 5000),
+                use_fallback=False
+            )
+        return self.binance_client.get_multiple_timeframe_data(symbol, timeframes, use_fallback=False)
+    
+    def _fetch_tradingview(self, symbol, timeframes):
+        # Önce toplu ön yükleme, sadece eksik zaman dilimleri için istek
+        data = dict(self.tradingview_prefetch.get(symbol) or {})
+        missing = [tf for tf in timeframes if tf not in data]
+        if missing:
+            data.update(self.tradingview_client.get_batch_technical_data([symbol], missing).get(symbol, {}))
+        return {tf: data[tf] for tf in timeframes if tf in data}
+    
+    def _call_source(self, name, symbol, timeframes):
+        """Kaynağı devre kesici + gecikme ölçümüyle çağır - {tf: veri} (geçerli olanlar)"""
+        fetch = self._fetch_binance if name == "binance" else self._fetch_tradingview
+        result = self.sources[name].call(
+            lambda: {tf: data for tf, data in (fetch(symbol, timeframes) or {}).items()
+                     if data and data['close'] > 0}
+        )
+        return result or {}
+    
+    def _submit(self, name, symbol, timeframes):
+        """Kaynak açıksa isteği arka planda başlat, devre açıksa None"""
+        source = self.sources[name]
+        if not source.breaker.allow():
+            source.skipped += 1
+            print(f"   ⛔ {name} devre dışı (circuit open), atlanıyor")
+            return None
+        return self.executor.submit(self._call_source, name, symbol, timeframes)
+    
+    def _hedge_delay(self):
+        """Binance yanıtı için beklenecek süre - gözlenen p95 gecikme"""
+        latency = self.sources["binance"].latency
+        if latency.total < self.config.get("hedge_min_samples", 20):
+            return self.config.get("hedge_default_delay", 2.0)
+        return latency.percentile(self.config.get("hedge_percentile", 95)) / 1000
     
     def get_multiple_timeframe_data(self, symbol, timeframes=["5m", "15m", "1h", "4h"]):
-        """Melez veri kaynağı - önce Binance, sonra TradingView"""
+        """Melez veri kaynağı - önce Binance, yavaşsa/düşükse TradingView"""
         print(f"   🔄 Hibrit veri kaynağı: {symbol} için veri alınıyor...")
         
-        # Önce Binance'dan dene
-        binance_data = self.binance_client.get_multiple_timeframe_data(symbol, timeframes)
-        
-        # Binance verilerini kontrol et
         valid_data = {}
-        for tf, data in binance_data.items():
-            if data and data['close'] > 0:
-                valid_data[tf] = data
-                print(f"   ✅ Binance {tf} verisi kullanılıyor")
-            else:
-                # Binance'tan alınamazsa TradingView'dan al
-                print(f"   🔄 {tf} için TradingView deneniyor...")
-                tv_data = self.tradingview_client.get_technical_data(symbol, tf)
-                if tv_data and tv_data['close'] > 0:
-                    valid_data[tf] = tv_data
-                    print(f"   ✅ TradingView {tf} verisi kullanılıyor")
+        sources = {}  # future -> kaynak adı
+        
+        binance_future = self._submit("binance", symbol, timeframes)
+        if binance_future is not None:
+            sources[binance_future] = "binance"
+            hedge_delay = self._hedge_delay() if self.config.get("hedge_requests", False) else None
+            wait([binance_future], timeout=hedge_delay)
+        
+        pending = set(sources)
+        tradingview_started = False
+        while True:
+            for future in [f for f in pending if f.done()]:
+                pending.discard(future)
+                label = "Binance" if sources[future] == "binance" else "TradingView"
+                for tf, data in future.result().items():
+                    if tf in timeframes and tf not in valid_data:
+                        valid_data[tf] = data
+                        print(f"   ✅ {label} {tf} verisi kullanılıyor")
+            
+            missing = [tf for tf in timeframes if tf not in valid_data]
+            if not missing:
+                break
+            
+            if not tradingview_started:
+                # Binance p95 içinde yanıt vermediyse (hedge) ya da eksik bıraktıysa
+                tradingview_started = True
+                if binance_future is not None and not binance_future.done():
+                    print("   ⏱️ Binance yavaş, TradingView paralel deneniyor...")
                 else:
-                    # Hiçbiri olmazsa Binance fallback
-                    valid_data[tf] = data
-                    print(f"   ⚠️ {tf} için fallback veri kullanılıyor")
+                    print(f"   🔄 {', '.join(missing)} için TradingView deneniyor...")
+                tv_future = self._submit("tradingview", symbol, missing)
+                if tv_future is not None:
+                    sources[tv_future] = "tradingview"
+                    pending.add(tv_future)
+                continue
+            
+            if not pending:
+                break
+            # İlk yanıt veren kazanır - kaybeden arka planda biter ve ölçülür
+            wait(pending, return_when=FIRST_COMPLETED)
+        
+        for tf in timeframes:
+            if tf not in valid_data:
+                # Hiçbiri olmazsa Binance fallback
+                valid_data[tf] = self.binance_client._get_fallback_data(symbol, tf)
+                print(f"   ⚠️ {tf} için fallback veri kullanılıyor")
         
-        return valid_data
+        # İstenen zaman dilimi sırasını koru
+        return {tf: valid_data[tf] for tf in timeframes}
+    
+    def get_source_stats(self):
+        """Kaynak başına devre durumu ve gecikme histogramı"""
+        return {name: source.get_stats() for name, source in self.sources.items()}
     
     def get_technical_data(self, symbol, timeframe):
         """Tek zaman dilimi için hibrit veri al"""
-        # Önce Binance
-        klines = self.binance_client.get_klines(symbol, timeframe, limit=100)
-        if klines:
-            data = self.binance_client.calculate_technical_indicators(klines, symbol, timeframe)
-            if data and data['close'] > 0:
-                return data
+        # Önce Binance (devre açıksa atlanır)
+        binance = self.sources["binance"]
+        if binance.breaker.allow():
+            klines = binance.call(lambda: self.binance_client.get_synced_klines(symbol, timeframe, limit=100))
+            if klines:
+                data = self.binance_client.calculate_technical_indicators(klines, symbol, timeframe, use_fallback=False)
+                if data and data['close'] > 0:
+                    return data
+        else:
+            binance.skipped += 1
         
         # Binance olmazsa TradingView
         return self.tradingview_client.get_technical_data(symbol, timeframe)
@@ -69,6 +228,9 @@ class HybridDataClient:
             print("✅ Hibrit sistem çalışıyor!")
             for tf, data in test_data.items():
                 print(f"   {tf}: ${data['close']:,.2f} | RSI: {data['rsi']:.1f}")
+            for name, stats in self.get_source_stats().items():
+                p95 = stats['latency']['p95']
+                print(f"   {name}: {stats['state']} | p95: {p95:.0f} ms" if p95 is not None else f"   {name}: {stats['state']}")
             return True
         else:
             print("❌ Hibrit sistem testi başarısız!")
@@ -0,0 +1,380 @@
+import json
+import math
+from collections import deque
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def candle_values(candle):
+    """Mumdan (open_time, high, low, close, volume) çıkar - Binance satırı veya dict"""
+    if isinstance(candle, dict):
+        open_time = candle.get('open_time', candle.get('timestamp'))
+        return (
+            int(open_time) if open_time is not None else None,
+            float(candle['high']),
+            float(candle['low']),
+            float(candle['close']),
+            float(candle.get('volume', 0))
+        )
+    return int(candle[0]), float(candle[2]), float(candle[3]), float(candle[4]), float(candle[5])
+
+class IncrementalEMA:
+    """Artımlı EMA - SMA ile başlar, her güncelleme O(1)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def update(self, price):
+        price = float(price)
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += price
+            self.value = price
+        elif self.count == self.period:
+            self.seed_sum += price
+            self.value = self.seed_sum / self.period
+        else:
+            self.value = price * self.multiplier + self.value * (1 - self.multiplier)
+        return self.value
+
+    @property
+    def series_value(self):
+        """Toplu dizideki karşılık - ısınma bitmeden 0 (indicators.ema ile aynı)"""
+        return self.value if self.count >= self.period else 0.0
+
+    def to_dict(self):
+        return {'period': self.period, 'count': self.count, 'seed_sum': self.seed_sum, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state['period'])
+        obj.count = state['count']
+        obj.seed_sum = state['seed_sum']
+        obj.value = state['value']
+        return obj
+
+class IncrementalRSI:
+    """Artımlı Wilder RSI"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = 50.0
+
+    def update(self, candle):
+        close = float(candle) if isinstance(candle, (int, float)) else candle_values(candle)[3]
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+
+        delta = close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.count += 1
+
+        if self.count < self.period:
+            self.gain_sum += gain
+            self.loss_sum += loss
+            return self.value
+        if self.count == self.period:
+            self.gain_sum += gain
+            self.loss_sum += loss
+            self.avg_gain = self.gain_sum / self.period
+            self.avg_loss = self.loss_sum / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        rs = self.avg_gain / (self.avg_loss + 1e-10)
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+    def to_dict(self):
+        return {
+            'period': self.period, 'prev_close': self.prev_close, 'count': self.count,
+            'gain_sum': self.gain_sum, 'loss_sum': self.loss_sum,
+            'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss, 'value': self.value
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state['period'])
+        for key, value in state.items():
+            setattr(obj, key, value)
+        return obj
+
+class IncrementalMACD:
+    """Artımlı MACD - indicators.macd ile aynı ısınma davranışı"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = IncrementalEMA(fast)
+        self.slow = IncrementalEMA(slow)
+        self.signal = IncrementalEMA(signal)
+        self.macd = 0.0
+        self.macd_signal = 0.0
+        self.macd_histogram = 0.0
+
+    def update(self, candle):
+        close = float(candle) if isinstance(candle, (int, float)) else candle_values(candle)[3]
+        self.fast.update(close)
+        self.slow.update(close)
+
+        # Sinyal EMA'sı ısınma sıfırlarını da içeren MACD dizisi üzerinden yürür
+        macd_line = self.fast.series_value - self.slow.series_value
+        self.signal.update(macd_line)
+
+        if self.slow.count < self.slow.period:
+            self.macd = self.macd_signal = self.macd_histogram = 0.0
+        else:
+            self.macd = macd_line
+            self.macd_signal = self.signal.series_value
+            self.macd_histogram = self.macd - self.macd_signal
+        return self.macd, self.macd_signal, self.macd_histogram
+
+    def to_dict(self):
+        return {'fast': self.fast.to_dict(), 'slow': self.slow.to_dict(), 'signal': self.signal.to_dict(),
+                'macd': self.macd, 'macd_signal': self.macd_signal, 'macd_histogram': self.macd_histogram}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls()
+        obj.fast = IncrementalEMA.from_dict(state['fast'])
+        obj.slow = IncrementalEMA.from_dict(state['slow'])
+        obj.signal = IncrementalEMA.from_dict(state['signal'])
+        obj.macd = state['macd']
+        obj.macd_signal = state['macd_signal']
+        obj.macd_histogram = state['macd_histogram']
+        return obj
+
+class IncrementalBollinger:
+    """Artımlı Bollinger Bands - sabit boyutlu pencere"""
+
+    def __init__(self, period=20, std_dev=2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque(maxlen=period)
+        self.upper = self.lower = self.middle = None
+
+    def update(self, candle):
+        close = float(candle) if isinstance(candle, (int, float)) else candle_values(candle)[3]
+        self.window.append(close)
+
+        if len(self.window) < self.period:
+            self.upper = self.lower = self.middle = close
+        else:
+            mean = sum(self.window) / self.period
+            variance = sum((x - mean) ** 2 for x in self.window) / (self.period - 1)
+            std = math.sqrt(variance)
+            self.middle = mean
+            self.upper = mean + std * self.std_dev
+            self.lower = mean - std * self.std_dev
+        return self.upper, self.lower, self.middle
+
+    def to_dict(self):
+        return {'period': self.period, 'std_dev': self.std_dev, 'window': list(self.window),
+                'upper': self.upper, 'lower': self.lower, 'middle': self.middle}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state['period'], state['std_dev'])
+        obj.window.extend(state['window'])
+        obj.upper = state['upper']
+        obj.lower = state['lower']
+        obj.middle = state['middle']
+        return obj
+
+class IncrementalStochastic:
+    """Artımlı Stochastic - monoton deque ile pencere max/min"""
+
+    def __init__(self, period=14, smooth_k=3, smooth_d=3):
+        self.period = period
+        self.smooth_k = smooth_k
+        self.smooth_d = smooth_d
+        self.count = 0
+        self.max_deque = deque()  # (index, high) azalan
+        self.min_deque = deque()  # (index, low) artan
+        self.k_raw = deque(maxlen=smooth_k)
+        self.k_smooth = deque(maxlen=smooth_d)
+        self.stoch_k = 50.0
+        self.stoch_d = 50.0
+
+    def update(self, candle):
+        _, high, low, close, _ = candle_values(candle)
+        index = self.count
+        self.count += 1
+
+        while self.max_deque and self.max_deque[-1][1] <= high:
+            self.max_deque.pop()
+        self.max_deque.append((index, high))
+        while self.min_deque and self.min_deque[-1][1] >= low:
+            self.min_deque.pop()
+        self.min_deque.append((index, low))
+
+        # Pencere dışına çıkanları at
+        window_start = index - self.period + 1
+        while self.max_deque[0][0] < window_start:
+            self.max_deque.popleft()
+        while self.min_deque[0][0] < window_start:
+            self.min_deque.popleft()
+
+        if self.count < self.period:
+            k = 50.0
+        else:
+            highest_high = self.max_deque[0][1]
+            lowest_low = self.min_deque[0][1]
+            k = 100 * (close - lowest_low) / (highest_high - lowest_low) if highest_high != lowest_low else 50.0
+
+        self.k_raw.append(k)
+        k_smooth = sum(self.k_raw) / self.smooth_k if self.count >= self.smooth_k else k
+        self.k_smooth.append(k_smooth)
+        d_smooth = sum(self.k_smooth) / self.smooth_d if self.count >= self.smooth_d else k_smooth
+
+        if self.count < self.period:
+            self.stoch_k, self.stoch_d = 50.0, 50.0
+        else:
+            self.stoch_k, self.stoch_d = k_smooth, d_smooth
+        return self.stoch_k, self.stoch_d
+
+    def to_dict(self):
+        return {
+            'period': self.period, 'smooth_k': self.smooth_k, 'smooth_d': self.smooth_d,
+            'count': self.count,
+            'max_deque': [list(item) for item in self.max_deque],
+            'min_deque': [list(item) for item in self.min_deque],
+            'k_raw': list(self.k_raw), 'k_smooth': list(self.k_smooth),
+            'stoch_k': self.stoch_k, 'stoch_d': self.stoch_d
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state['period'], state['smooth_k'], state['smooth_d'])
+        obj.count = state['count']
+        obj.max_deque.extend(tuple(item) for item in state['max_deque'])
+        obj.min_deque.extend(tuple(item) for item in state['min_deque'])
+        obj.k_raw.extend(state['k_raw'])
+        obj.k_smooth.extend(state['k_smooth'])
+        obj.stoch_k = state['stoch_k']
+        obj.stoch_d = state['stoch_d']
+        return obj
+
+class IncrementalIndicatorSet:
+    """Bir (symbol, interval) için tüm göstergelerin artımlı durumu
+
+    snapshot() çıktısı BinanceClient._calculate_advanced_indicators ile aynı anahtarları taşır.
+    """
+
+    def __init__(self, symbol=None, interval=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.last_open_time = None
+        self.last_close = None
+        self.prev_close = None
+        self.last_volume = 0.0
+        self.rsi_prev = 50.0
+        self.rsi = IncrementalRSI(14)
+        self.macd = IncrementalMACD(12, 26, 9)
+        self.ema_20 = IncrementalEMA(20)
+        self.ema_50 = IncrementalEMA(50)
+        self.bollinger = IncrementalBollinger(20, 2)
+        self.stochastic = IncrementalStochastic(14, 3, 3)
+
+    def update(self, candle):
+        """Kapanmış bir mumu uygula - aynı/eski mum tekrar uygulanmaz"""
+        open_time, _, _, close, volume = candle_values(candle)
+        if open_time is not None and self.last_open_time is not None and open_time <= self.last_open_time:
+            return self.snapshot()
+
+        self.rsi_prev = self.rsi.value
+        self.rsi.update(close)
+        if self.rsi.count == self.rsi.period:
+            # Toplu RSI dizisinde ısınma bölgesi 0'dır
+            self.rsi_prev = 0.0
+        self.macd.update(close)
+        self.ema_20.update(close)
+        self.ema_50.update(close)
+        self.bollinger.update(close)
+        self.stochastic.update(candle)
+
+        self.prev_close = self.last_close if self.last_close is not None else close
+        self.last_close = close
+        self.last_volume = volume
+        self.last_open_time = open_time
+        return self.snapshot()
+
+    def warm_up(self, klines):
+        """Geçmiş mumlarla durumu doldur (tek seferlik O(n))"""
+        for candle in klines:
+            self.update(candle)
+        return self
+
+    def snapshot(self):
+        """Güncel gösterge değerleri"""
+        return {
+            'rsi': self.rsi.value,
+            'rsi_prev': self.rsi_prev,
+            'macd': self.macd.macd,
+            'macd_signal': self.macd.macd_signal,
+            'macd_histogram': self.macd.macd_histogram,
+            'ema_20': self.ema_20.value if self.ema_20.value is not None else self.last_close,
+            'ema_50': self.ema_50.value if self.ema_50.value is not None else self.last_close,
+            'bollinger_upper': self.bollinger.upper,
+            'bollinger_lower': self.bollinger.lower,
+            'bollinger_middle': self.bollinger.middle,
+            'stoch_k': self.stochastic.stoch_k,
+            'stoch_d': self.stochastic.stoch_d
+        }
+
+    def to_dict(self):
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'last_open_time': self.last_open_time,
+            'last_close': self.last_close,
+            'prev_close': self.prev_close,
+            'last_volume': self.last_volume,
+            'rsi_prev': self.rsi_prev,
+            'rsi': self.rsi.to_dict(),
+            'macd': self.macd.to_dict(),
+            'ema_20': self.ema_20.to_dict(),
+            'ema_50': self.ema_50.to_dict(),
+            'bollinger': self.bollinger.to_dict(),
+            'stochastic': self.stochastic.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state.get('symbol'), state.get('interval'))
+        obj.last_open_time = state['last_open_time']
+        obj.last_close = state['last_close']
+        obj.prev_close = state['prev_close']
+        obj.last_volume = state['last_volume']
+        obj.rsi_prev = state['rsi_prev']
+        obj.rsi = IncrementalRSI.from_dict(state['rsi'])
+        obj.macd = IncrementalMACD.from_dict(state['macd'])
+        obj.ema_20 = IncrementalEMA.from_dict(state['ema_20'])
+        obj.ema_50 = IncrementalEMA.from_dict(state['ema_50'])
+        obj.bollinger = IncrementalBollinger.from_dict(state['bollinger'])
+        obj.stochastic = IncrementalStochastic.from_dict(state['stochastic'])
+        return obj
+
+    def save(self, path):
+        """Durumu JSON olarak kaydet"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Kaydedilmiş durumu yükle"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,305 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import indicators
+
+# Mum alanları - graf yaprakları
+SERIES = ('open', 'high', 'low', 'close', 'volume')
+
+def ref(name, **params):
+    """Bir gösterge düğümüne referans - (ad, parametreler)"""
+    return (name, params)
+
+class IndicatorRegistry:
+    """Bildirimsel gösterge kaydı
+
+    Her gösterge varsayılan parametrelerini, girdilerini (başka düğümlere ref) ve
+    hesaplama fonksiyonunu bildirir. Düğüm anahtarı (ad, varsayılanlarla tamamlanmış
+    parametreler) olduğundan aynı ara sonuç (örn. EMA(close, 12)) kaç gösterge
+    isterse istesin tek düğümdür.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self._compiled = {}  # çıktı anahtarları -> derlenmiş adımlar
+
+    def register(self, name, compute, inputs=None, defaults=None):
+        """compute(p, x): p = parametreler, x = {girdi adı: dizi}; inputs(p) -> {girdi adı: ref}"""
+        self.nodes[name] = {
+            'compute': compute,
+            'inputs': inputs or (lambda p: {}),
+            'defaults': defaults or {}
+        }
+        self._compiled.clear()
+
+    def key(self, node):
+        """ref / ad -> hashable düğüm anahtarı (iç içe ref'ler dahil)"""
+        if isinstance(node, str):
+            node = (node, {})
+        name, params = node
+        if isinstance(params, tuple):
+            params = dict(params)  # zaten normalize edilmiş anahtar
+        if name in SERIES:
+            return (name, ())
+        if name not in self.nodes:
+            raise KeyError(f"Kayıtlı olmayan gösterge: {name}")
+        merged = dict(self.nodes[name]['defaults'], **params)
+        return (name, tuple(sorted(
+            (k, self.key(v) if isinstance(v, tuple) else v) for k, v in merged.items()
+        )))
+
+    def _params(self, key):
+        # Anahtardaki iç içe anahtarlar ref olarak geri verilir (inputs fonksiyonları için)
+        return {k: v for k, v in key[1]}
+
+    def dependencies(self, key):
+        if key[0] in SERIES:
+            return {}
+        return {arg: self.key(node) for arg, node in self.nodes[key[0]]['inputs'](self._params(key)).items()}
+
+    def plan(self, outputs):
+        """İstenen çıktılar için tekil düğümlerin topolojik sırası"""
+        order, state = [], {}
+
+        def visit(key):
+            if state.get(key) == 'done':
+                return
+            if state.get(key) == 'visiting':
+                raise ValueError(f"Gösterge grafında döngü: {key[0]}")
+            state[key] = 'visiting'
+            for dep in self.dependencies(key).values():
+                visit(dep)
+            state[key] = 'done'
+            order.append(key)
+
+        for node in outputs:
+            visit(self.key(node))
+        return order
+
+    def compile(self, outputs):
+        """Çıktılar için (anahtar, compute, parametreler, bağımlılıklar) adımları - önbellekli"""
+        named = outputs if isinstance(outputs, dict) else {self.key(o): o for o in outputs}
+        targets = tuple((name, self.key(node)) for name, node in named.items())
+        steps = self._compiled.get(targets)
+        if steps is None:
+            steps = []
+            for key in self.plan([key for _, key in targets]):
+                if key[0] in SERIES:
+                    steps.append((key, None, None, None))
+                else:
+                    steps.append((key, self.nodes[key[0]]['compute'], self._params(key),
+                                  tuple(self.dependencies(key).items())))
+            self._compiled[targets] = steps
+        return targets, steps
+
+    def evaluate(self, candles, outputs, memo=None):
+        """Çıktıları hesapla - her tekil ara sonuç bir kez
+
+        outputs: {çıktı adı: ref} veya ref listesi. memo verilirse aynı mum seti için
+        çağrılar arası paylaşılır (anahtar -> dizi).
+        """
+        targets, steps = self.compile(outputs)
+        memo = {} if memo is None else memo
+
+        for key, compute, params, deps in steps:
+            if key in memo:
+                continue
+            if compute is None:
+                memo[key] = np.asarray(candles[key[0]], dtype=np.float64)
+            else:
+                memo[key] = compute(params, {arg: memo[dep] for arg, dep in deps})
+
+        return {name: memo[key] for name, key in targets}
+
+# Varsayılan kayıt - çekirdekler tarihsel çıktıyı birebir korur
+REGISTRY = IndicatorRegistry()
+
+def _source(p):
+    source = p.get('source', 'close')
+    return {'x': source if isinstance(source, tuple) else ref(source)}
+
+REGISTRY.register('sma', lambda p, x: indicators.sma(x['x'], p['period']),
+                  inputs=_source, defaults={'period': 20, 'source': 'close'})
+
+REGISTRY.register('ema', lambda p, x: indicators.ema(x['x'], p['period']),
+                  inputs=_source, defaults={'period': 20, 'source': 'close'})
+
+REGISTRY.register('rsi', lambda p, x: indicators.rsi(x['x'], p['period']),
+                  inputs=_source, defaults={'period': 14, 'source': 'close'})
+
+REGISTRY.register('rolling_std', lambda p, x: indicators.rolling_std(x['x'], p['period']),
+                  inputs=_source, defaults={'period': 20, 'source': 'close'})
+
+# MACD: çizgi iki EMA'yı, sinyal çizginin EMA'sını paylaşır
+def _macd_line(p, x):
+    if x['close'].shape[-1] < p['slow']:
+        return np.zeros(x['close'].shape)
+    return x['fast'] - x['slow']
+
+REGISTRY.register(
+    'macd_line', _macd_line,
+    inputs=lambda p: {'fast': ref('ema', period=p['fast']), 'slow': ref('ema', period=p['slow']),
+                      'close': ref('close')},
+    defaults={'fast': 12, 'slow': 26}
+)
+REGISTRY.register(
+    'macd_signal', lambda p, x: x['signal'],
+    inputs=lambda p: {'signal': ref('ema', period=p['signal'],
+                                    source=ref('macd_line', fast=p['fast'], slow=p['slow']))},
+    defaults={'fast': 12, 'slow': 26, 'signal': 9}
+)
+REGISTRY.register(
+    'macd_histogram', lambda p, x: x['line'] - x['signal'],
+    inputs=lambda p: {'line': ref('macd_line', fast=p['fast'], slow=p['slow']),
+                      'signal': ref('macd_signal', fast=p['fast'], slow=p['slow'], signal=p['signal'])},
+    defaults={'fast': 12, 'slow': 26, 'signal': 9}
+)
+
+# Bollinger: orta bant SMA düğümünü, bantlar aynı rolling std'yi paylaşır
+def _bollinger_band(sign):
+    def compute(p, x):
+        prices, period = x['close'], p['period']
+        band = prices.copy()
+        if prices.shape[-1] >= period:
+            band[..., period - 1:] = x['middle'][..., period - 1:] + sign * x['std'] * p['std_dev']
+        return band
+    return compute
+
+def _bollinger_inputs(p):
+    return {'close': ref('close'), 'middle': ref('sma', period=p['period']),
+            'std': ref('rolling_std', period=p['period'])}
+
+REGISTRY.register('bollinger_upper', _bollinger_band(1), inputs=_bollinger_inputs,
+                  defaults={'period': 20, 'std_dev': 2})
+REGISTRY.register('bollinger_lower', _bollinger_band(-1), inputs=_bollinger_inputs,
+                  defaults={'period': 20, 'std_dev': 2})
+REGISTRY.register('bollinger_middle', lambda p, x: x['middle'],
+                  inputs=lambda p: {'middle': ref('sma', period=p['period'])}, defaults={'period': 20})
+
+# Stochastic: ham %K bir kez, %K ve %D onun SMA zinciri
+REGISTRY.register('stoch_raw',
+                  lambda p, x: indicators.stochastic_raw(x['high'], x['low'], x['close'], p['period']),
+                  inputs=lambda p: {'high': ref('high'), 'low': ref('low'), 'close': ref('close')},
+                  defaults={'period': 14})
+REGISTRY.register(
+    'stoch_k', lambda p, x: x['k'],
+    inputs=lambda p: {'k': ref('sma', period=p['smooth_k'], source=ref('stoch_raw', period=p['period']))},
+    defaults={'period': 14, 'smooth_k': 3}
+)
+REGISTRY.register(
+    'stoch_d', lambda p, x: x['d'],
+    inputs=lambda p: {'d': ref('sma', period=p['smooth_d'],
+                               source=ref('stoch_k', period=p['period'], smooth_k=p['smooth_k']))},
+    defaults={'period': 14, 'smooth_k': 3, 'smooth_d': 3}
+)
+
+# _calculate_advanced_indicators çıktıları
+DEFAULT_OUTPUTS = {
+    'rsi': ref('rsi', period=14),
+    'macd': ref('macd_line'),
+    'macd_signal': ref('macd_signal'),
+    'macd_histogram': ref('macd_histogram'),
+    'ema_20': ref('ema', period=20),
+    'ema_50': ref('ema', period=50),
+    'bollinger_upper': ref('bollinger_upper'),
+    'bollinger_lower': ref('bollinger_lower'),
+    'bollinger_middle': ref('bollinger_middle'),
+    'stoch_k': ref('stoch_k'),
+    'stoch_d': ref('stoch_d')
+}
+
+def compute_indicators(candles, outputs=None, memo=None, registry=None):
+    """Varsayılan (ya da verilen) çıktıları paylaşılan ara sonuçlarla hesapla"""
+    return (registry or REGISTRY).evaluate(candles, outputs or DEFAULT_OUTPUTS, memo=memo)
+
+class IndicatorResult:
+    """Tam gösterge serilerini tembel hesaplayan sonuç nesnesi
+
+    Girdi serileri oluşturulurken kopyalanır (CandleBuffer görünümü sonradan
+    değişse de sonuç tutarlı kalır); her çıktı ilk istendiğinde paylaşılan memo
+    üzerinden hesaplanır ve salt okunur görünüm olarak döner. Canlı sinyal
+    (latest/snapshot), grafik ve backtest aynı hesaplamayı kullanır.
+    """
+
+    def __init__(self, candles, outputs=None, registry=None):
+        self.registry = registry or REGISTRY
+        self.outputs = dict(outputs or DEFAULT_OUTPUTS)
+        self._memo = {}
+        self._series = {}
+        for field in SERIES:
+            try:
+                values = candles[field]
+            except (KeyError, IndexError, ValueError):
+                continue
+            self._memo[(field, ())] = np.array(values, dtype=np.float64)
+        try:
+            self.open_times = np.array(candles['open_time'], dtype=np.int64)
+        except (KeyError, IndexError, ValueError):
+            self.open_times = None
+
+    def __len__(self):
+        close = self._memo.get(('close', ()))
+        return len(close) if close is not None else 0
+
+    def __contains__(self, name):
+        return name in self.outputs
+
+    def __getitem__(self, name):
+        return self.series(name)
+
+    def keys(self):
+        return self.outputs.keys()
+
+    @property
+    def materialized(self):
+        """Şu ana kadar hesaplanmış çıktılar"""
+        return list(self._series)
+
+    def series(self, name):
+        """Çıktının tam serisi (salt okunur) - ilk çağrıda hesaplanır"""
+        if name not in self._series:
+            if name not in self.outputs:
+                raise KeyError(f"Tanımsız gösterge çıktısı: {name}")
+            values = self.registry.evaluate({}, {name: self.outputs[name]}, memo=self._memo)[name].view()
+            values.flags.writeable = False
+            self._series[name] = values
+        return self._series[name]
+
+    def latest(self, name, offset=0, default=None):
+        """Son (offset kadar önceki) değer - skaler"""
+        values = self.series(name)
+        return float(values[-1 - offset]) if len(values) > offset else default
+
+    def snapshot(self):
+        """_calculate_advanced_indicators'ın döndürdüğü son değer sözlüğü"""
+        close = self._memo[('close', ())]
+        last_close = float(close[-1]) if len(close) else 0.0
+        return {
+            'rsi': self.latest('rsi', default=50),
+            'rsi_prev': self.latest('rsi', 1, default=50),
+            'macd': self.latest('macd', default=0),
+            'macd_signal': self.latest('macd_signal', default=0),
+            'macd_histogram': self.latest('macd_histogram', default=0),
+            'ema_20': self.latest('ema_20', default=last_close),
+            'ema_50': self.latest('ema_50', default=last_close),
+            'bollinger_upper': self.latest('bollinger_upper', default=last_close),
+            'bollinger_lower': self.latest('bollinger_lower', default=last_close),
+            'bollinger_middle': self.latest('bollinger_middle', default=last_close),
+            'stoch_k': self.latest('stoch_k', default=50),
+            'stoch_d': self.latest('stoch_d', default=50)
+        }
+
+    def to_frame(self, names=None, tail=None):
+        """Seçili serileri (varsayılan tümü) pandas DataFrame olarak - grafikler için"""
+        import pandas as pd
+
+        names = list(names or self.outputs)
+        start = -tail if tail else None
+        frame = pd.DataFrame({name: self.series(name)[start:] for name in names})
+        frame.insert(0, 'close', self._memo[('close', ())][start:])
+        if self.open_times is not None:
+            frame.index = pd.to_datetime(self.open_times[start:], unit='ms')
+        return frame
@@ -0,0 +1,94 @@
+import hashlib
+import math
+import time
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.cache import TTLCache
+from data.candle_buffer import CandleBuffer
+from data.incremental_indicators import IncrementalIndicatorSet
+from data import indicator_graph
+
+# Aynı (sembol, zaman dilimi) için farklı seriler üreten bar kaynakları
+# (aggTrade barları akışta kendi artımlı durumunu tutar, memo'ya girmez)
+BAR_SOURCES = ("kline", "resampled")
+
+def default_maxsize():
+    """Memo kapasitesi - sembol evreni x zaman dilimi x bar kaynağı (SCHEDULER_CONFIG'ten)"""
+    try:
+        from settings import SCHEDULER_CONFIG, SYMBOLS, TIMEFRAMES
+    except ImportError:
+        return 1024
+    symbols = max(SCHEDULER_CONFIG.get("max_symbols") or 0, len(SYMBOLS))
+    return max(1024, symbols * len(TIMEFRAMES) * len(BAR_SOURCES))
+
+def params_hash(outputs=None, registry=None):
+    """Gösterge parametrelerinin kararlı özeti - parametre değişince memo anahtarları da değişir"""
+    registry = registry or indicator_graph.REGISTRY
+    outputs = outputs or indicator_graph.DEFAULT_OUTPUTS
+    spec = sorted((name, registry.key(node)) for name, node in outputs.items())
+    return hashlib.sha1(repr(spec).encode()).hexdigest()[:12]
+
+class IndicatorMemo:
+    """Son kapanmış mum bazlı gösterge memo'su (LRU)
+
+    Anahtar (symbol, interval, bar kaynağı, son kapanmış open_time, parametre hash'i);
+    hash'e pencere uzunluğu da girer (EMA tohumu pencereye bağlı). Kaynak (kline,
+    resampled) aynı zaman dilimindeki farklı serilerin karışmasını önler.
+    maxsize verilmezse evren boyutundan hesaplanır - LRU her döngüde dönmesin. Değer, kapanmış mumlar
+    üzerinde ısıtılmış artımlı gösterge durumudur. Yeni mum kapanmadıkça durum
+    cache'ten gelir; canlı (açık) mum istenirse sadece o mum durumun kopyasına
+    uygulanır - O(1). Sonuçlar toplu hesapla kayan nokta yuvarlaması kadar aynıdır.
+    """
+
+    def __init__(self, maxsize=None):
+        self.cache = TTLCache(maxsize=maxsize or default_maxsize(), default_ttl=math.inf)
+        self.params = params_hash()
+        self.live_updates = 0
+        self.uncached = 0
+
+    def _closed_state(self, symbol, interval, source, candles, closed):
+        key = (symbol, interval, source, int(candles.open_times[closed - 1]), f"{self.params}:{closed}")
+        return self.cache.get_or_load(
+            key, lambda: IncrementalIndicatorSet(symbol, interval).warm_up(candles.to_klines()[:closed])
+        )
+
+    def get_snapshot(self, symbol, interval, candles, live=True, now_ms=None, source="kline"):
+        """Gösterge sözlüğü (_calculate_advanced_indicators ile aynı anahtarlar)
+
+        candles: CandleBuffer ya da Binance kline listesi - son satır açık mum olabilir.
+        live=False ise sadece kapanmış mumlar üzerinden değerler döner.
+        source: bar kaynağı (BAR_SOURCES) - anahtarın parçası.
+        """
+        candles = candles if isinstance(candles, CandleBuffer) else CandleBuffer.from_klines(candles)
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        closed = int(np.searchsorted(candles['close_time'], now_ms))
+
+        if closed == 0:
+            # Kapanmış mum yok - memo'lanacak durum da yok
+            self.uncached += 1
+            return indicator_graph.IndicatorResult(candles).snapshot()
+
+        state = self._closed_state(symbol, interval, source, candles, closed)
+        if not live or closed == len(candles):
+            return state.snapshot()
+
+        # Durumun kopyasına açık mum(lar)ı uygula - memo'daki durum değişmez
+        state = IncrementalIndicatorSet.from_dict(state.to_dict())
+        for offset in range(len(candles) - closed - 1, -1, -1):
+            state.update([int(candles.latest('open_time', offset))] +
+                         [candles.latest(field, offset) for field in ('open', 'high', 'low', 'close', 'volume')])
+        self.live_updates += 1
+        return state.snapshot()
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+    def get_stats(self):
+        """LRU hit oranı ve canlı mum güncellemeleri"""
+        stats = self.cache.get_stats()
+        stats.update({'maxsize': self.cache.maxsize, 'live_updates': self.live_updates, 'uncached': self.uncached})
+        return stats
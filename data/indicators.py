@@ -0,0 +1,261 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# scipy varsa özyinelemeli filtreyi C tarafında çalıştır
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+# numba varsa özyinelemeli çekirdekler JIT ile derlenebilir
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Blok içi a^-k çarpanının üst sınırı (hassasiyet kaybını sınırlar)
+_MAX_BLOCK_GAIN = 1e3
+
+BACKENDS = ("numpy", "numba")
+_backend = "numpy"
+
+def _as_float_array(values):
+    """Girdiyi float64 NumPy dizisine çevir (kopyasız mümkünse)"""
+    return np.asarray(values, dtype=np.float64)
+
+def _as_rows(values):
+    """(..., n) -> bitişik (satır, n) - JIT çekirdekleri için"""
+    return np.ascontiguousarray(values.reshape(-1, values.shape[-1]))
+
+def _recursive_loop(x, a, b, y_init):
+    # Satır başına y[i] = a * y[i-1] + b * x[i] - sıralı döngü (lfilter ile aynı işlem sırası)
+    rows, n = x.shape
+    y = np.empty((rows, n))
+    for r in range(rows):
+        prev = y_init[r]
+        for i in range(n):
+            prev = a * prev + b * x[r, i]
+            y[r, i] = prev
+    return y
+
+def _rolling_max_loop(values, period):
+    # Satır başına monoton kuyruk - O(n), pencere boyundan bağımsız
+    rows, n = values.shape
+    out = np.empty((rows, n - period + 1))
+    queue = np.empty(n, dtype=np.int64)
+    for r in range(rows):
+        head = 0
+        tail = 0
+        for i in range(n):
+            while tail > head and values[r, queue[tail - 1]] <= values[r, i]:
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+            if queue[head] <= i - period:
+                head += 1
+            if i >= period - 1:
+                out[r, i - period + 1] = values[r, queue[head]]
+    return out
+
+_jit_kernels = {}
+
+def _jit(name):
+    """Çekirdeği ilk kullanımda derle (numba önbelleği diske yazar)"""
+    if name not in _jit_kernels:
+        _jit_kernels[name] = njit(cache=True)(globals()[name])
+    return _jit_kernels[name]
+
+def set_backend(name="auto"):
+    """Gösterge çekirdeği backend'ini seç - auto | numpy | numba; etkin backend'i döndürür"""
+    global _backend
+    name = (name or "auto").lower()
+    if name not in BACKENDS + ("auto",):
+        raise ValueError(f"Bilinmeyen gösterge backend'i: {name}")
+    if name == "numba" and njit is None:
+        print("⚠️ numba kurulu değil, NumPy backend'i kullanılıyor")
+        name = "numpy"
+    if name == "auto":
+        name = "numba" if njit is not None else "numpy"
+    _backend = name
+    return _backend
+
+def get_backend():
+    """Etkin backend ve açıklaması"""
+    if _backend == "numba":
+        return {'backend': 'numba', 'description': 'numba JIT'}
+    return {'backend': 'numpy', 'description': 'NumPy + scipy lfilter' if lfilter is not None else 'NumPy'}
+
+def rolling_max(values, period):
+    """Son eksende kayan pencere maksimumu - uzunluk n-period+1"""
+    values = _as_float_array(values)
+    if _backend == "numba":
+        out = _jit('_rolling_max_loop')(_as_rows(values), period)
+        return out.reshape(values.shape[:-1] + (-1,))
+    return sliding_window_view(values, period, axis=-1).max(axis=-1)
+
+def rolling_min(values, period):
+    """Son eksende kayan pencere minimumu - uzunluk n-period+1"""
+    values = _as_float_array(values)
+    if _backend == "numba":
+        return -rolling_max(-values, period)
+    return sliding_window_view(values, period, axis=-1).min(axis=-1)
+
+def recursive_filter(x, a, b, y_init=0.0):
+    """y[i] = a * y[i-1] + b * x[i] özyinelemesini son eksen boyunca vektörel hesapla
+
+    y_init, x[..., 0]'dan önceki y değeridir (skaler ya da satır başına dizi).
+    2-D girdide her satır (sembol) bağımsız seridir.
+    """
+    x = _as_float_array(x)
+    n = x.shape[-1]
+    y_init = np.broadcast_to(np.asarray(y_init, dtype=np.float64), x.shape[:-1])
+    if n == 0:
+        return np.empty(x.shape, dtype=np.float64)
+
+    if _backend == "numba":
+        y = _jit('_recursive_loop')(_as_rows(x), float(a), float(b), np.ascontiguousarray(y_init.reshape(-1)))
+        return y.reshape(x.shape)
+
+    if lfilter is not None:
+        y, _ = lfilter([b], [1.0, -a], x, axis=-1, zi=(a * y_init)[..., None])
+        return y
+
+    if a == 0:
+        return b * x
+
+    # Saf NumPy: bloklar halinde kapalı form
+    # y[k+j] = a^(j+1) * y[k-1] + b * a^j * sum_{m<=j} x[k+m] * a^-m
+    block = max(1, int(np.log(_MAX_BLOCK_GAIN) / -np.log(abs(a)))) if abs(a) < 1 else 1
+    powers = a ** np.arange(block, dtype=np.float64)
+    inv_powers = 1.0 / powers
+
+    y = np.empty(x.shape, dtype=np.float64)
+    prev = y_init
+    for start in range(0, n, block):
+        chunk = x[..., start:start + block]
+        m = chunk.shape[-1]
+        acc = np.cumsum(chunk * inv_powers[:m], axis=-1)
+        y[..., start:start + m] = powers[:m] * (a * prev[..., None] + b * acc)
+        prev = y[..., start + m - 1]
+    return y
+
+def sma(prices, period):
+    """Simple Moving Average - ilk period-1 değer fiyatın kendisi"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < period:
+        return prices.copy()
+
+    result = prices.copy()
+    result[..., period - 1:] = sliding_window_view(prices, period, axis=-1).mean(axis=-1)
+    return result
+
+def ema(prices, period):
+    """EMA - SMA ile başlar, ilk period-1 değer 0"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < period:
+        return prices.copy()
+
+    multiplier = 2 / (period + 1)
+    result = np.zeros_like(prices)
+    result[..., period - 1] = np.mean(prices[..., :period], axis=-1)
+    result[..., period:] = recursive_filter(prices[..., period:], 1 - multiplier, multiplier,
+                                            result[..., period - 1])
+    return result
+
+def rsi(prices, period=14):
+    """Wilder RSI - ilk period değer 0 (tarihsel davranış)"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < period + 1:
+        return np.full(prices.shape, 50.0)
+
+    deltas = np.diff(prices, axis=-1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    avg_gains = np.zeros_like(prices)
+    avg_losses = np.zeros_like(prices)
+
+    # İlk değerler basit ortalama, sonrası Wilder yumuşatması
+    avg_gains[..., period] = np.mean(gains[..., :period], axis=-1)
+    avg_losses[..., period] = np.mean(losses[..., :period], axis=-1)
+
+    a = (period - 1) / period
+    b = 1 / period
+    avg_gains[..., period + 1:] = recursive_filter(gains[..., period:], a, b, avg_gains[..., period])
+    avg_losses[..., period + 1:] = recursive_filter(losses[..., period:], a, b, avg_losses[..., period])
+
+    rs = avg_gains / (avg_losses + 1e-10)
+    return 100 - (100 / (1 + rs))
+
+def macd(prices, fast=12, slow=26, signal=9):
+    """MACD çizgisi, sinyal çizgisi ve histogram"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < slow:
+        zeros = np.zeros(prices.shape)
+        return zeros, zeros.copy(), zeros.copy()
+
+    macd_line = ema(prices, fast) - ema(prices, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+def bollinger_bands(prices, period=20, std_dev=2):
+    """Bollinger Bands (upper, lower, middle) - ilk period-1 değer fiyat"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < period:
+        return prices.copy(), prices.copy(), prices.copy()
+
+    middle = sma(prices, period)
+    std = rolling_std(prices, period)
+
+    upper = prices.copy()
+    lower = prices.copy()
+    upper[..., period - 1:] = middle[..., period - 1:] + std * std_dev
+    lower[..., period - 1:] = middle[..., period - 1:] - std * std_dev
+    return upper, lower, middle
+
+def rolling_std(prices, period):
+    """Kayan pencere standart sapması (ddof=1) - uzunluk n-period+1"""
+    prices = _as_float_array(prices)
+    if prices.shape[-1] < period:
+        return np.empty(prices.shape[:-1] + (0,))
+    return sliding_window_view(prices, period, axis=-1).std(axis=-1, ddof=1)
+
+def stochastic_raw(high, low, close, period=14):
+    """Yumuşatılmamış %K - ilk period-1 değer (ve düz aralıklar) 50"""
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+    if close.shape[-1] < period:
+        return np.full(close.shape, 50.0)
+
+    highest_high = rolling_max(high, period)
+    lowest_low = rolling_min(low, period)
+    spread = highest_high - lowest_low
+
+    k_values = np.full(close.shape, 50.0)
+    flat = spread == 0
+    k_values[..., period - 1:] = np.where(
+        flat, 50.0, 100 * (close[..., period - 1:] - lowest_low) / np.where(flat, 1.0, spread)
+    )
+    return k_values
+
+def stochastic(high, low, close, period=14, smooth_k=3, smooth_d=3):
+    """Stochastic Oscillator (%K, %D) - yumuşatılmış"""
+    close = _as_float_array(close)
+    if close.shape[-1] < period:
+        return np.full(close.shape, 50.0), np.full(close.shape, 50.0)
+
+    k_values = stochastic_raw(high, low, close, period)
+    k_smooth = sma(k_values, smooth_k)
+    d_smooth = sma(k_smooth, smooth_d)
+    return k_smooth, d_smooth
+
+# Varsayılan: INDICATOR_BACKEND ortam değişkeni (yoksa numba kuruluysa numba)
+try:
+    set_backend(os.getenv("INDICATOR_BACKEND", "auto"))
+except ValueError as e:
+    print(f"⚠️ {e}, NumPy backend'i kullanılıyor")
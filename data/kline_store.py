@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.gap_index import GapIndex
+
+# Varsayılan mum veritabanı - proje kök dizininde
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "market_data.db")
+
+# Binance interval -> milisaniye
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "2h": 2 * 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "6h": 6 * 60 * 60_000,
+    "8h": 8 * 60 * 60_000,
+    "12h": 12 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+    "3d": 3 * 24 * 60 * 60_000,
+    "1w": 7 * 24 * 60 * 60_000
+}
+
+def interval_to_ms(interval):
+    """Interval string'ini milisaniyeye çevir"""
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Bilinmeyen interval: {interval}")
+    return INTERVAL_MS[interval]
+
+# Binance haftalık mumları Pazartesi 00:00 UTC'de açılır (epoch Perşembe)
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60_000
+
+def interval_offset_ms(interval):
+    """Mum sınırlarının epoch'a göre kayması - sınır = (t - kayma) // interval * interval + kayma"""
+    return WEEK_OFFSET_MS if interval == "1w" else 0
+
+class KlineStore:
+    """Yerel mum deposu - (symbol, interval, open_time) anahtarlı"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        # (symbol, interval) -> GapIndex, ilk kullanımda depodan kurulur
+        self._gap_indexes = {}
+        self._gap_lock = threading.Lock()
+        self.init_db()
+
+    def init_db(self):
+        """Tabloyu oluştur"""
+        with sqlite3.connect(self.db_path) as conn:
+            c = conn.cursor()
+            c.execute('''CREATE TABLE IF NOT EXISTS klines
+                        (symbol TEXT NOT NULL,
+                         interval TEXT NOT NULL,
+                         open_time INTEGER NOT NULL,
+                         open REAL NOT NULL,
+                         high REAL NOT NULL,
+                         low REAL NOT NULL,
+                         close REAL NOT NULL,
+                         volume REAL NOT NULL,
+                         close_time INTEGER NOT NULL,
+                         quote_volume REAL DEFAULT 0,
+                         trades INTEGER DEFAULT 0,
+                         taker_buy REAL DEFAULT 0,
+                         taker_quote REAL DEFAULT 0,
+                         PRIMARY KEY (symbol, interval, open_time))''')
+            # Borsada mum olmadığı doğrulanan aralıklar - yeniden başlatmada da boşluk sayılmaz
+            c.execute('''CREATE TABLE IF NOT EXISTS empty_ranges
+                        (symbol TEXT NOT NULL,
+                         interval TEXT NOT NULL,
+                         start_time INTEGER NOT NULL,
+                         end_time INTEGER NOT NULL,
+                         PRIMARY KEY (symbol, interval, start_time))''')
+            conn.commit()
+
+    def _normalize_symbol(self, symbol):
+        # BINANCE:BTCUSDT -> BTCUSDT
+        return symbol.replace('BINANCE:', '')
+
+    def upsert_klines(self, symbol, interval, klines):
+        """Binance ham kline satırlarını kaydet (aynı open_time güncellenir)"""
+        if not klines:
+            return 0
+
+        symbol = self._normalize_symbol(symbol)
+        rows = [
+            (symbol, interval, int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]),
+             float(k[5]), int(k[6]), float(k[7]), int(k[8]), float(k[9]), float(k[10]))
+            for k in klines
+        ]
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''INSERT OR REPLACE INTO klines
+                               (symbol, interval, open_time, open, high, low, close, volume,
+                                close_time, quote_volume, trades, taker_buy, taker_quote)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+            conn.commit()
+        
+        index = self._gap_indexes.get((symbol, interval))
+        if index is not None:
+            index.add_open_times([row[2] for row in rows])
+        return len(rows)
+
+    def get_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        """Kayıtlı mumları Binance kline formatında (eskiden yeniye) döndür"""
+        symbol = self._normalize_symbol(symbol)
+        query = '''SELECT open_time, open, high, low, close, volume, close_time,
+                          quote_volume, trades, taker_buy, taker_quote
+                   FROM klines WHERE symbol = ? AND interval = ?'''
+        params = [symbol, interval]
+
+        if start_time is not None:
+            query += " AND open_time >= ?"
+            params.append(int(start_time))
+        if end_time is not None:
+            query += " AND open_time <= ?"
+            params.append(int(end_time))
+
+        query += " ORDER BY open_time DESC LIMIT ?"
+        params.append(int(limit))
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        # Binance satır formatı: son alan 'ignore'
+        return [list(row) + ["0"] for row in reversed(rows)]
+
+    def get_last_open_time(self, symbol, interval):
+        """Son kayıtlı mumun open_time değeri"""
+        symbol = self._normalize_symbol(symbol)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''SELECT MAX(open_time) FROM klines
+                                  WHERE symbol = ? AND interval = ?''', (symbol, interval)).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def get_last_close_time(self, symbol, interval):
+        """Son kayıtlı mumun close_time değeri"""
+        symbol = self._normalize_symbol(symbol)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''SELECT close_time FROM klines
+                                  WHERE symbol = ? AND interval = ?
+                                  ORDER BY open_time DESC LIMIT 1''', (symbol, interval)).fetchone()
+        return row[0] if row else None
+
+    def count(self, symbol, interval):
+        """Kayıtlı mum sayısı"""
+        symbol = self._normalize_symbol(symbol)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''SELECT COUNT(*) FROM klines
+                                  WHERE symbol = ? AND interval = ?''', (symbol, interval)).fetchone()
+        return row[0]
+
+    def count_range(self, symbol, interval, start_time, end_time):
+        """[start_time, end_time] aralığındaki kayıtlı mum sayısı"""
+        symbol = self._normalize_symbol(symbol)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''SELECT COUNT(*) FROM klines
+                                  WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?''',
+                               (symbol, interval, int(start_time), int(end_time))).fetchone()
+        return row[0]
+
+    def get_gap_index(self, symbol, interval):
+        """Kapsanan aralık indeksi - ilk çağrıda depodaki open_time'lardan kurulur"""
+        symbol = self._normalize_symbol(symbol)
+        key = (symbol, interval)
+        with self._gap_lock:
+            index = self._gap_indexes.get(key)
+            if index is None:
+                with sqlite3.connect(self.db_path) as conn:
+                    rows = conn.execute('''SELECT open_time FROM klines
+                                          WHERE symbol = ? AND interval = ?''', key).fetchall()
+                    empty = conn.execute('''SELECT start_time, end_time FROM empty_ranges
+                                           WHERE symbol = ? AND interval = ?''', key).fetchall()
+                index = GapIndex.from_open_times(interval_to_ms(interval), [row[0] for row in rows])
+                for start, end in empty:
+                    index.mark_empty(start, end)
+                self._gap_indexes[key] = index
+        return index
+
+    def mark_empty(self, symbol, interval, start_time, end_time):
+        """Borsada mum olmadığı doğrulanan aralığı kaydet - tekrar çekilmez, boşluk sayılmaz"""
+        index = self.get_gap_index(symbol, interval)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''INSERT OR REPLACE INTO empty_ranges (symbol, interval, start_time, end_time)
+                            VALUES (?, ?, ?, ?)''',
+                         (self._normalize_symbol(symbol), interval, int(start_time), int(end_time)))
+            conn.commit()
+        index.mark_empty(int(start_time), int(end_time))
+
+    def find_gaps(self, symbol, interval, start_time, end_time):
+        """[start_time, end_time] aralığında depoda olmayan mum aralıkları"""
+        return self.get_gap_index(symbol, interval).gaps(int(start_time), int(end_time))
@@ -0,0 +1,251 @@
+import bisect
+import json
+import threading
+import time
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class OrderBook:
+    """Fiyat seviyelerini sıralı tutan yerel emir defteri
+
+    Her taraf için fiyat -> miktar sözlüğü ve artan sıralı fiyat listesi tutulur;
+    seviye arama bisect ile O(log n), en iyi fiyat O(1).
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = {}
+        self.asks = {}
+        self._bid_prices = []  # artan - en iyi alış sonda
+        self._ask_prices = []  # artan - en iyi satış başta
+        self.last_update_id = None
+        self.lock = threading.Lock()
+
+    def apply_snapshot(self, snapshot):
+        """/depth yanıtını yükle - {'lastUpdateId', 'bids': [[fiyat, miktar]], 'asks': [...]}"""
+        with self.lock:
+            self.bids = {float(p): float(q) for p, q in snapshot['bids'] if float(q) > 0}
+            self.asks = {float(p): float(q) for p, q in snapshot['asks'] if float(q) > 0}
+            self._bid_prices = sorted(self.bids)
+            self._ask_prices = sorted(self.asks)
+            self.last_update_id = int(snapshot['lastUpdateId'])
+
+    def _update_side(self, levels, prices, updates):
+        for p, q in updates:
+            price, quantity = float(p), float(q)
+            if quantity == 0:
+                if levels.pop(price, None) is not None:
+                    del prices[bisect.bisect_left(prices, price)]
+            else:
+                if price not in levels:
+                    bisect.insort(prices, price)
+                levels[price] = quantity
+
+    def apply_update(self, bids, asks, update_id):
+        """Seviye değişikliklerini uygula (miktar 0 = seviye silinir)"""
+        with self.lock:
+            self._update_side(self.bids, self._bid_prices, bids)
+            self._update_side(self.asks, self._ask_prices, asks)
+            self.last_update_id = int(update_id)
+
+    def best_bid(self):
+        return self._bid_prices[-1] if self._bid_prices else None
+
+    def best_ask(self):
+        return self._ask_prices[0] if self._ask_prices else None
+
+    def mid_price(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread(self):
+        """Göreli spread (ask - bid) / mid"""
+        mid = self.mid_price()
+        return (self.best_ask() - self.best_bid()) / mid if mid else None
+
+    def top(self, n=10):
+        """En iyi n seviye - {'bids': [(fiyat, miktar)], 'asks': [...]}"""
+        with self.lock:
+            return {
+                'bids': [(p, self.bids[p]) for p in reversed(self._bid_prices[-n:])],
+                'asks': [(p, self.asks[p]) for p in self._ask_prices[:n]]
+            }
+
+    def cumulative_depth(self, side, n=20, quote=False):
+        """En iyi n seviyenin fiyatları ve kümülatif miktarı (quote=True ise USDT)"""
+        levels = self.top(n)['bids' if side == 'bid' else 'asks']
+        if not levels:
+            return np.empty(0), np.empty(0)
+        prices, quantities = np.array(levels).T
+        return prices, np.cumsum(prices * quantities if quote else quantities)
+
+    def depth_within(self, pct):
+        """Orta fiyatın ±pct içindeki toplam quote derinliği - {'bid': x, 'ask': y}"""
+        mid = self.mid_price()
+        if mid is None:
+            return {'bid': 0.0, 'ask': 0.0}
+        with self.lock:
+            lo = bisect.bisect_left(self._bid_prices, mid * (1 - pct))
+            hi = bisect.bisect_right(self._ask_prices, mid * (1 + pct))
+            bid_depth = sum(p * self.bids[p] for p in self._bid_prices[lo:])
+            ask_depth = sum(p * self.asks[p] for p in self._ask_prices[:hi])
+        return {'bid': bid_depth, 'ask': ask_depth}
+
+    def impact_cost(self, side, quantity=None, quote_amount=None):
+        """Market emrinin defteri yürüyerek ortalama dolum fiyatı ve orta fiyata göre maliyeti
+
+        side: 'buy' (asks tüketilir) veya 'sell' (bids tüketilir).
+        quantity (baz varlık) ya da quote_amount (USDT) verilir.
+        slippage pozitif = maliyet (örn. 0.001 = %0.1).
+        """
+        if side not in ('buy', 'sell'):
+            raise ValueError(f"Geçersiz taraf: {side} ('buy' veya 'sell' olmalı)")
+        if (quantity is None) == (quote_amount is None):
+            raise ValueError("impact_cost için quantity ya da quote_amount'tan yalnızca biri verilmeli")
+        mid = self.mid_price()
+        if mid is None:
+            return None
+
+        with self.lock:
+            if side == 'buy':
+                prices, levels = self._ask_prices, self.asks
+                walk = iter(prices)
+            else:
+                prices, levels = self._bid_prices, self.bids
+                walk = reversed(prices)
+
+            filled_qty = filled_quote = 0.0
+            worst = None
+            used = 0
+            for price in walk:
+                available = levels[price]
+                if quote_amount is not None:
+                    take = min(available, (quote_amount - filled_quote) / price)
+                else:
+                    take = min(available, quantity - filled_qty)
+                filled_qty += take
+                filled_quote += take * price
+                worst = price
+                used += 1
+                if (quote_amount is not None and filled_quote >= quote_amount * (1 - 1e-12)) or \
+                   (quote_amount is None and filled_qty >= quantity * (1 - 1e-12)):
+                    break
+
+        if filled_qty == 0:
+            return None
+        avg_price = filled_quote / filled_qty
+        target = quote_amount if quote_amount is not None else quantity
+        done = filled_quote if quote_amount is not None else filled_qty
+        return {
+            'avg_price': avg_price,
+            'worst_price': worst,
+            'filled_qty': filled_qty,
+            'filled_quote': filled_quote,
+            'levels': used,
+            'complete': done >= target * (1 - 1e-12),
+            'slippage': (avg_price - mid) / mid if side == 'buy' else (mid - avg_price) / mid
+        }
+
+class OrderBookSync:
+    """Snapshot + depthUpdate diff'leri ile emir defterini senkron tutar
+
+    Binance kuralları: snapshot lastUpdateId'sinden eski (u <= lastUpdateId) olaylar atılır,
+    ilk uygulanan olay U <= lastUpdateId + 1 <= u olmalı, sonrakiler U == önceki u + 1.
+    Sıra bozulursa defter senkron dışı sayılır ve yeni snapshot istenir.
+    """
+
+    def __init__(self, symbol, snapshot_loader=None, max_buffer=1000, resync_interval=1.0):
+        self.symbol = symbol
+        self.book = OrderBook(symbol)
+        self.snapshot_loader = snapshot_loader  # symbol -> /depth yanıtı
+        self.max_buffer = max_buffer
+        self.resync_interval = resync_interval  # snapshot denemeleri arası en az süre (ağırlık bütçesi)
+        self.synced = False
+        self._buffer = []
+        self._prev_u = None
+        self._last_snapshot_attempt = 0.0
+        self.stats = {'applied': 0, 'dropped': 0, 'resyncs': 0, 'sequence_errors': 0}
+
+    def load_snapshot(self, snapshot=None):
+        """Snapshot'ı yükle (verilmezse loader ile çek) ve tampondaki diff'leri uygula"""
+        snapshot = snapshot if snapshot is not None else self.snapshot_loader(self.symbol)
+        if not snapshot:
+            return False
+        self.book.apply_snapshot(snapshot)
+        self.synced = True
+        self._prev_u = None
+        self.stats['resyncs'] += 1
+
+        buffered, self._buffer = self._buffer, []
+        for i, event in enumerate(buffered):
+            if not self._apply(event):
+                self._buffer = buffered[i:]
+                break
+        return self.synced
+
+    def handle_diff(self, event):
+        """depthUpdate olayını işle - senkron değilse tamponla ve snapshot iste"""
+        if not self.synced:
+            self._buffer.append(event)
+            if len(self._buffer) > self.max_buffer:
+                self._buffer = self._buffer[-self.max_buffer:]
+            now = time.monotonic()
+            if self.snapshot_loader is not None and now - self._last_snapshot_attempt >= self.resync_interval:
+                self._last_snapshot_attempt = now
+                self.load_snapshot()
+            return self.synced
+        return self._apply(event)
+
+    def _apply(self, event):
+        first_id, final_id = int(event['U']), int(event['u'])
+        last_id = self.book.last_update_id
+
+        if final_id <= last_id:
+            self.stats['dropped'] += 1
+            return True
+
+        if self._prev_u is None:
+            valid = first_id <= last_id + 1 <= final_id
+        else:
+            valid = first_id == self._prev_u + 1
+
+        if not valid:
+            # Olay kaçırıldı - defter artık güvenilir değil
+            self.stats['sequence_errors'] += 1
+            self.synced = False
+            self._prev_u = None
+            self._buffer = [event]
+            print(f"   ⚠️ {self.symbol} emir defteri sırası bozuldu, yeni snapshot gerekli")
+            return False
+
+        self.book.apply_update(event.get('b', []), event.get('a', []), final_id)
+        self._prev_u = final_id
+        self.stats['applied'] += 1
+        return True
+
+    def invalidate(self):
+        """Akış koptuğunda - bir sonraki diff'te yeniden snapshot alınır"""
+        self.synced = False
+        self._prev_u = None
+        self._buffer = []
+
+def replay_diffs(symbol, snapshot, frames):
+    """Kaydedilmiş snapshot + diff frame'lerinden defteri yeniden kur (offline)"""
+    sync = OrderBookSync(symbol)
+    name = symbol.replace('BINANCE:', '').upper()
+    events = []
+    for frame in frames:
+        payload = json.loads(frame) if isinstance(frame, str) else frame
+        data = payload.get('data', payload)
+        if data.get('e') == 'depthUpdate' and data.get('s', '').upper() == name:
+            events.append(data)
+
+    # Snapshot öncesi gelen olaylar tamponda bekler, sonra kurallara göre uygulanır
+    sync._buffer = events
+    sync.load_snapshot(snapshot)
+    return sync
@@ -0,0 +1,158 @@
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class RateLimiter:
+    """Thread-safe token bucket - sabit sleep'lerin yerine merkezi hız sınırı"""
+
+    def __init__(self, rate=20.0, capacity=20):
+        self.rate = float(rate)          # saniyede eklenen token
+        self.capacity = float(capacity)  # maksimum burst
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, tokens=1):
+        """Yeterli token yoksa bekle, sonra tüket"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def remaining(self):
+        """Anlık kullanılabilir token"""
+        with self.lock:
+            self._refill()
+            return self.tokens
+
+# Binance REST endpoint ağırlıkları (REQUEST_WEIGHT)
+ENDPOINT_WEIGHTS = {
+    "/klines": 2,
+    "/ticker/price": 2,
+    "/ticker/24hr": 2,
+    "/depth": 5,
+    "/aggTrades": 4,
+    "/exchangeInfo": 20,
+    "/account": 20,
+    "/order": 1
+}
+
+def _depth_weight(limit):
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+class BinanceWeightLimiter(RateLimiter):
+    """Ağırlık bazlı token bucket - X-MBX-USED-WEIGHT-1m başlığı ile senkronize
+
+    Bütçe neredeyse tükenmedikçe beklemez; sunucunun bildirdiği kullanım
+    yerel tahminden yüksekse kalan token'lar ona göre düşürülür.
+    """
+
+    def __init__(self, weight_limit=6000, safety_margin=0.9, endpoint_weights=None):
+        capacity = weight_limit * safety_margin
+        super().__init__(rate=capacity / 60, capacity=capacity)
+        self.weight_limit = weight_limit
+        self.endpoint_weights = dict(ENDPOINT_WEIGHTS, **(endpoint_weights or {}))
+        self.used_weight = 0
+        self.blocked_until = 0.0
+        self.stats = {'requests': 0, 'weight': 0, 'waits': 0, 'wait_time': 0.0, 'throttled': 0}
+
+    def weight_for(self, path, params=None):
+        """Endpoint ve parametrelere göre istek ağırlığı"""
+        params = params or {}
+        path = "/" + path.rstrip("/").split("/api/v3/")[-1].lstrip("/")
+
+        if path == "/depth":
+            return _depth_weight(int(params.get('limit', 100)))
+        if path == "/ticker/price" and 'symbol' not in params:
+            return 4
+        if path == "/ticker/24hr" and 'symbol' not in params:
+            return 80
+        return self.endpoint_weights.get(path, 1)
+
+    def acquire(self, tokens=1):
+        """Ağırlık kadar bütçe ayır - sadece bütçe bitmek üzereyse bekler"""
+        start = time.monotonic()
+        waited = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self._refill()
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        self.stats['requests'] += 1
+                        self.stats['weight'] += tokens
+                        if waited:
+                            self.stats['waits'] += 1
+                            self.stats['wait_time'] += now - start
+                        return
+                    wait = (tokens - self.tokens) / self.rate
+            waited = True
+            time.sleep(wait)
+
+    def update_from_headers(self, response):
+        """Yanıt başlıklarından kullanılan ağırlığı ve 429/418 durumunu işle"""
+        headers = getattr(response, 'headers', None) or {}
+        used = headers.get('X-MBX-USED-WEIGHT-1m') or headers.get('x-mbx-used-weight-1m')
+
+        with self.lock:
+            if used is not None:
+                self.used_weight = int(used)
+                self._refill()
+                # Sunucu daha fazla kullanım görüyorsa yerel bütçeyi düşür
+                self.tokens = min(self.tokens, max(0.0, self.capacity - self.used_weight))
+
+            status = getattr(response, 'status_code', 200)
+            if status in (418, 429):
+                retry_after = headers.get('Retry-After')
+                delay = float(retry_after) if retry_after else 60.0
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0.0
+                self.stats['throttled'] += 1
+
+    def remaining(self):
+        """Kalan ağırlık bütçesi"""
+        with self.lock:
+            if time.monotonic() < self.blocked_until:
+                return 0.0
+            self._refill()
+            return self.tokens
+
+    def get_status(self):
+        """Limiter durumu"""
+        return {
+            'weight_limit': self.weight_limit,
+            'remaining': round(self.remaining(), 1),
+            'server_used_weight': self.used_weight,
+            **self.stats
+        }
+
+_shared_limiters = {}
+_shared_lock = threading.Lock()
+
+def get_shared_limiter(host="api.binance.com"):
+    """Aynı host'a giden tüm istemciler için ortak limiter"""
+    with _shared_lock:
+        if host not in _shared_limiters:
+            _shared_limiters[host] = BinanceWeightLimiter()
+        return _shared_limiters[host]
@@ -0,0 +1,62 @@
+import numpy as np
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.kline_store import interval_to_ms, interval_offset_ms
+
+def can_resample(base_interval, target_interval):
+    """Hedef interval taban interval'den üretilebilir mi"""
+    base_ms = interval_to_ms(base_interval)
+    target_ms = interval_to_ms(target_interval)
+    return target_ms >= base_ms and target_ms % base_ms == 0
+
+def resample_klines(klines, base_interval, target_interval, now_ms=None, include_partial=True):
+    """Taban interval mumlarından hedef interval OHLCV mumları üret
+
+    Girdi ve çıktı Binance kline satır formatındadır (eskiden yeniye). Girdi bir
+    kovanın ortasından başlıyorsa o eksik ilk mum atılır; include_partial=False ise
+    henüz kapanmamış son mum da atılır.
+    """
+    if not klines:
+        return []
+    if not can_resample(base_interval, target_interval):
+        raise ValueError(f"{target_interval}, {base_interval} mumlarından üretilemez")
+
+    target_ms = interval_to_ms(target_interval)
+    if target_interval == base_interval:
+        rows = [list(k) for k in klines]
+    else:
+        open_times = np.array([int(k[0]) for k in klines], dtype=np.int64)
+        fields = np.array([[float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]),
+                            float(k[7]), float(k[8]), float(k[9]), float(k[10])] for k in klines])
+
+        offset = interval_offset_ms(target_interval)
+        buckets = (open_times - offset) // target_ms * target_ms + offset
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)] - 1
+
+        opens = fields[starts, 0]
+        highs = np.maximum.reduceat(fields[:, 1], starts)
+        lows = np.minimum.reduceat(fields[:, 2], starts)
+        closes = fields[ends, 3]
+        sums = np.add.reduceat(fields[:, [4, 5, 6, 7, 8]], starts, axis=0)
+
+        rows = []
+        for i, start in enumerate(buckets[starts]):
+            if i == 0 and open_times[0] != start:
+                # Kova başı pencerede yok - yarım mum
+                continue
+            start = int(start)
+            rows.append([
+                start, opens[i], highs[i], lows[i], closes[i], sums[i, 0],
+                start + target_ms - 1, sums[i, 1], int(sums[i, 2]), sums[i, 3], sums[i, 4], "0"
+            ])
+
+    if not include_partial and rows:
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        if int(rows[-1][6]) >= now_ms:
+            rows.pop()
+    return rows
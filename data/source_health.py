@@ -0,0 +1,129 @@
+import bisect
+import threading
+import time
+from collections import deque
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Gecikme histogramı kova üst sınırları (ms)
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 15000)
+
+class LatencyHistogram:
+    """Kovalı gecikme histogramı + yüzdelikler için son N örnek"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS, window=500):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # son kova: > en büyük sınır
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, latency_ms)] += 1
+            self.samples.append(latency_ms)
+            self.total += 1
+
+    def percentile(self, p):
+        """Son örneklerden p'inci yüzdelik (ms) - örnek yoksa None"""
+        with self.lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self):
+        with self.lock:
+            labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+            buckets = dict(zip(labels, self.counts))
+            total = self.total
+        return {
+            'count': total,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': buckets
+        }
+
+class CircuitBreaker:
+    """Ardışık hatalarda kaynağı geçici olarak devre dışı bırakır
+
+    closed -> (failure_threshold hata) -> open -> (reset_timeout) -> half_open
+    half_open'da tek deneme isteğine izin verilir; başarılıysa closed, değilse tekrar open.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """İstek gönderilebilir mi"""
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Deneme isteği - sonucu gelene kadar diğerleri beklemez, atlanır
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+class SourceHealth:
+    """Bir veri kaynağının devre kesicisi ve gecikme histogramı"""
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyHistogram()
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def call(self, func, *args, is_success=bool):
+        """func'ı çalıştır, gecikmeyi ve sonucu kaydet - hata durumunda None"""
+        start = time.monotonic()
+        try:
+            result = func(*args)
+        except Exception as e:
+            print(f"❌ {self.name} kaynak hatası: {e}")
+            result = None
+        self.latency.record((time.monotonic() - start) * 1000)
+
+        if is_success(result):
+            self.successes += 1
+            self.breaker.record_success()
+        else:
+            self.failures += 1
+            self.breaker.record_failure()
+        return result
+
+    def get_stats(self):
+        return {
+            'state': self.breaker.state,
+            'successes': self.successes,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'trips': self.breaker.trips,
+            'latency': self.latency.to_dict()
+        }
@@ -0,0 +1,130 @@
+import math
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bar türü -> her işlemin eşiğe katkısı
+BAR_KINDS = ("volume", "dollar", "tick")
+
+def trade_values(trade):
+    """aggTrade (REST veya stream) -> (id, fiyat, miktar, zaman, alıcı maker mı)"""
+    return int(trade['a']), float(trade['p']), float(trade['q']), int(trade['T']), bool(trade['m'])
+
+def _measure(kind, prices, quantities):
+    if kind == "volume":
+        return quantities
+    if kind == "dollar":
+        return prices * quantities
+    if kind == "tick":
+        return np.ones_like(prices) if isinstance(prices, np.ndarray) else 1.0
+    raise ValueError(f"Bilinmeyen bar türü: {kind}")
+
+class BarBuilder:
+    """aggTrade akışından artımlı hacim / dolar / tick barları üretir
+
+    Kümülatif ölçü (hacim, USDT hacmi ya da işlem sayısı) bir sonraki eşik katını
+    geçtiğinde bar kapanır; taşan kısım sonraki bara devreder, böylece barlar
+    ortalamada tam eşik büyüklüğündedir ve build_bars ile birebir aynı sonucu verir.
+    Barlar Binance kline satır formatındadır - CandleBuffer ve göstergelerle uyumlu.
+    Aynı milisaniyede birden çok bar kapanabildiğinden open_time kesin artan tutulur
+    (çakışmada önceki bar + 1 ms); bar kimliği ve artımlı göstergeler buna dayanır.
+    """
+
+    def __init__(self, kind, threshold):
+        if kind not in BAR_KINDS:
+            raise ValueError(f"Bilinmeyen bar türü: {kind}")
+        self.kind = kind
+        self.threshold = float(threshold)
+        self.cumulative = 0.0
+        self.last_id = None
+        self.last_open_time = None
+        self.current = None
+
+    @property
+    def name(self):
+        return f"{self.kind}_{self.threshold:g}"
+
+    def update(self, trade):
+        """İşlemi uygula - kapanan barlar listesi (0 veya 1 bar)"""
+        trade_id, price, quantity, trade_time, buyer_maker = trade_values(trade)
+        if self.last_id is not None and trade_id <= self.last_id:
+            return []  # tekrar gelen işlem
+        self.last_id = trade_id
+
+        taker_buy = 0.0 if buyer_maker else quantity
+        if self.current is None:
+            open_time = trade_time if self.last_open_time is None else max(trade_time, self.last_open_time + 1)
+            self.current = [open_time, price, price, price, price, 0.0, open_time, 0.0, 0, 0.0, 0.0, "0"]
+            self.last_open_time = open_time
+        bar = self.current
+        bar[2] = max(bar[2], price)
+        bar[3] = min(bar[3], price)
+        bar[4] = price
+        bar[5] += quantity
+        bar[6] = max(trade_time, bar[0])
+        bar[7] += price * quantity
+        bar[8] += 1
+        bar[9] += taker_buy
+        bar[10] += taker_buy * price
+
+        bucket = math.floor(self.cumulative / self.threshold)
+        self.cumulative += _measure(self.kind, price, quantity)
+        if math.floor(self.cumulative / self.threshold) > bucket:
+            self.current = None
+            return [bar]
+        return []
+
+    def update_many(self, trades):
+        closed = []
+        for trade in trades:
+            closed.extend(self.update(trade))
+        return closed
+
+def build_bars(trades, kind, threshold, include_partial=False):
+    """İşlem listesinden barları vektörel üret (BarBuilder ile aynı kurallar)"""
+    if kind not in BAR_KINDS:
+        raise ValueError(f"Bilinmeyen bar türü: {kind}")
+    if not trades:
+        return []
+
+    values = np.array([trade_values(t) for t in trades], dtype=np.float64)
+    times = values[:, 3].astype(np.int64)
+    prices, quantities = values[:, 1], values[:, 2]
+    taker_buy = np.where(values[:, 4] > 0, 0.0, quantities)
+
+    cumulative = np.cumsum(_measure(kind, prices, quantities))
+    buckets = np.floor(cumulative / threshold)
+    previous = np.r_[0.0, buckets[:-1]]
+    closes = np.flatnonzero(buckets > previous)
+
+    ends = list(closes)
+    if include_partial and (not ends or ends[-1] < len(trades) - 1):
+        ends.append(len(trades) - 1)
+    if not ends:
+        return []
+    ends = np.array(ends)
+    starts = np.r_[0, ends[:-1] + 1]
+
+    # reduceat son grubu dizinin sonuna kadar alır - kısmi bar dışarıda kalsın
+    n = ends[-1] + 1
+    prices, quantities, taker_buy = prices[:n], quantities[:n], taker_buy[:n]
+
+    highs = np.maximum.reduceat(prices, starts)
+    lows = np.minimum.reduceat(prices, starts)
+    volume = np.add.reduceat(quantities, starts)
+    quote = np.add.reduceat(prices * quantities, starts)
+    buy = np.add.reduceat(taker_buy, starts)
+    buy_quote = np.add.reduceat(taker_buy * prices, starts)
+
+    # open_time kesin artan: o'[i] = max(o[i], o'[i-1] + 1)
+    steps = np.arange(len(starts))
+    open_times = np.maximum.accumulate(times[starts] - steps) + steps
+    close_times = np.maximum(times[ends], open_times)
+
+    return [
+        [int(open_times[i]), prices[s], highs[i], lows[i], prices[e], volume[i], int(close_times[i]),
+         quote[i], int(e - s + 1), buy[i], buy_quote[i], "0"]
+        for i, (s, e) in enumerate(zip(starts, ends))
+    ]
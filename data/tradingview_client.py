@@ -2,13 +2,14 @@ import requests
 import json
 import sys
 import os
-import time
 import random
 from datetime import datetime
 
 # Python path'ini ayarla
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from data.http_replay import attach_transport
+
 class TradingViewClient:
     def __init__(self):
         self.base_url = "https://scanner.tradingview.com/crypto/scan"
@@ -20,6 +21,7 @@ class TradingViewClient:
             'Origin': 'https://www.tradingview.com',
             'Referer': 'https://www.tradingview.com/'
         })
+        attach_transport(self.session)  # HTTP_REPLAY_MODE ayarlıysa kayıt/tekrar
         
         # Zaman dilimi mapping
         self.timeframe_mapping = {
@@ -29,12 +31,9 @@ class TradingViewClient:
             "4h": "240",
             "1d": "1D"
         }
-    
-    def get_technical_data(self, symbol="BINANCE:BTCUSDT", timeframe="15m"):
-        """TradingView'dan belirli zaman diliminde teknik verileri çek"""
         
-        # Zaman dilimine özel kolonlar
-        columns = [
+        # Zaman dilimine özel kolonların temeli (sıra _parse_data ile aynı)
+        self.base_columns = [
             "close",
             "volume", 
             "change",
@@ -47,6 +46,69 @@ class TradingViewClient:
             "EMA50",
             "Recommend.All"
         ]
+    
+    def _columns_for(self, timeframe):
+        """Zaman dilimi ekli kolonlar - RSI|60, MACD.macd|240 ... (1D eksiz)"""
+        resolution = self.timeframe_mapping.get(timeframe, "15")
+        if resolution == "1D":
+            return list(self.base_columns)
+        return [f"{column}|{resolution}" for column in self.base_columns]
+    
+    def get_batch_technical_data(self, symbols, timeframes):
+        """Tüm semboller x zaman dilimleri için tek scanner isteği
+        
+        Dönüş: {symbol: {timeframe: veri}} - alınamayanlar eksik kalır
+        """
+        columns = []
+        for timeframe in timeframes:
+            columns.extend(self._columns_for(timeframe))
+        
+        payload = {
+            "symbols": {
+                "tickers": list(symbols),
+                "query": {
+                    "types": []
+                }
+            },
+            "columns": columns
+        }
+        
+        result = {symbol: {} for symbol in symbols}
+        
+        try:
+            print(f"   🔧 Toplu TradingView isteği: {len(symbols)} sembol x {len(timeframes)} zaman dilimi")
+            response = self.session.post(self.base_url, json=payload, timeout=15)
+            
+            if response.status_code != 200:
+                print(f"   ❌ HTTP Hatası: {response.status_code}")
+                return result
+            
+            data = response.json()
+        except Exception as e:
+            print(f"   ❌ Toplu istek hatası: {str(e)[:100]}...")
+            return result
+        
+        # Satırları zaman dilimlerine dağıt
+        width = len(self.base_columns)
+        for row in data.get('data', []) if data else []:
+            symbol = row.get('s')
+            values = row.get('d') or []
+            if symbol not in result:
+                continue
+            
+            for index, timeframe in enumerate(timeframes):
+                chunk = values[index * width:(index + 1) * width]
+                parsed_data = self._parse_data({'d': chunk}, timeframe, symbol)
+                if parsed_data and parsed_data['close'] > 0:
+                    result[symbol][timeframe] = parsed_data
+        
+        return result
+    
+    def get_technical_data(self, symbol="BINANCE:BTCUSDT", timeframe="15m"):
+        """TradingView'dan belirli zaman diliminde teknik verileri çek"""
+        
+        # Zaman dilimine özel kolonlar
+        columns = self._columns_for(timeframe)
         
         payload = {
             "symbols": {
@@ -91,28 +153,21 @@ class TradingViewClient:
             return self._get_realistic_fallback_data(symbol, timeframe)
     
     def get_multiple_timeframe_data(self, symbol, timeframes=["5m", "15m", "1h", "4h"]):
-        """Çoklu zaman dilimlerinde veri çek"""
-        timeframe_data = {}
-        
+        """Çoklu zaman dilimlerinde veri çek - tek toplu istek"""
         print(f"   📊 {symbol} için çoklu zaman dilimi verileri çekiliyor...")
         
+        batch_data = self.get_batch_technical_data([symbol], timeframes).get(symbol, {})
+        
+        timeframe_data = {}
         for timeframe in timeframes:
-            print(f"   🔄 {timeframe} verisi alınıyor...")
-            
-            # Gerçek API'den veri almayı dene
-            data = self.get_technical_data(symbol, timeframe)
-            
-            if data and data['close'] > 0:
+            data = batch_data.get(timeframe)
+            if data:
                 timeframe_data[timeframe] = data
                 print(f"   ✅ {timeframe} verisi alındı - ${data['close']:,.2f}")
             else:
                 # Fallback veri oluştur
                 print(f"   ⚠️ {timeframe} için fallback veri oluşturuluyor...")
-                fallback_data = self._get_realistic_fallback_data(symbol, timeframe)
-                timeframe_data[timeframe] = fallback_data
-            
-            # Kısa bekleme
-            time.sleep(0.5)
+                timeframe_data[timeframe] = self._get_realistic_fallback_data(symbol, timeframe)
         
         print(f"   ✅ {len(timeframe_data)} zaman dilimi verisi hazır")
         return timeframe_data
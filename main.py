@@ -3,6 +3,7 @@ import sys
 import os
 import time
 import random
+import threading
 import asyncio
 import sqlite3
 from datetime import datetime, timedelta
@@ -168,6 +169,15 @@ class TradingBot:
         self.exchange_manager = MultiExchangeManager()
         self.risk_manager = RiskManager()
         
+        # Backtest'lerde gerçek sentiment geçmişi
+        if hasattr(self.backtester, 'fear_greed_client'):
+            self.backtester.fear_greed_client = self.fg_client
+        
+        # Slippage kontrolü için emir defteri - akış yoksa REST /depth snapshot'ı
+        binance_client = getattr(self.data_client, 'binance_client', None)
+        if hasattr(self.auto_trader, 'depth_loader') and binance_client is not None:
+            self.auto_trader.depth_loader = lambda symbol: binance_client.get_depth_snapshot(symbol, limit=100)
+        
         self.SYMBOLS = SYMBOLS
         self.TIMEFRAMES = TIMEFRAMES
         self.capital = ANALYSIS_CONFIG.get('default_capital', 1000)
@@ -179,58 +189,95 @@ class TradingBot:
         self.performance_history = []
         self.trade_history = []
         
+        # Scheduler shard'ları veri çekimini paralel yapar; sinyal/risk/trade adımı seri
+        self._analysis_lock = threading.Lock()
+        
         print("🤖 GELİŞMİŞ TRADING BOTU BAŞLATILDI")
         print(f"   • Auto Trading: {'✅ AÇIK' if self.auto_trading_enabled else '❌ KAPALI'}")
         print(f"   • Paper Trading: {'✅ AÇIK' if self.paper_trading else '❌ KAPALI'}")
         print(f"   • Çoklu Exchange: {len(EXCHANGES)} adet")
+
+        try:
+            from settings import INDICATOR_BACKEND
+        except ImportError:
+            INDICATOR_BACKEND = "auto"
+        try:
+            from data import indicators
+            indicators.set_backend(INDICATOR_BACKEND)
+            print(f"   • Gösterge Backend: {indicators.get_backend()['description']}")
+        except (ImportError, ValueError) as e:
+            print(f"   • Gösterge Backend: ⚠️ {e}")
+
+    def analyze_symbol(self, symbol, timeframe_data=None, fear_greed=None, ai_signal=None):
+        """Sembol analizi - GELİŞMİŞ VERSİYON
         
-    def analyze_symbol(self, symbol):
-        """Sembol analizi - GELİŞMİŞ VERSİYON"""
+        fear_greed / ai_signal verilirse (toplu döngü) ilgili adımlar atlanır.
+        """
         print(f"\n🔍 {symbol} analiz ediliyor...")
         
         try:
-            # 1. Hibrit sistemden teknik verileri al
-            print("   📈 Veri kaynağı aktif...")
-            timeframe_data = self.data_client.get_multiple_timeframe_data(symbol, self.TIMEFRAMES)
+            # 1. Hibrit sistemden teknik verileri al (akıştan gelmediyse)
+            if timeframe_data is None:
+                print("   📈 Veri kaynağı aktif...")
+                timeframe_data = self.data_client.get_multiple_timeframe_data(symbol, self.TIMEFRAMES)
             
             if not timeframe_data:
                 print("❌ Veri alınamadı")
                 return None
             
-            # 2. Fear & Greed Index al
-            fear_greed = self.fg_client.get_index()
+            # 2. Fear & Greed Index al (ağ çağrısı - kilit dışında)
+            if fear_greed is None:
+                fear_greed = self.fg_client.get_index()
             
-            # 3. Context oluştur
-            context = self._create_multi_timeframe_context(symbol, timeframe_data, fear_greed)
+            # 3-8. Sinyal, risk ve trade - AutoTrader pozisyon/limit kontrolleri paylaşıldığı için seri
+            with self._analysis_lock:
+                # 3-4. Context oluştur ve AI analizi yap (toplu sinyal yoksa)
+                if ai_signal is None:
+                    context = self._create_multi_timeframe_context(symbol, timeframe_data, fear_greed)
+                    ai_signal = self.ai_client.generate_signal(context, self._primary_timeframe(), self.capital)
             
-            # 4. AI analizi yap
-            primary_timeframe = self.TIMEFRAMES[2] if len(self.TIMEFRAMES) > 2 else "1h"
-            ai_signal = self.ai_client.generate_signal(context, primary_timeframe, self.capital)
+                # 5. Risk kontrolü - YENİ
+                risk_check = self.risk_manager.check_trade_risk(ai_signal)
+                if not risk_check.get('approved', True):
+                    print(f"   ⚠️  Risk yönetimi: Trade reddedildi - {risk_check.get('reason', 'Risk limiti aşıldı')}")
+                    ai_signal['sinyal'] = 'BEKLE'
+                    ai_signal['neden'] = f"Risk yönetimi: {risk_check.get('reason', 'Risk limiti')}"
             
-            # 5. Risk kontrolü - YENİ
-            risk_check = self.risk_manager.check_trade_risk(ai_signal)
-            if not risk_check.get('approved', True):
-                print(f"   ⚠️  Risk yönetimi: Trade reddedildi - {risk_check.get('reason', 'Risk limiti aşıldı')}")
-                ai_signal['sinyal'] = 'BEKLE'
-                ai_signal['neden'] = f"Risk yönetimi: {risk_check.get('reason', 'Risk limiti')}"
+                # 6. Sonuçları birleştir
+                result = self._combine_results(symbol, timeframe_data, ai_signal, fear_greed, risk_check)
             
-            # 6. Sonuçları birleştir
-            result = self._combine_results(symbol, timeframe_data, ai_signal, fear_greed, risk_check)
+                # 7. Otomatik trading - YENİ
+                if self.auto_trading_enabled and ai_signal.get('sinyal') in ['AL', 'SAT']:
+                    self._execute_auto_trade(result)
             
-            # 7. Otomatik trading - YENİ
-            if self.auto_trading_enabled and ai_signal.get('sinyal') in ['AL', 'SAT']:
-                self._execute_auto_trade(result)
+                # 8. Sonuçları göster
+                self._display_results(result)
             
-            # 8. Sonuçları göster
-            self._display_results(result)
-            
-            self.analysis_count += 1
-            return result
+                self.analysis_count += 1
+                return result
             
         except Exception as e:
             print(f"❌ {symbol} analiz hatası: {e}")
             return None
     
+    def _primary_timeframe(self):
+        """AI sinyalinin ana zaman dilimi"""
+        return self.TIMEFRAMES[2] if len(self.TIMEFRAMES) > 2 else "1h"
+    
+    def _generate_batch_signals(self, batch_data, fear_greed):
+        """Toplu verisi olan semboller için sinyalleri tek vektörel geçişte üret - {sembol: sinyal}"""
+        if not batch_data or not hasattr(self.ai_client, 'generate_signals_batch'):
+            return {}
+        contexts = {
+            symbol: self._create_multi_timeframe_context(symbol, timeframe_data, fear_greed)
+            for symbol, timeframe_data in batch_data.items()
+        }
+        try:
+            return self.ai_client.generate_signals_batch(contexts, self._primary_timeframe(), self.capital)
+        except Exception as e:
+            print(f"❌ Toplu sinyal hatası: {e}")
+            return {}
+    
     def _execute_auto_trade(self, result):
         """Otomatik trade yürüt - YENİ"""
         try:
@@ -448,6 +495,11 @@ class TradingBot:
         print(f"📖 Neden: {signal.get('neden', 'Analiz tamamlandı')}")
         print(f"{'='*80}\n")
 
+    def prefetch_symbols(self, symbols, ttl=None):
+        """Sembol grubu için toplu ön yükleme - TradingView'a tek istek (döngü ya da shard başına)"""
+        if hasattr(self.data_client, 'prefetch_tradingview'):
+            self.data_client.prefetch_tradingview(symbols, self.TIMEFRAMES, ttl=ttl)
+    
     def analyze_all_symbols(self):
         """Tüm sembolleri analiz et - GELİŞMİŞ"""
         print("🚀 TÜM SEMBOLLER ANALİZ EDİLİYOR...")
@@ -457,16 +509,25 @@ class TradingBot:
         print(f"🤖 Auto Trading: {'✅ AÇIK' if self.auto_trading_enabled else '❌ KAPALI'}")
         
         results = []
+        self.prefetch_symbols(self.SYMBOLS)
+        
+        # Zaman dilimi başına tüm semboller tek vektörel geçişte - eksik kalanlar tek tek çekilir
+        batch_data = {}
+        if hasattr(self.data_client, 'get_batch_timeframe_data'):
+            batch_data = self.data_client.get_batch_timeframe_data(self.SYMBOLS, self.TIMEFRAMES)
+            print(f"📦 Toplu gösterge: {len(batch_data)}/{len(self.SYMBOLS)} sembol")
+        
+        # Döngü başına tek Fear & Greed ve toplu AI sinyali
+        fear_greed = self.fg_client.get_index()
+        signals = self._generate_batch_signals(batch_data, fear_greed)
         
         for symbol in self.SYMBOLS:
             try:
-                result = self.analyze_symbol(symbol)
+                result = self.analyze_symbol(symbol, timeframe_data=batch_data.get(symbol),
+                                             fear_greed=fear_greed, ai_signal=signals.get(symbol))
                 if result:
                     results.append(result)
                 
-                # Semboller arası bekleme
-                time.sleep(1)
-                
             except Exception as e:
                 print(f"❌ {symbol} analizinde hata: {e}")
                 continue
@@ -479,6 +540,71 @@ class TradingBot:
         
         return results
     
+    def run_streaming(self):
+        """WebSocket akışı ile canlı analiz - mum kapanınca sinyal üret"""
+        try:
+            from queue import Queue
+            from data.binance_stream import BinanceStreamClient
+        except ImportError as e:
+            print(f"❌ WebSocket akışı başlatılamadı: {e}")
+            return
+        
+        trigger_timeframe = self.TIMEFRAMES[0] if self.TIMEFRAMES else "5m"
+        pending = Queue()
+        
+        def on_candle(symbol, interval, data):
+            # En kısa zaman dilimi kapanınca sembolü analiz kuyruğuna al
+            if interval == trigger_timeframe:
+                pending.put(symbol)
+        
+        binance_client = getattr(self.data_client, 'binance_client', None)
+        try:
+            stream = BinanceStreamClient(self.SYMBOLS, self.TIMEFRAMES, binance_client=binance_client, on_candle=on_candle,
+                                         order_books=self.auto_trading_enabled)
+        except ImportError as e:
+            print(f"❌ {e}")
+            return
+        
+        print(f"📡 WebSocket akışı başlatılıyor: {len(stream.stream_names())} stream")
+        stream.start_in_thread()
+        
+        try:
+            while True:
+                symbol = pending.get()
+                if hasattr(self.auto_trader, 'update_order_book'):
+                    self.auto_trader.update_order_book(symbol, stream.get_order_book(symbol))
+                self.analyze_symbol(symbol, timeframe_data=stream.get_timeframe_data(symbol))
+        finally:
+            stream.stop()
+    
+    def run_scheduled(self):
+        """Büyük sembol evrenini shard'lı scheduler ile sürekli analiz et"""
+        try:
+            from settings import SCHEDULER_CONFIG
+        except ImportError:
+            SCHEDULER_CONFIG = {"universe": "settings", "num_shards": 4, "timeframe": "5m"}
+        from symbol_scheduler import ShardedScheduler, load_symbol_universe
+        
+        binance_client = getattr(self.data_client, 'binance_client', None)
+        stats = {}
+        symbols = self.SYMBOLS
+        if SCHEDULER_CONFIG.get("universe") == "usdt" and binance_client is not None:
+            stats = load_symbol_universe(
+                binance_client,
+                min_quote_volume=SCHEDULER_CONFIG.get("min_quote_volume", 0),
+                max_symbols=SCHEDULER_CONFIG.get("max_symbols")
+            )
+            symbols = list(stats) or self.SYMBOLS
+        elif binance_client is not None:
+            # Öncelik için tek 24s snapshot'ı yeterli
+            all_stats = binance_client.get_24h_stats() or {}
+            stats = {s: all_stats.get(s.replace('BINANCE:', '')) for s in symbols}
+        
+        scheduler = ShardedScheduler(self.analyze_symbol, SCHEDULER_CONFIG, prefetch_fn=self.prefetch_symbols)
+        scheduler.add_symbols(symbols, stats)
+        print(f"🗂️ {len(symbols)} sembol, {len(scheduler.shards)} shard, tazelik {scheduler.deadline:.0f}s")
+        scheduler.run()
+    
     def _record_performance(self, results):
         """Performans kaydı oluştur - YENİ"""
         try:
@@ -550,7 +676,14 @@ class TradingBot:
             recent_trades = [t for t in self.trade_history 
                            if datetime.fromisoformat(t['timestamp']) > datetime.now() - timedelta(hours=24)]
             print(f"   🤖 Son 24s Trade: {len(recent_trades)}")
-        
+
+        # Gösterge memo'su - kapanmamış mumlarda tekrar hesaplama yapılmadı
+        memo = getattr(getattr(self.data_client, 'binance_client', None), 'indicator_memo', None)
+        if memo is not None:
+            stats = memo.get_stats()
+            print(f"   🧠 Gösterge Memo: %{stats['hit_rate'] * 100:.0f} isabet "
+                  f"({stats['hits']}/{stats['hits'] + stats['misses']}, {stats['size']} kayıt)")
+
         # Genel market sentiment
         if buy_signals > sell_signals and buy_signals > wait_signals:
             overall_sentiment = "BULLISH 📈"
@@ -664,9 +797,11 @@ def main():
     print("4 - Portfolio Analitiği")
     print("5 - Auto Trading Ayarları")
     print("6 - Sadece Test")
+    print("7 - WebSocket Canlı Analiz")
+    print("8 - Ölçekli Analiz (Tüm USDT Pariteleri)")
     
     try:
-        choice = input("Seçiminiz (1-6): ").strip()
+        choice = input("Seçiminiz (1-8): ").strip()
         
         if choice == "1":
             print("\n🚀 TEK SEFERLİK ANALİZ BAŞLATILIYOR...")
@@ -713,6 +848,22 @@ def main():
         elif choice == "6":
             print("✅ Test tamamlandı.")
             
+        elif choice == "7":
+            print("\n📡 WEBSOCKET CANLI ANALİZ MODU")
+            print("⏹️  Durdurmak için Ctrl+C")
+            try:
+                bot.run_streaming()
+            except KeyboardInterrupt:
+                print(f"\n🛑 Akış durduruldu. Toplam analiz: {bot.analysis_count}")
+            
+        elif choice == "8":
+            print("\n🗂️ ÖLÇEKLİ ANALİZ MODU")
+            print("⏹️  Durdurmak için Ctrl+C")
+            try:
+                bot.run_scheduled()
+            except KeyboardInterrupt:
+                print(f"\n🛑 Scheduler durduruldu. Toplam analiz: {bot.analysis_count}")
+            
         else:
             print("❌ Geçersiz seçim, tek seferlik analiz başlatılıyor...")
             bot.analyze_all_symbols()
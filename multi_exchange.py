@@ -7,6 +7,10 @@ import requests
 from typing import Dict, List, Optional
 import logging
 
+from data.rate_limiter import get_shared_limiter
+from data.http_replay import attach_transport, replay_active
+from data.cache import TTLCache
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -99,10 +103,25 @@ class BinanceExchange:
         
         self.base_url = "https://testnet.binance.vision" if self.testnet else "https://api.binance.com"
         self.session = requests.Session()
+        attach_transport(self.session)  # HTTP_REPLAY_MODE ayarlıysa kayıt/tekrar
+        
+        # Aynı host'a giden tüm istekler ortak ağırlık bütçesini kullanır
+        self.rate_limiter = get_shared_limiter(urllib.parse.urlparse(self.base_url).netloc)
+        
+        # Tüm semboller fiyat snapshot'ı - portföy değerleme tek istekle
+        self.snapshot_ttl = self.config.get("snapshot_ttl", 2.0)
+        self.snapshot_cache = TTLCache(maxsize=0 if replay_active() else 4, default_ttl=self.snapshot_ttl)
         
         if self.api_key:
             self.session.headers.update({'X-MBX-APIKEY': self.api_key})
     
+    def _request(self, method: str, endpoint: str, params: Dict):
+        """Hız sınırından geçen istek"""
+        self.rate_limiter.acquire(self.rate_limiter.weight_for(endpoint, params))
+        response = self.session.request(method, self.base_url + endpoint, params=params)
+        self.rate_limiter.update_from_headers(response)
+        return response
+    
     def get_balance(self) -> Dict:
         """Bakiye bilgisini getir"""
         try:
@@ -122,12 +141,13 @@ class BinanceExchange:
             params = {'timestamp': int(time.time() * 1000)}
             params['signature'] = self._generate_signature(params)
             
-            response = self.session.get(self.base_url + endpoint, params=params)
+            response = self._request('GET', endpoint, params)
             
             if response.status_code == 200:
                 data = response.json()
                 balances = {}
                 total_balance = 0
+                prices = self.get_all_prices()
                 
                 for balance in data['balances']:
                     asset = balance['asset']
@@ -141,11 +161,11 @@ class BinanceExchange:
                             "locked": locked,
                             "total": total
                         }
-                        # USDT cinsinden değer hesapla (basit)
+                        # USDT cinsinden değer - tek fiyat snapshot'ından
                         if asset == 'USDT':
                             total_balance += total
-                        elif asset == 'BTC':
-                            total_balance += total * 50000  # Örnek BTC fiyatı
+                        elif f"{asset}USDT" in prices:
+                            total_balance += total * prices[f"{asset}USDT"]
                 
                 return {
                     "total": total_balance,
@@ -182,7 +202,7 @@ class BinanceExchange:
             
             params['signature'] = self._generate_signature(params)
             
-            response = self.session.post(self.base_url + endpoint, params=params)
+            response = self._request('POST', endpoint, params)
             
             if response.status_code == 200:
                 return response.json()
@@ -194,12 +214,16 @@ class BinanceExchange:
             return {"error": str(e)}
     
     def get_ticker(self, symbol: str) -> Dict:
-        """Ticker bilgisini getir"""
+        """Ticker bilgisini getir - önce fiyat snapshot'ından"""
+        prices = self.get_all_prices()
+        if symbol in prices:
+            return {"symbol": symbol, "price": str(prices[symbol])}
+        
         try:
             endpoint = "/api/v3/ticker/price"
             params = {'symbol': symbol}
             
-            response = self.session.get(self.base_url + endpoint, params=params)
+            response = self._request('GET', endpoint, params)
             
             if response.status_code == 200:
                 return response.json()
@@ -210,6 +234,20 @@ class BinanceExchange:
             logger.error(f"❌ Binance ticker hatası: {e}")
             return {"error": str(e)}
     
+    def get_all_prices(self) -> Dict[str, float]:
+        """Tüm sembollerin fiyatı tek istekte (kısa TTL ile cache'li)"""
+        return self.snapshot_cache.get_or_load('price', self._fetch_all_prices) or {}
+    
+    def _fetch_all_prices(self) -> Optional[Dict[str, float]]:
+        try:
+            response = self._request('GET', "/api/v3/ticker/price", {})
+            if response.status_code == 200:
+                return {item['symbol']: float(item['price']) for item in response.json()}
+            logger.error(f"❌ Binance fiyat snapshot hatası: {response.text}")
+        except Exception as e:
+            logger.error(f"❌ Binance fiyat snapshot hatası: {e}")
+        return None
+    
     def _simulate_order(self, order_params: Dict) -> Dict:
         """Test için simüle order"""
         time.sleep(0.5)
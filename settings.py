@@ -70,6 +70,22 @@ EXCHANGES = {
     }
 }
 
+# Ölçekli analiz: sembol evreni shard'lara bölünür
+SCHEDULER_CONFIG = {
+    "universe": "usdt",             # "settings": SYMBOLS listesi, "usdt": tüm USDT pariteleri
+    "max_symbols": 300,
+    "min_quote_volume": 1_000_000,  # 24s USDT hacmi alt sınırı
+    "num_shards": 8,
+    "priority": "volatility",       # volatility | volume
+    "timeframe": "5m",              # her sembol bu sürede yeniden analiz edilir
+    "freshness": {},                # zaman dilimi -> saniye (isteğe bağlı)
+    "deadline_grace": 5.0,
+    "report_interval": 60
+}
+
+# Gösterge çekirdekleri: auto (numba kuruluysa JIT), numpy, numba
+INDICATOR_BACKEND = os.getenv("INDICATOR_BACKEND", "auto")
+
 # YENİ: RİSK YÖNETİMİ
 RISK_MANAGEMENT = {
     "max_drawdown": 0.15,  # Maksimum %15 drawdown
@@ -328,6 +328,26 @@ def show_signals():
         if st.button("📊 Backtest Signals", key="backtest_btn"):
             st.info("Running backtest analysis...")
 
+@st.cache_resource
+def get_binance_client():
+    """Shared BinanceClient - one session, cache and kline store across reruns"""
+    from data.binance_client import BinanceClient
+    return BinanceClient()
+
+def load_indicator_series(symbol, timeframe, limit=500):
+    """Fetch klines and return the lazy indicator result (None on failure)"""
+    try:
+        from data.indicator_graph import IndicatorResult
+
+        klines = get_binance_client().get_klines(f"BINANCE:{symbol}", timeframe, limit=limit)
+        if not klines:
+            return None
+        columns = ["open_time", "open", "high", "low", "close", "volume"]
+        frame = pd.DataFrame([k[:6] for k in klines], columns=columns).astype(float)
+        return IndicatorResult(frame)
+    except Exception:
+        return None
+
 def show_analysis():
     """Analysis page"""
     st.header("🔍 Market Analysis")
@@ -348,7 +368,34 @@ def show_analysis():
     
     with col4:
         st.metric("Volatility", "2.8%", "-0.2%")
-    
+
+    # Indicator history - full series from the same computation as the live signals
+    symbol = st.session_state.get("symbol_selector", "BTCUSDT")
+    timeframe = st.session_state.get("timeframe_selector", "1h")
+    st.subheader(f"Indicator History - {symbol} {timeframe}")
+
+    series = load_indicator_series(symbol, timeframe)
+    if series is None:
+        st.warning("Indicator history unavailable (Binance data could not be loaded)")
+    else:
+        frame = series.to_frame(
+            ["ema_20", "ema_50", "bollinger_upper", "bollinger_lower", "rsi", "macd_histogram"], tail=200
+        )
+
+        fig = go.Figure()
+        for column, color in [("close", "#00D4AA"), ("ema_20", "#F5A623"), ("ema_50", "#BD10E0"),
+                              ("bollinger_upper", "#888888"), ("bollinger_lower", "#888888")]:
+            fig.add_trace(go.Scatter(x=frame.index, y=frame[column], mode='lines', name=column,
+                                     line=dict(color=color, width=2 if column == "close" else 1)))
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True)
+
+        rsi_col, macd_col = st.columns(2)
+        with rsi_col:
+            st.line_chart(frame["rsi"], height=200)
+        with macd_col:
+            st.bar_chart(frame["macd_histogram"], height=200)
+
     # Market sentiment
     st.subheader("Market Sentiment")
     
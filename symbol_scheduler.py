@@ -0,0 +1,239 @@
+# symbol_scheduler.py - YENİ DOSYA
+import heapq
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from data.kline_store import INTERVAL_MS
+
+# Logging setup
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Kaldıraçlı token'lar evrene alınmaz
+EXCLUDED_SUFFIXES = ("UPUSDT", "DOWNUSDT", "BULLUSDT", "BEARUSDT")
+
+def load_symbol_universe(binance_client, quote: str = "USDT", min_quote_volume: float = 0,
+                         max_symbols: Optional[int] = None) -> Dict[str, Dict]:
+    """Tek 24s snapshot'ından (quote) paritelerini seç - {"BINANCE:XXXUSDT": 24s istatistik}"""
+    stats = binance_client.get_24h_stats() or {}
+    universe = {
+        f"BINANCE:{symbol}": item for symbol, item in stats.items()
+        if symbol.endswith(quote) and not symbol.endswith(EXCLUDED_SUFFIXES)
+        and item['quote_volume'] >= min_quote_volume and item['price'] > 0
+    }
+    ranked = sorted(universe, key=lambda s: universe[s]['quote_volume'], reverse=True)
+    if max_symbols:
+        ranked = ranked[:max_symbols]
+    return {symbol: universe[symbol] for symbol in ranked}
+
+def priority_score(stats: Optional[Dict], metric: str = "volatility") -> float:
+    """Öncelik puanı - volatility: 24s aralığı x log(hacim), volume: quote hacmi"""
+    if not stats:
+        return 0.0
+    if metric == "volume":
+        return stats['quote_volume']
+    price_range = (stats['high'] - stats['low']) / stats['price'] if stats['price'] > 0 else 0
+    return price_range * math.log1p(stats['quote_volume'])
+
+class Shard:
+    """Tek worker thread'i - kendi sembollerini son tarihe göre sırayla analiz eder"""
+
+    def __init__(self, shard_id: int, analyze_fn: Callable, deadline: float, grace: float,
+                 prefetch_fn: Optional[Callable] = None):
+        self.shard_id = shard_id
+        self.analyze_fn = analyze_fn
+        self.prefetch_fn = prefetch_fn  # (semboller, ttl) - tazelik turu başına bir toplu istek
+        self.last_prefetch = None
+        self.deadline = deadline
+        self.grace = grace
+        self.queue = []  # (son tarih, -öncelik, sembol)
+        self.lock = threading.Lock()
+        self.thread = None
+
+        self.analyzed = 0
+        self.errors = 0
+        self.missed = 0
+        self.busy_time = 0.0
+        self.started_at = None
+        self.lags = []  # son analizlerin gecikmesi (saniye)
+
+    def add(self, symbol: str, priority: float, due: float):
+        with self.lock:
+            heapq.heappush(self.queue, (due, -priority, symbol))
+
+    def symbols(self) -> List[str]:
+        with self.lock:
+            return [item[2] for item in self.queue]
+
+    def run(self, stop_event: threading.Event):
+        self.started_at = time.time()
+        while not stop_event.is_set():
+            with self.lock:
+                if not self.queue:
+                    due = None
+                else:
+                    due, neg_priority, symbol = self.queue[0]
+            if due is None:
+                stop_event.wait(1.0)
+                continue
+
+            wait = due - time.time()
+            if wait > 0:
+                stop_event.wait(min(wait, 1.0))
+                continue
+
+            with self.lock:
+                if not self.queue or self.queue[0][2] != symbol:
+                    continue  # kuyruk bu arada değişti
+                heapq.heappop(self.queue)
+
+            start = time.time()
+            lag = start - due
+            if self.prefetch_fn is not None and (self.last_prefetch is None
+                                                 or start - self.last_prefetch >= self.deadline):
+                self.last_prefetch = start
+                try:
+                    self.prefetch_fn(self.symbols() + [symbol], self.deadline)
+                except Exception as e:
+                    logger.error(f"❌ Shard {self.shard_id} ön yükleme hatası: {e}")
+            try:
+                self.analyze_fn(symbol)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Shard {self.shard_id} {symbol} analiz hatası: {e}")
+            finished = time.time()
+
+            self.analyzed += 1
+            self.busy_time += finished - start
+            self.lags.append(lag)
+            if len(self.lags) > 1000:
+                self.lags = self.lags[-1000:]
+            if lag > self.grace:
+                self.missed += 1
+
+            # Sabit kadans: bir sonraki son tarih öncekinden deadline kadar sonra (geride kalındıysa şimdi)
+            self.add(symbol, -neg_priority, max(due + self.deadline, finished))
+
+    def get_metrics(self) -> Dict:
+        lags = sorted(self.lags)
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        with self.lock:
+            backlog = sum(1 for due, _, _ in self.queue if due <= time.time())
+            size = len(self.queue)
+        return {
+            'symbols': size,
+            'analyzed': self.analyzed,
+            'errors': self.errors,
+            'deadline_misses': self.missed,
+            'backlog': backlog,
+            'lag_p50': round(lags[len(lags) // 2], 3) if lags else None,
+            'lag_p95': round(lags[int(0.95 * (len(lags) - 1))], 3) if lags else None,
+            'lag_max': round(lags[-1], 3) if lags else None,
+            'avg_analysis_time': round(self.busy_time / self.analyzed, 3) if self.analyzed else None,
+            'utilization': round(self.busy_time / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+class ShardedScheduler:
+    """Büyük sembol evrenini shard'lara bölüp tazelik son tarihlerine göre analiz eder
+
+    Semboller öncelik sırasına göre shard'lara sırayla dağıtılır (her shard'da
+    yüksek ve düşük öncelikliler karışık, yük dengeli). Her sembol en kısa zaman
+    diliminin süresi (ya da config'teki freshness) içinde yeniden analiz edilir;
+    geride kalan shard'da önce son tarihi geçen, eşitlikte öncelikli olan çalışır.
+    """
+
+    def __init__(self, analyze_fn: Callable, config=None, prefetch_fn: Optional[Callable] = None):
+        self.config = config or {
+            "num_shards": 8,
+            "priority": "volatility",       # volatility | volume
+            "timeframe": "5m",              # tazelik son tarihini belirleyen zaman dilimi
+            "freshness": {},                # zaman dilimi -> saniye (yoksa interval süresi)
+            "deadline_grace": 5.0,          # bu kadar saniye gecikme son tarih kaçırma sayılır
+            "report_interval": 60
+        }
+        self.analyze_fn = analyze_fn
+        self.deadline = self._deadline_for(self.config.get("timeframe", "5m"))
+        self.shards = [
+            Shard(i, analyze_fn, self.deadline, self.config.get("deadline_grace", 5.0), prefetch_fn)
+            for i in range(max(1, self.config.get("num_shards", 8)))
+        ]
+        self.assignments = {}  # sembol -> shard_id
+        self.stop_event = threading.Event()
+
+    def _deadline_for(self, timeframe: str) -> float:
+        freshness = self.config.get("freshness", {})
+        if timeframe in freshness:
+            return float(freshness[timeframe])
+        return INTERVAL_MS.get(timeframe, 5 * 60_000) / 1000
+
+    def add_symbols(self, symbols: List[str], stats: Optional[Dict[str, Dict]] = None):
+        """Sembolleri önceliğe göre sıralayıp shard'lara round-robin dağıt"""
+        stats = stats or {}
+        metric = self.config.get("priority", "volatility")
+        ranked = sorted(
+            (s for s in symbols if s not in self.assignments),
+            key=lambda s: priority_score(stats.get(s), metric), reverse=True
+        )
+
+        # İlk son tarihler tazelik penceresine yayılır - yük ve istek ağırlığı dengeli kalır
+        now = time.time()
+        offset = len(self.assignments)
+        per_shard = max(1, math.ceil(len(ranked) / len(self.shards)))
+        for i, symbol in enumerate(ranked):
+            shard = self.shards[(offset + i) % len(self.shards)]
+            due = now + self.deadline * (i // len(self.shards)) / per_shard
+            shard.add(symbol, priority_score(stats.get(symbol), metric), due)
+            self.assignments[symbol] = shard.shard_id
+
+        logger.info(f"📋 {len(ranked)} sembol {len(self.shards)} shard'a dağıtıldı "
+                    f"(tazelik: {self.deadline:.0f}s)")
+
+    def start(self):
+        """Shard thread'lerini başlat"""
+        self.stop_event.clear()
+        for shard in self.shards:
+            shard.thread = threading.Thread(target=shard.run, args=(self.stop_event,),
+                                            name=f"shard-{shard.shard_id}", daemon=True)
+            shard.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self.stop_event.set()
+        for shard in self.shards:
+            if shard.thread is not None:
+                shard.thread.join(timeout)
+
+    def run(self, duration: Optional[float] = None):
+        """Scheduler'ı çalıştır ve periyodik shard raporu bas (Ctrl+C ya da duration ile biter)"""
+        self.start()
+        started = time.time()
+        report_interval = self.config.get("report_interval", 60)
+        try:
+            while duration is None or time.time() - started < duration:
+                self.stop_event.wait(min(report_interval, duration - (time.time() - started))
+                                     if duration is not None else report_interval)
+                self.report()
+        finally:
+            self.stop()
+
+    def get_metrics(self) -> Dict:
+        """Shard başına gecikme/son tarih metrikleri ve toplamlar"""
+        shards = {shard.shard_id: shard.get_metrics() for shard in self.shards}
+        return {
+            'deadline': self.deadline,
+            'symbols': len(self.assignments),
+            'analyzed': sum(m['analyzed'] for m in shards.values()),
+            'deadline_misses': sum(m['deadline_misses'] for m in shards.values()),
+            'shards': shards
+        }
+
+    def report(self):
+        metrics = self.get_metrics()
+        print(f"\n📊 SCHEDULER: {metrics['symbols']} sembol | {metrics['analyzed']} analiz | "
+              f"{metrics['deadline_misses']} son tarih kaçırıldı")
+        for shard_id, m in metrics['shards'].items():
+            lag = f"{m['lag_p95']:.2f}s" if m['lag_p95'] is not None else "-"
+            print(f"   Shard {shard_id}: {m['symbols']} sembol | analiz {m['analyzed']} | "
+                  f"gecikme p95 {lag} | bekleyen {m['backlog']} | doluluk %{m['utilization'] * 100:.0f}")
@@ -0,0 +1,13 @@
+from data.cache import next_candle_close
+
+DAY = 24 * 60 * 60_000
+MONDAY = 4 * DAY  # 1970-01-05, epoch Perşembe
+
+def test_next_close_aligned_to_interval():
+    assert next_candle_close("1h", 90 * 60_000) == 2 * 60 * 60_000
+    assert next_candle_close("1h", 60 * 60_000) == 2 * 60 * 60_000
+
+def test_weekly_close_is_next_monday():
+    thursday = MONDAY + 3 * DAY + 12 * 60 * 60_000
+    assert next_candle_close("1w", thursday) == MONDAY + 7 * DAY
+    assert next_candle_close("1w", MONDAY + 7 * DAY) == MONDAY + 14 * DAY
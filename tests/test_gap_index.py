@@ -0,0 +1,34 @@
+from data.gap_index import GapIndex, find_gaps
+
+H = 3_600_000
+
+def test_find_gaps_reports_missing_runs():
+    assert find_gaps([0, H, 4 * H, 5 * H, 7 * H], H) == [(2 * H, 3 * H), (6 * H, 6 * H)]
+
+def test_find_gaps_short_series():
+    assert find_gaps([], H) == []
+    assert find_gaps([H], H) == []
+
+def test_find_gaps_skips_empty_ranges():
+    index = GapIndex.from_open_times(H, [0, H, 4 * H, 5 * H, 7 * H])
+    index.mark_empty(2 * H, 3 * H)
+    assert find_gaps([0, H, 4 * H, 5 * H, 7 * H], H, index=index) == [(6 * H, 6 * H)]
+
+def test_empty_range_counts_as_covered():
+    index = GapIndex.from_open_times(H, [0, H, 4 * H])
+    assert not index.covers(0, 4 * H)
+    assert index.gaps(0, 4 * H) == [(2 * H, 3 * H)]
+
+    index.mark_empty(2 * H, 3 * H)
+    assert index.covers(0, 4 * H)
+    assert index.gaps(0, 4 * H) == []
+    assert index.is_empty(2 * H, 3 * H)
+    assert not index.is_empty(H, 3 * H)
+
+def test_empty_range_merges_with_neighbours():
+    index = GapIndex(H)
+    index.mark_empty(0, 9 * H)
+    index.add_open_times([10 * H, 11 * H])
+    assert len(index) == 1
+    assert index.covers(0, 11 * H)
+    assert not index.covers(0, 12 * H)
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from data import indicator_graph
+from data.candle_buffer import CandleBuffer
+from data.indicator_memo import IndicatorMemo
+
+H = 3_600_000
+
+def make_klines(n=120, seed=1):
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    return [[i * H, c - 0.2, c + 1.0, c - 1.0, c, 10.0 + i, (i + 1) * H - 1, 0.0, 0, 0.0, 0.0, "0"]
+            for i, c in enumerate(closes)]
+
+def full_recompute(klines):
+    return indicator_graph.IndicatorResult(CandleBuffer.from_klines(klines)).snapshot()
+
+def assert_same(snapshot, expected):
+    assert snapshot.keys() == expected.keys()
+    for key, value in expected.items():
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            continue
+        assert snapshot[key] == pytest.approx(value, rel=1e-6, abs=1e-6), key
+
+def test_closed_snapshot_matches_full_recompute():
+    klines = make_klines()
+    memo = IndicatorMemo(maxsize=8)
+    now_ms = klines[-1][6] + 1
+    assert_same(memo.get_snapshot("BTCUSDT", "1h", klines, now_ms=now_ms), full_recompute(klines))
+
+def test_live_candle_applied_to_copy_only():
+    klines = make_klines()
+    memo = IndicatorMemo(maxsize=8)
+    now_ms = klines[-1][0] + 1  # son mum açık
+
+    live = memo.get_snapshot("BTCUSDT", "1h", klines, now_ms=now_ms)
+    assert_same(live, full_recompute(klines))
+    closed = memo.get_snapshot("BTCUSDT", "1h", klines, live=False, now_ms=now_ms)
+    assert_same(closed, full_recompute(klines[:-1]))
+
+    # Aynı kapanmış mum - durum cache'ten gelir, canlı mum tekrar uygulanır
+    assert_same(memo.get_snapshot("BTCUSDT", "1h", klines, now_ms=now_ms), live)
+    stats = memo.get_stats()
+    assert stats['hits'] >= 2 and stats['live_updates'] == 2
+
+def test_source_is_part_of_the_key():
+    klines = make_klines()
+    memo = IndicatorMemo(maxsize=8)
+    now_ms = klines[-1][6] + 1
+    memo.get_snapshot("BTCUSDT", "1h", klines, now_ms=now_ms, source="kline")
+    other = make_klines(seed=2)
+    assert_same(memo.get_snapshot("BTCUSDT", "1h", other, now_ms=now_ms, source="resampled"),
+                full_recompute(other))
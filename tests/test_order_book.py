@@ -0,0 +1,60 @@
+from data.order_book import OrderBook, OrderBookSync
+
+SNAPSHOT = {'lastUpdateId': 100, 'bids': [['99', '1'], ['98', '2']], 'asks': [['101', '1'], ['102', '2']]}
+
+def diff(first, final, bids=(), asks=()):
+    return {'e': 'depthUpdate', 's': 'BTCUSDT', 'U': first, 'u': final, 'b': list(bids), 'a': list(asks)}
+
+def synced_book():
+    sync = OrderBookSync("BTCUSDT")
+    sync.load_snapshot(SNAPSHOT)
+    return sync
+
+def test_stale_diffs_are_dropped():
+    sync = synced_book()
+    assert sync.handle_diff(diff(90, 100, bids=[['99', '5']]))
+    assert sync.book.bids[99.0] == 1.0
+    assert sync.stats['dropped'] == 1
+
+def test_first_event_must_straddle_snapshot():
+    sync = synced_book()
+    assert sync.handle_diff(diff(95, 105, bids=[['99', '3']]))
+    assert sync.book.bids[99.0] == 3.0
+    assert sync.book.last_update_id == 105
+
+    sync = synced_book()
+    assert not sync.handle_diff(diff(102, 105))
+    assert not sync.synced
+    assert sync.stats['sequence_errors'] == 1
+
+def test_gap_after_first_event_forces_resync():
+    snapshots = []
+    sync = OrderBookSync("BTCUSDT", snapshot_loader=lambda symbol: snapshots.append(symbol) or SNAPSHOT,
+                         resync_interval=0)
+    sync.load_snapshot(SNAPSHOT)
+    assert sync.handle_diff(diff(101, 105, asks=[['101', '0']]))
+    assert sync.book.best_ask() == 102.0
+
+    assert not sync.handle_diff(diff(107, 110))
+    assert not sync.synced
+    # Sonraki diff yeni snapshot ister
+    sync.handle_diff(diff(111, 112))
+    assert snapshots == ["BTCUSDT"]
+
+def test_buffered_events_replayed_after_snapshot():
+    sync = OrderBookSync("BTCUSDT")
+    for event in (diff(80, 90), diff(91, 101, bids=[['97', '4']]), diff(102, 103, bids=[['98', '0']])):
+        sync.handle_diff(event)
+    assert sync.load_snapshot(SNAPSHOT)
+    assert sync.book.best_bid() == 99.0
+    assert 98.0 not in sync.book.bids
+    assert sync.book.bids[97.0] == 4.0
+    assert sync.book.last_update_id == 103
+
+def test_impact_cost_incomplete_when_book_runs_out():
+    book = OrderBook("BTCUSDT")
+    book.apply_snapshot(SNAPSHOT)
+    assert book.impact_cost('buy', quantity=2)['complete']
+    impact = book.impact_cost('buy', quantity=10)
+    assert not impact['complete']
+    assert impact['filled_qty'] == 3.0
@@ -0,0 +1,34 @@
+from data.resampler import resample_klines
+
+M = 60_000
+
+def kline(open_time, price, volume=1.0, interval_ms=M):
+    return [open_time, price, price + 1, price - 1, price, volume, open_time + interval_ms - 1,
+            price * volume, 1, 0.0, 0.0, "0"]
+
+def test_partial_head_bucket_dropped():
+    # 5m kovası 0'da başlar; pencere 2. dakikadan başlıyor
+    klines = [kline(i * M, 100 + i) for i in range(2, 15)]
+    rows = resample_klines(klines, "1m", "5m")
+    assert [row[0] for row in rows] == [5 * M, 10 * M]
+
+def test_aggregates_ohlcv():
+    klines = [kline(i * M, 100 + i) for i in range(10)]
+    first = resample_klines(klines, "1m", "5m")[0]
+    assert first[0] == 0 and first[6] == 5 * M - 1
+    assert first[1] == 100 and first[4] == 104
+    assert first[2] == 105 and first[3] == 99
+    assert first[5] == 5.0
+    assert first[8] == 5
+
+def test_open_tail_bucket_excluded_when_not_partial():
+    klines = [kline(i * M, 100) for i in range(8)]
+    assert len(resample_klines(klines, "1m", "5m", now_ms=8 * M, include_partial=True)) == 2
+    assert len(resample_klines(klines, "1m", "5m", now_ms=8 * M, include_partial=False)) == 1
+
+def test_weekly_buckets_open_on_monday():
+    day = 24 * 60 * M
+    monday = 4 * day  # 1970-01-05
+    klines = [kline(monday + i * day, 100, interval_ms=day) for i in range(14)]
+    rows = resample_klines(klines, "1d", "1w")
+    assert [row[0] for row in rows] == [monday, monday + 7 * day]
@@ -0,0 +1,45 @@
+import pytest
+
+from data.candle_buffer import CandleBuffer
+from data.trade_bars import BarBuilder, build_bars
+
+def make_trades(n=40, same_ms_every=3):
+    """Aynı milisaniyede birden çok işlem içeren aggTrade listesi"""
+    trades = []
+    for i in range(n):
+        trades.append({'a': i + 1, 'p': str(100 + i % 7), 'q': str(0.5 + (i % 4) * 0.25),
+                       'T': 1_700_000_000_000 + (i // same_ms_every), 'm': i % 2 == 0})
+    return trades
+
+@pytest.mark.parametrize("kind, threshold", [("tick", 1), ("tick", 2), ("volume", 1.0), ("dollar", 150.0)])
+def test_update_many_matches_build_bars(kind, threshold):
+    trades = make_trades()
+    incremental = BarBuilder(kind, threshold).update_many(trades)
+    vectorised = build_bars(trades, kind, threshold)
+
+    assert len(incremental) == len(vectorised) > 0
+    for a, b in zip(incremental, vectorised):
+        assert a[0] == b[0] and a[6] == b[6] and a[8] == b[8]
+        assert a[1:6] == pytest.approx(b[1:6])
+        assert a[7] == pytest.approx(b[7])
+
+def test_same_ms_bars_have_strictly_increasing_open_times():
+    bars = build_bars(make_trades(same_ms_every=10), "tick", 1)
+    open_times = [bar[0] for bar in bars]
+    assert all(b > a for a, b in zip(open_times, open_times[1:]))
+    assert all(bar[6] >= bar[0] for bar in bars)
+
+def test_duplicate_trades_ignored():
+    trades = make_trades(10)
+    builder = BarBuilder("tick", 1)
+    builder.update_many(trades)
+    assert builder.update_many(trades) == []
+
+def test_candle_buffer_keeps_same_open_time_bars_without_replace():
+    buffer = CandleBuffer(10)
+    bar = [1, 1.0, 1.0, 1.0, 1.0, 1.0, 1]
+    buffer.append(bar, replace=False)
+    buffer.append(bar, replace=False)
+    assert len(buffer) == 2
+    buffer.append(bar)
+    assert len(buffer) == 2